@@ -0,0 +1 @@
+"""Benchmarks for the story pipeline, run against a local Azure DevOps stub."""
@@ -0,0 +1,239 @@
+"""
+Local stand-in for the Azure DevOps work item endpoints.
+
+Serves task creation, parent linking and $batch requests with configurable
+latency, jitter, throttling (429 with Retry-After) and server errors, so the
+pipeline can be measured without touching a real organization.
+
+Run standalone with:
+    python -m benchmarks.azure_stub --port 8089 --latency-ms 50 --throttle-rate 0.05
+then set AZURE_DEVOPS_BASE_URL=http://127.0.0.1:8089.
+"""
+
+import argparse
+import collections
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+_CREATE_PATH = re.compile(r"^/[^/]+/[^/]+/_apis/wit/workitems/\$[^/?]+$")
+_UPDATE_PATH = re.compile(r"^/[^/]+/[^/]+/_apis/wit/workitems/\d+$")
+_BATCH_PATH = re.compile(r"^/[^/]+/_apis/wit/\$batch$")
+
+
+class AzureDevOpsStub:
+    """
+    Threaded HTTP server answering like Azure DevOps work item APIs.
+    
+    Every request sleeps latency ± jitter before answering. A share of
+    requests, picked at random, is answered with 429 and a Retry-After
+    header (throttle_rate) or with a 5xx error (error_rate) instead.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 20,
+        jitter_ms: float = 10,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 0.2,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize stub.
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency_ms: Mean response latency
+            jitter_ms: Maximum deviation from the mean, uniformly distributed
+            throttle_rate: Share of requests answered with 429 (0-1)
+            error_rate: Share of requests answered with a 5xx error (0-1)
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Random seed for reproducible fault injection
+        """
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._ids = itertools.count(100000)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = collections.Counter()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to use as AZURE_DEVOPS_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "AzureDevOpsStub":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="azure-stub", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def stats(self) -> Dict[str, int]:
+        """Request and response counts since the last reset."""
+        with self._stats_lock:
+            return dict(self._stats)
+    
+    def reset_stats(self) -> None:
+        """Clear the counters."""
+        with self._stats_lock:
+            self._stats.clear()
+    
+    def _count(self, *keys: str) -> None:
+        """Increment counters."""
+        with self._stats_lock:
+            for key in keys:
+                self._stats[key] += 1
+    
+    def _delay(self) -> float:
+        """Latency of one response."""
+        with self._random_lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+    
+    def _fault(self) -> Optional[int]:
+        """Status of an injected failure, or None to answer normally."""
+        with self._random_lock:
+            draw = self._random.random()
+            if draw < self.throttle_rate:
+                return 429
+            if draw < self.throttle_rate + self.error_rate:
+                return self._random.choice((500, 502, 503))
+        return None
+    
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Produce the response to one request.
+        
+        Returns:
+            Tuple of (status, extra headers, JSON body)
+        """
+        route = path.split("?", 1)[0]
+        if method in ("HEAD", "GET"):
+            self._count("requests.warmup")
+            return 200, {}, {}
+        
+        if method == "POST" and _BATCH_PATH.match(route):
+            kind = "batch"
+        elif method == "POST" and _CREATE_PATH.match(route):
+            kind = "create"
+        elif method == "PATCH" and _UPDATE_PATH.match(route):
+            kind = "link"
+        else:
+            self._count("responses.404")
+            return 404, {}, {"message": f"No stub route for {method} {route}"}
+        
+        self._count(f"requests.{kind}")
+        time.sleep(self._delay())
+        
+        fault = self._fault()
+        if fault == 429:
+            self._count("responses.429")
+            return 429, {"Retry-After": str(self.retry_after)}, {"message": "Too many requests"}
+        if fault:
+            self._count("responses.5xx")
+            return fault, {}, {"message": "Injected server error"}
+        
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            self._count("responses.400")
+            return 400, {}, {"message": "Body is not JSON"}
+        
+        self._count("responses.2xx")
+        if kind == "batch":
+            entries = payload if isinstance(payload, list) else []
+            self._count(*["tasks.created"] * len(entries))
+            return 200, {}, {
+                "count": len(entries),
+                "value": [
+                    {"code": 200, "headers": {}, "body": json.dumps({"id": next(self._ids)})}
+                    for _ in entries
+                ]
+            }
+        if kind == "create":
+            self._count("tasks.created")
+            return 200, {}, {"id": next(self._ids)}
+        self._count("tasks.linked")
+        return 200, {}, {"id": int(route.rsplit("/", 1)[1])}
+    
+    def _handler_class(self):
+        """Request handler bound to this stub."""
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this Nagle adds ~40ms per response
+            disable_nagle_algorithm = True
+            
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = stub.handle(self.command, self.path, body)
+                data = b"" if self.command == "HEAD" else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            do_GET = do_HEAD = do_POST = do_PATCH = _serve
+            
+            def log_message(self, format: str, *args) -> None:
+                """Keep the console quiet."""
+        
+        return Handler
+
+
+def main() -> None:
+    """Run the stub until interrupted."""
+    parser = argparse.ArgumentParser(description="Local Azure DevOps work item API stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 5xx")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After seconds sent with 429")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    
+    stub = AzureDevOpsStub(
+        args.host, args.port, args.latency_ms, args.jitter_ms,
+        args.throttle_rate, args.error_rate, args.retry_after, args.seed
+    ).start()
+    print(f"Azure DevOps stub listening on {stub.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+        print(json.dumps(stub.stats(), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Archive old completed events out of the queue table.
+
+Usage:
+    python event_retention.py [--days N] [--batch-size N] [--mode table|ndjson]
+                              [--archive-dir DIR] [--max-batches N] [--vacuum]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.database import init_db, get_db_context
+from src.core.config import get_settings
+from src.core.constants import ArchiveMode
+from src.services import EventRetentionService
+from src.utils import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments (defaults come from settings)."""
+    parser = argparse.ArgumentParser(description="Archive completed events older than the retention window.")
+    parser.add_argument("--days", type=int, default=settings.EVENT_RETENTION_DAYS,
+                        help="Archive completed events older than this many days")
+    parser.add_argument("--batch-size", type=int, default=settings.EVENT_RETENTION_BATCH_SIZE,
+                        help="Events moved per transaction")
+    parser.add_argument("--mode", choices=[mode.value for mode in ArchiveMode],
+                        default=settings.EVENT_ARCHIVE_MODE,
+                        help="Archive to the events_archive table or to gzipped NDJSON files")
+    parser.add_argument("--archive-dir", default=settings.EVENT_ARCHIVE_DIR,
+                        help="Directory for NDJSON archives")
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="Stop after this many batches")
+    parser.add_argument("--vacuum", action="store_true", default=settings.EVENT_RETENTION_VACUUM,
+                        help="Run VACUUM/ANALYZE afterwards")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    init_db()
+    
+    with get_db_context() as db:
+        service = EventRetentionService(db, mode=args.mode, archive_dir=args.archive_dir)
+        stats = service.run(args.days, args.batch_size, args.max_batches)
+        if args.vacuum:
+            service.compact()
+    
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Return failed events to the queue for another round of attempts.
+
+Events that used up their EVENT_MAX_RETRIES stay failed; this resets them
+to pending with a fresh retry budget. Subtasks created by earlier attempts
+are reused through the subtask ledger.
+
+Usage:
+    python retry_failed_events.py --all
+    python retry_failed_events.py --id 12 --id 15
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.database import init_db, get_db_context
+from src.services import EventQueueService
+from src.utils import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Return failed events to pending.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", type=int, action="append", dest="event_ids",
+                        help="Failed event to retry (repeatable)")
+    target.add_argument("--all", action="store_true",
+                        help="Retry every failed event")
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    init_db()
+    
+    with get_db_context() as db:
+        retried = EventQueueService(db).retry_failed(None if args.all else args.event_ids)
+    
+    print(json.dumps({"retried": retried}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
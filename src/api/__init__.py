@@ -1,13 +1,14 @@
 """API routes aggregation."""
 
 from fastapi import APIRouter
-from src.api.routes import health, user_story
+from src.api.routes import health, metrics, user_story
 
 # Create main API router
 api_router = APIRouter()
 
 # Include all route modules
 api_router.include_router(health.router)
+api_router.include_router(metrics.router)
 api_router.include_router(user_story.router)
 
 __all__ = ["api_router"]
@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter
 
+from src.repositories import get_story_cache
+
 router = APIRouter(tags=["Health"])
 
 
@@ -18,7 +20,9 @@ def root():
 @router.get("/health")
 def health_check():
     """Health check endpoint."""
+    story_cache = get_story_cache()
     return {
         "status": "healthy",
-        "service": "Azure DevOps Automation"
+        "service": "Azure DevOps Automation",
+        "story_cache": story_cache.stats() if story_cache else None
     }
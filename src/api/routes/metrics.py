@@ -0,0 +1,28 @@
+"""Prometheus metrics route."""
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from src.core.config import get_settings
+from src.services import get_queue_metrics_reconciler
+from src.utils import metrics
+
+router = APIRouter(tags=["Metrics"])
+settings = get_settings()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Metrics of this process in the Prometheus text format.
+    
+    Queue depth gauges are recounted from the database at most every
+    METRICS_QUEUE_RECONCILE_INTERVAL seconds; other scrapes only read
+    in-memory values.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    
+    await run_in_threadpool(get_queue_metrics_reconciler().maybe_refresh)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
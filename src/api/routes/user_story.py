@@ -1,15 +1,23 @@
 """User story API routes."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 
-from src.core.database import get_db
-from src.schemas import UserStoryCreate, UserStoryResponse
-from src.services import UserStoryService
-from src.utils import get_logger
+from src.core.database import get_db, get_read_db
+from src.schemas import (
+    UserStoryCreate,
+    UserStoryResponse,
+    UserStoryBulkCreate,
+    UserStoryBulkResponse
+)
+from src.core.config import get_settings
+from src.core.constants import IngestConfig, TracingConfig
+from src.services import UserStoryService, IdempotencyService, get_story_ingest_buffer
+from src.utils import get_logger, sample_payload, tracing
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/userstory", tags=["User Stories"])
 
@@ -21,59 +29,121 @@ router = APIRouter(prefix="/userstory", tags=["User Stories"])
 )
 def create_user_story(
     story: UserStoryCreate,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Create a new user story and trigger async subtask creation.
     
+    A story that already exists is not created again; the response carries
+    status "duplicate", HTTP 200 and the original event ID.
+    
     Args:
         story: User story data
+        response: Outgoing response (status code set for duplicates)
         db: Database session (injected)
         
     Returns:
         Response with story and event information
     """
-    try:
-        logger.info(f"API Request: Creating user story #{story.id}: {story.title}")
+    with tracing.start_span("POST /userstory/create", {"story.id": story.id}, kind=tracing.SpanKind.SERVER):
+        try:
+            logger.info("API Request: Creating user story #%s: %s", story.id, story.title)
+            
+            # Get service with dependency injection
+            service = UserStoryService(db)
+            
+            # Create story and publish event
+            result = service.create_user_story(
+                story_id=story.id,
+                title=story.title,
+                area_path=story.area_path,
+                iteration_path=story.iteration_path
+            )
+            
+            if result["status"] == "duplicate":
+                response.status_code = status.HTTP_200_OK
+            
+            return UserStoryResponse(**result)
         
-        # Get service with dependency injection
-        service = UserStoryService(db)
+        except Exception as e:
+            logger.error("Error creating user story: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UserStoryBulkResponse
+)
+def create_user_stories_bulk(
+    request: UserStoryBulkCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create many user stories in one transaction and trigger async subtask creation.
+    
+    Stories that already exist, or appear twice in the request, are skipped
+    and reported as duplicates.
+    
+    Args:
+        request: List of user stories
+        db: Database session (injected)
         
-        # Create story and publish event
-        result = service.create_user_story(
-            story_id=story.id,
-            title=story.title,
-            area_path=story.area_path,
-            iteration_path=story.iteration_path
-        )
+    Returns:
+        Response with a result for each story
+    """
+    with tracing.start_span(
+        "POST /userstory/bulk", {"stories": len(request.stories)}, kind=tracing.SpanKind.SERVER
+    ):
+        try:
+            logger.info("API Request: Creating %d user stories in bulk", len(request.stories))
+            
+            service = UserStoryService(db)
+            result = service.create_user_stories_bulk([
+                {
+                    "story_id": story.id,
+                    "title": story.title,
+                    "area_path": story.area_path,
+                    "iteration_path": story.iteration_path
+                }
+                for story in request.stories
+            ])
+            
+            return UserStoryBulkResponse(**result)
         
-        return UserStoryResponse(**result)
-    
-    except Exception as e:
-        logger.error(f"Error creating user story: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+        except Exception as e:
+            logger.error("Error creating user stories in bulk: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
 
 
 @router.get("/{story_id}")
 def get_user_story(
     story_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get user story by Azure DevOps ID.
     
+    Served from the story cache, then the read replica when one is
+    configured, so status polling does not compete with queue writes on
+    the primary.
+    
     Args:
         story_id: Azure DevOps story ID
-        db: Database session (injected)
+        db: Read-only database session (injected)
         
     Returns:
         User story data
     """
     service = UserStoryService(db)
-    story = service.get_user_story(story_id)
+    story = service.get_user_story_record(story_id)
     
     if not story:
         raise HTTPException(
@@ -100,57 +170,93 @@ def azure_webhook(
     Returns:
         Confirmation response
     """
-    try:
-        print(f"Azure webhook received: {payload}")
-        
-        # Extract event type
-        event_type = payload.get("eventType", "")
-        
-        # Only process work item creation events
-        if "workitem.created" not in event_type:
-            print(f"Ignoring event type: {event_type}")
-            return {"status": "ignored", "message": f"Event type {event_type} not processed"}
-        
-        # Extract work item details
-        resource = payload.get("resource", {})
-        work_item_id = resource.get("id")
-        fields = resource.get("fields", {})
-        work_item_type = fields.get("System.WorkItemType", "")
+    with tracing.start_span("POST /userstory/webhook/azure", kind=tracing.SpanKind.SERVER) as span:
+        try:
+            if sample_payload(logger, settings.LOG_PAYLOAD_SAMPLE_RATE):
+                logger.debug("Azure webhook payload: %s", payload)
+            
+            # Extract event type
+            event_type = payload.get("eventType", "")
+            span.set_attribute("webhook.event_type", event_type)
+            
+            # Only process work item creation events
+            if "workitem.created" not in event_type:
+                logger.info("Ignoring event type: %s", event_type)
+                return {"status": "ignored", "message": f"Event type {event_type} not processed"}
+            
+            # Extract work item details
+            resource = payload.get("resource", {})
+            work_item_id = resource.get("id")
+            fields = resource.get("fields", {})
+            work_item_type = fields.get("System.WorkItemType", "")
+            span.set_attribute("work_item.id", work_item_id)
+            span.set_attribute("work_item.type", work_item_type)
+            
+            logger.debug("Work item received: ID=%s, Type=%s", work_item_id, work_item_type)
+            
+            # Process User Stories
+            if work_item_type not in ["User Story"]:
+                logger.info("Ignoring work item type: %s", work_item_type)
+                return {"status": "ignored", "message": f"Work item type {work_item_type} not processed"}
+            
+            title = fields.get("System.Title", "")
+            area_path = fields.get("System.AreaPath", "Devops-automation")
+            iteration_path = fields.get("System.IterationPath", "Devops-automation")
+            
+            logger.info("Processing %s #%s: %s", work_item_type, work_item_id, title)
+            
+            # Service hooks retry deliveries; answer known ones from memory
+            notification_id = payload.get("notificationId") or payload.get("id")
+            keys = IdempotencyService.keys_for(work_item_id, notification_id)
+            with tracing.start_span("idempotency.recall"):
+                found, event_id = IdempotencyService(db).recall(keys)
+            
+            # Create story and trigger subtask creation
+            if found:
+                result = {"status": "duplicate", "event_id": event_id}
+            elif settings.WEBHOOK_GROUP_COMMIT:
+                # Shares one transaction with concurrent webhooks; returns once committed
+                result = get_story_ingest_buffer().submit({
+                    "story_id": work_item_id,
+                    "title": title,
+                    "area_path": area_path,
+                    "iteration_path": iteration_path,
+                    "notification_id": notification_id,
+                    TracingConfig.TRACEPARENT_KEY: tracing.current_traceparent()
+                }).result(timeout=IngestConfig.GROUP_COMMIT_ACK_TIMEOUT)
+            else:
+                service = UserStoryService(db)
+                result = service.create_user_story(
+                    story_id=work_item_id,
+                    title=title,
+                    area_path=area_path,
+                    iteration_path=iteration_path,
+                    notification_id=notification_id
+                )
+            
+            span.set_attribute("webhook.status", result["status"])
+            if result["status"] == "duplicate":
+                logger.info("Work item #%s already received - Event ID: %s", work_item_id, result.get("event_id"))
+                return {
+                    "status": "duplicate",
+                    "message": f"Item #{work_item_id} already received.",
+                    "story_id": work_item_id,
+                    "event_id": result.get("event_id")
+                }
+            
+            logger.info("Work item #%s processed successfully - Event ID: %s", work_item_id, result.get("event_id"))
+            
+            return {
+                "status": "accepted",
+                "message": f"Item #{work_item_id} received. Subtasks will be created asynchronously.",
+                "story_id": work_item_id,
+                "event_id": result.get("event_id")
+            }
         
-        print(f"Work item received: ID={work_item_id}, Type={work_item_type}")
-        
-        # Process User Stories
-        if work_item_type not in ["User Story"]:
-            print(f"Ignoring work item type: {work_item_type}")
-            return {"status": "ignored", "message": f"Work item type {work_item_type} not processed"}
-        
-        title = fields.get("System.Title", "")
-        area_path = fields.get("System.AreaPath", "Devops-automation")
-        iteration_path = fields.get("System.IterationPath", "Devops-automation")
-        
-        print(f"Processing {work_item_type} #{work_item_id}: {title}")
-        
-        # Create story and trigger subtask creation
-        service = UserStoryService(db)
-        result = service.create_user_story(
-            story_id=work_item_id,
-            title=title,
-            area_path=area_path,
-            iteration_path=iteration_path
-        )
-        
-        print(f"Work item #{work_item_id} processed successfully - Event ID: {result.get('event_id')}")
-        
-        return {
-            "status": "accepted",
-            "message": f"Item #{work_item_id} received. Subtasks will be created asynchronously.",
-            "story_id": work_item_id,
-            "event_id": result.get("event_id")
-        }
-    
-    except Exception as e:
-        print(f"Webhook error: {e}", exc_info=True)
-        return {
-            "status": "error",
-            "message": str(e)
-        }
+        except Exception as e:
+            span.record_error(str(e))
+            logger.error("Webhook error: %s", e, exc_info=True)
+            return {
+                "status": "error",
+                "message": str(e)
+            }
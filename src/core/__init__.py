@@ -1,15 +1,30 @@
 """Core module exports."""
 
 from src.core.config import get_settings, Settings
-from src.core.database import init_db, get_db, get_db_context
-from src.core.models import Base, Event, UserStoryRecord
+from src.core.database import init_db, get_db, get_db_context, get_read_db, get_read_db_context
+from src.core.models import (
+    Base,
+    Event,
+    ArchivedEvent,
+    UserStoryRecord,
+    SubtaskLedgerEntry,
+    IdempotencyKey,
+    LeaderLease
+)
 from src.core.constants import (
     EventStatus,
     StoryStatus,
     EventType,
     AzureDevOpsConstants,
+    HttpClientConfig,
+    RateLimitConfig,
+    IngestConfig,
+    RetentionConfig,
+    ArchiveMode,
     TaskTemplates,
-    WorkerConfig
+    LeaderConfig,
+    WorkerConfig,
+    WorkerMode
 )
 
 __all__ = [
@@ -18,13 +33,26 @@ __all__ = [
     "init_db",
     "get_db",
     "get_db_context",
+    "get_read_db",
+    "get_read_db_context",
     "Base",
     "Event",
+    "ArchivedEvent",
     "UserStoryRecord",
+    "SubtaskLedgerEntry",
+    "IdempotencyKey",
+    "LeaderLease",
     "EventStatus",
     "StoryStatus",
     "EventType",
     "AzureDevOpsConstants",
+    "HttpClientConfig",
+    "RateLimitConfig",
+    "IngestConfig",
+    "RetentionConfig",
+    "ArchiveMode",
     "TaskTemplates",
+    "LeaderConfig",
     "WorkerConfig",
+    "WorkerMode",
 ]
@@ -1,7 +1,7 @@
 """Application configuration management."""
 
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
+from pydantic import ConfigDict, Field
 from typing import Optional
 from functools import lru_cache
 
@@ -15,15 +15,97 @@ class Settings(BaseSettings):
     AZURE_DEVOPS_ORG: Optional[str] = None
     AZURE_DEVOPS_PROJECT: Optional[str] = None
     AZURE_DEVOPS_PAT: Optional[str] = None
+    AZURE_DEVOPS_BASE_URL: str = "https://dev.azure.com"
+    AZURE_DEVOPS_USE_BATCH: bool = False
+    AZURE_HTTP_POOL_SIZE: int = 10
+    AZURE_HTTP_TIMEOUT: float = 30
+    AZURE_HTTP_WARMUP_CONNECTIONS: int = 2
+    AZURE_ASYNC_MAX_CONCURRENCY: int = 50
+    AZURE_RATE_LIMIT_PER_SECOND: float = Field(100, gt=0)
+    AZURE_MIN_CONCURRENCY: int = 1
+    AZURE_MAX_CONCURRENCY: int = 64
+    AZURE_LATENCY_TARGET_MS: int = 2000
+    AZURE_MAX_RETRIES: int = 5
+    TASK_TEMPLATES_FILE: Optional[str] = None
+    TASK_TEMPLATES_RELOAD_INTERVAL: float = 5
     
     # Database settings
     DATABASE_URL: str = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DATABASE_READ_URL: Optional[str] = None
+    DATABASE_READ_MAX_LAG_SECONDS: float = 5
+    DATABASE_READ_LAG_CHECK_INTERVAL: float = 5
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 20000
+    SQLITE_MMAP_SIZE: int = 268435456
     
     # Application settings
     ENVIRONMENT: str = "development"
     DEBUG: bool = False
     AUTO_START_WORKER: bool = True
     
+    # Worker settings
+    WORKER_MODE: str = "thread"  # "thread" or "async"
+    WORKER_PROCESSES: int = 1
+    WORKER_CONCURRENCY: int = 1
+    WORKER_MAX_IN_FLIGHT: int = 10
+    WORKER_BATCH_SIZE: int = 10
+    WORKER_LEASE_SECONDS: int = 300
+    EVENT_MAX_RETRIES: int = 3
+    EVENT_RETRY_DELAY_SECONDS: float = 30
+    EVENT_NOTIFICATIONS_ENABLED: bool = True
+    WORKER_FALLBACK_POLL_INTERVAL: int = 30
+    WORKER_INPROCESS_DISPATCH: bool = False
+    WORKER_DISPATCH_QUEUE_SIZE: int = 1000
+    WORKER_LEADER_ELECTION: bool = True
+    WORKER_LEADER_LEASE_SECONDS: int = 15
+    WORKER_LEADER_RENEW_INTERVAL: int = 5
+    
+    # Webhook Ingestion Settings
+    WEBHOOK_GROUP_COMMIT: bool = False
+    WEBHOOK_GROUP_COMMIT_MAX_ITEMS: int = 100
+    WEBHOOK_GROUP_COMMIT_MAX_DELAY_MS: int = 10
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    
+    # Story Cache Settings
+    STORY_CACHE_ENABLED: bool = True
+    STORY_CACHE_SIZE: int = 10000
+    STORY_CACHE_TTL_SECONDS: float = 5
+    
+    # Metrics Settings
+    METRICS_ENABLED: bool = True
+    METRICS_QUEUE_RECONCILE_INTERVAL: int = 60
+    WORKER_METRICS_PORT: int = 0
+    
+    # Tracing Settings
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_EXPORTER: str = "file"  # "file" or "otlp"
+    TRACING_FILE: str = "traces/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SERVICE_NAME: str = "azure-devops-automation"
+    
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_ASYNC: bool = False
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.0
+    
+    # Event Retention Settings
+    EVENT_RETENTION_ENABLED: bool = False
+    EVENT_RETENTION_DAYS: int = 7
+    EVENT_RETENTION_BATCH_SIZE: int = 1000
+    EVENT_RETENTION_INTERVAL: int = 3600
+    EVENT_ARCHIVE_MODE: str = "table"  # "table" or "ndjson"
+    EVENT_ARCHIVE_DIR: str = "archive"
+    EVENT_RETENTION_VACUUM: bool = False
+    
     # API settings
     API_TITLE: str = "Azure DevOps Automation - Event-Driven"
     API_DESCRIPTION: str = "Async user story processing with event queue"
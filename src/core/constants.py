@@ -29,6 +29,7 @@ class AzureDevOpsConstants:
     """Azure DevOps API constants."""
     API_VERSION = "7.0"
     CONTENT_TYPE = "application/json-patch+json"
+    BATCH_CONTENT_TYPE = "application/json"
     WORK_ITEM_TYPE_TASK = "Task"
     
     # Default Azure DevOps paths
@@ -39,6 +40,41 @@ class AzureDevOpsConstants:
     HIERARCHY_REVERSE_LINK = "System.LinkTypes.Hierarchy-Reverse"
 
 
+class HttpClientConfig:
+    """Outbound HTTP client configuration."""
+    POOL_HOSTS = 4  # distinct hosts with their own pool
+
+
+class RateLimitConfig:
+    """Adaptive rate limiter tuning."""
+    DEFAULT_RETRY_AFTER = 1.0  # seconds, when a 429 has no Retry-After
+    THROTTLE_DECREASE = 0.5  # multiplier applied on 429
+    LATENCY_DECREASE = 0.9  # multiplier applied on slow or delayed responses
+    RATE_INCREASE_FRACTION = 0.02  # of max rate, added per fast success
+    MIN_RATE_FRACTION = 0.05  # rate never drops below this share of max
+    DECREASE_COOLDOWN = 1.0  # seconds between multiplicative decreases
+    SLOT_POLL_INTERVAL = 0.02  # seconds between checks for a free slot
+
+
+class IngestConfig:
+    """Story ingestion limits."""
+    BULK_MAX_STORIES = 1000  # stories accepted per bulk request
+    BULK_INSERT_CHUNK = 500  # rows per multi-row INSERT statement
+    GROUP_COMMIT_ACK_TIMEOUT = 30  # seconds a webhook waits for its batch to commit
+
+
+class ArchiveMode(str, Enum):
+    """Where retention moves old events."""
+    TABLE = "table"
+    NDJSON = "ndjson"
+
+
+class RetentionConfig:
+    """Event retention and archival configuration."""
+    BATCH_PAUSE = 0.1  # seconds between batches, lets queue writers in
+    ARCHIVE_FILE_PATTERN = "events-%Y%m%d.ndjson.gz"
+
+
 class TaskTemplates:
     """Standard task templates for user stories."""
     STANDARD_TASKS = [
@@ -48,10 +84,59 @@ class TaskTemplates:
         "4. Testing & QA",
         "5. Deployment & Documentation"
     ]
+    RESOLVED_CACHE_SIZE = 1000  # area paths and ad hoc task lists kept compiled
+
+
+class LeaderConfig:
+    """Leader election for the worker embedded in the API."""
+    EMBEDDED_WORKER_ROLE = "embedded-worker"
+    ADVISORY_LOCK_KEY = 727166401  # PostgreSQL advisory lock held by the leader
+
+
+class TraceExporter(str, Enum):
+    """Where finished trace spans are sent."""
+    FILE = "file"
+    OTLP = "otlp"
+
+
+class TracingConfig:
+    """Tracing of stories through the webhook, queue and worker."""
+    TRACEPARENT_KEY = "traceparent"  # event data key carrying the W3C trace context
+    SCOPE_NAME = "azure-devops-automation"
+    EXPORT_BATCH_SIZE = 256  # spans written per export
+    EXPORT_INTERVAL = 2  # seconds a finished span waits at most before export
+    MAX_QUEUE_SIZE = 4096  # finished spans buffered before new ones are dropped
+    OTLP_TIMEOUT = 5  # seconds per collector request
+    SHUTDOWN_TIMEOUT = 5  # seconds to flush remaining spans on shutdown
+
+
+class LogFormat(str, Enum):
+    """How log records are written."""
+    TEXT = "text"
+    JSON = "json"
+
+
+class WorkerMode(str, Enum):
+    """How the worker daemon runs."""
+    THREAD = "thread"
+    ASYNC = "async"
 
 
 class WorkerConfig:
     """Worker daemon configuration."""
     DEFAULT_POLL_INTERVAL = 3  # seconds
+    LEASE_RENEW_FRACTION = 1 / 3  # of the lease, between renewals of in-flight events
+    MIN_LEASE_RENEW_INTERVAL = 1  # seconds, for very short leases
+    NOTIFY_CHANNEL = "event_queue"
+    NOTIFY_LISTEN_TIMEOUT = 5  # seconds between listener stop checks
+    NOTIFY_RECONNECT_DELAY = 5  # seconds before re-opening a dropped LISTEN connection
+    SUPERVISOR_CHECK_INTERVAL = 1  # seconds between child liveness checks
+    SUPERVISOR_STATS_INTERVAL = 30  # seconds between aggregated throughput reports
+    THROUGHPUT_LOG_INTERVAL = 10  # seconds between throughput reports of a concurrent worker
+    RESTART_DELAY = 1  # seconds before restarting a crashed child
+    MAX_RESTART_DELAY = 30  # cap for the backoff of a child that keeps crashing
+    MIN_STABLE_UPTIME = 60  # seconds a child must run before its backoff resets
+    SHUTDOWN_TIMEOUT = 30  # seconds children get to drain before being killed
+    EMBEDDED_STOP_TIMEOUT = 5  # seconds the API waits for its embedded worker to drain
     LOG_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
     LOG_DATE_FORMAT = '%H:%M:%S'
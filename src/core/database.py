@@ -1,26 +1,267 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, Optional
 
 from src.core.config import get_settings
 from src.core.models import Base
+from src.utils.metrics import DB_SESSION_DURATION
 
+# Plain logging: src.utils imports src.core, so only its standalone
+# submodules (metrics) can be imported here
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Create engine with appropriate connection args
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """
+    Connection pool profile for a database URL.
+    
+    SQLite file databases get a modest pool: WAL lets readers run
+    alongside the single writer, and pre-ping/recycle buy nothing for a
+    local file. Server databases such as PostgreSQL use the configured
+    size, overflow, pre-ping and recycle.
+    """
+    parsed = make_url(url)
+    
+    if parsed.get_backend_name() == "sqlite":
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if parsed.database and parsed.database != ":memory:":
+            options.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT
+            )
+        return options
+    
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tune each new SQLite connection for concurrent API and worker access.
+    
+    WAL lets reads proceed while a write is in progress, busy_timeout makes
+    writers wait for the lock instead of raising "database is locked", and
+    synchronous=NORMAL only fsyncs at checkpoints (still durable in WAL).
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def build_engine(url: str) -> Engine:
+    """
+    Create an engine with the pool profile and pragmas for its backend.
+    
+    Args:
+        url: SQLAlchemy database URL
+        
+    Returns:
+        Configured engine
+    """
+    db_engine = create_engine(url, **_engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+# Create engine with the pool profile selected from settings
+engine = build_engine(settings.DATABASE_URL)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for read-only traffic
+read_engine: Optional[Engine] = None
+ReadSessionLocal: Optional[sessionmaker] = None
+if settings.DATABASE_READ_URL:
+    read_engine = build_engine(settings.DATABASE_READ_URL)
+    if read_engine.dialect.name == "postgresql":
+        read_engine = read_engine.execution_options(postgresql_readonly=True)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+class ReplicaLagMonitor:
+    """
+    Decides whether reads may go to the replica.
+    
+    Replication lag is measured at most once per check interval and
+    cached, so routing a read costs no extra query. While the replica is
+    further behind than the tolerance, or cannot be reached, reads fall
+    back to the primary.
+    """
+    
+    def __init__(self, max_lag: float, check_interval: float):
+        """
+        Initialize lag monitor.
+        
+        Args:
+            max_lag: Seconds of lag tolerated before reads go to the primary
+            check_interval: Seconds between lag measurements
+        """
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self._healthy = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+    
+    def replica_usable(self) -> bool:
+        """Whether the replica is currently within the lag tolerance."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._healthy
+        
+        with self._lock:
+            if now - self._checked_at >= self.check_interval:
+                self._healthy = self._measure()
+                self._checked_at = now
+            return self._healthy
+    
+    def _measure(self) -> bool:
+        """Query the replica for its lag and compare with the tolerance."""
+        try:
+            self.lag = measure_replica_lag(read_engine)
+        except Exception as e:
+            logger.warning("⚠️ Read replica unavailable, using primary: %s", e)
+            self.lag = None
+            return False
+        return self.lag is None or self.lag <= self.max_lag
+    
+    def replica_current(self) -> bool:
+        """Whether the last measurement found the replica fully caught up."""
+        return self._healthy and not self.lag
+
+
+def measure_replica_lag(db_engine: Engine) -> Optional[float]:
+    """
+    Measure replication lag in seconds.
+    
+    On a PostgreSQL standby this is the age of the last replayed
+    transaction, or 0 when everything received has been replayed (an idle
+    primary). Other backends report None (lag unknown, treated as current).
+    """
+    if db_engine.dialect.name != "postgresql":
+        return None
+    
+    with db_engine.connect() as connection:
+        lag = connection.execute(text(
+            "SELECT CASE "
+            "WHEN NOT pg_is_in_recovery() "
+            "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        )).scalar()
+    return float(lag) if lag is not None else None
+
+
+replica_monitor = ReplicaLagMonitor(
+    max_lag=settings.DATABASE_READ_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_READ_LAG_CHECK_INTERVAL
+)
+
+
+def _read_session_factory() -> sessionmaker:
+    """Replica session factory when configured and current, else the primary's."""
+    if ReadSessionLocal is not None and replica_monitor.replica_usable():
+        return ReadSessionLocal
+    return SessionLocal
+
+
+def is_lagging_read(db: Session) -> bool:
+    """
+    Whether a session reads from a replica that was behind the primary.
+    
+    Rows read within the lag tolerance may still predate recent writes, so
+    callers should not cache them past the request.
+    """
+    return (
+        read_engine is not None
+        and db.get_bind() is read_engine
+        and not replica_monitor.replica_current()
+    )
+
 
 def init_db() -> None:
-    """Initialize database by creating all tables."""
+    """Initialize database by creating all tables and adding columns they lack."""
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+
+
+def add_missing_columns(db_engine: Engine) -> None:
+    """
+    Add model columns missing from tables created by an older version.
+    
+    create_all only creates missing tables, so columns added to a model
+    later are added here with ALTER TABLE ... ADD COLUMN, together with
+    their indexes. New columns must be nullable or have a server default.
+    Safe to run repeatedly and from several processes at once.
+    """
+    preparer = db_engine.dialect.identifier_preparer
+    existing = inspect(db_engine)
+    
+    for table in Base.metadata.sorted_tables:
+        if not existing.has_table(table.name):
+            continue
+        present = {column["name"] for column in existing.get_columns(table.name)}
+        
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=db_engine.dialect)}"
+            )
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            
+            try:
+                with db_engine.begin() as connection:
+                    connection.execute(text(ddl))
+            except Exception:
+                # Another process may have added it first
+                if column.name not in {c["name"] for c in inspect(db_engine).get_columns(table.name)}:
+                    raise
+                continue
+            
+            for index in table.indexes:
+                if column.name in index.columns:
+                    index.create(bind=db_engine, checkfirst=True)
+            logger.info("✓ Added column %s.%s", table.name, column.name)
+
+
+def dispose_engines_after_fork() -> None:
+    """
+    Give a forked process its own connection pools.
+    
+    Connections inherited from the parent are dropped without being closed,
+    so the parent's sockets stay intact; every connection used afterwards is
+    opened by this process.
+    """
+    engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.dispose(close=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -30,7 +271,25 @@ def get_db() -> Generator[Session, None, None]:
     """
     db = SessionLocal()
     try:
-        yield db
+        with DB_SESSION_DURATION.labels("primary").time():
+            yield db
+    finally:
+        db.close()
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency for a read-only database session.
+    
+    Uses the read replica (DATABASE_READ_URL) while it is within
+    DATABASE_READ_MAX_LAG_SECONDS of the primary; otherwise, or when no
+    replica is configured, the primary. Only use it for reads.
+    """
+    factory = _read_session_factory()
+    db = factory()
+    try:
+        with DB_SESSION_DURATION.labels("replica" if factory is ReadSessionLocal else "primary").time():
+            yield db
     finally:
         db.close()
 
@@ -43,6 +302,22 @@ def get_db_context() -> Generator[Session, None, None]:
     """
     db = SessionLocal()
     try:
-        yield db
+        with DB_SESSION_DURATION.labels("primary").time():
+            yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def get_read_db_context() -> Generator[Session, None, None]:
+    """
+    Context manager for a read-only session (replica when available).
+    Used for read-only work outside request handlers.
+    """
+    factory = _read_session_factory()
+    db = factory()
+    try:
+        with DB_SESSION_DURATION.labels("replica" if factory is ReadSessionLocal else "primary").time():
+            yield db
     finally:
         db.close()
@@ -1,7 +1,7 @@
 """SQLAlchemy database models."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -20,11 +20,35 @@ class Event(Base):
     error = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
     processed_at = Column(DateTime, nullable=True)
+    worker_id = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, index=True, nullable=True)
+    retry_count = Column(Integer, default=0, server_default="0", nullable=False)
+    available_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
         return f"<Event(id={self.id}, type={self.event_type}, status={self.status})>"
 
 
+class ArchivedEvent(Base):
+    """Completed event moved out of the hot queue table by retention."""
+    
+    __tablename__ = "events_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    event_type = Column(String(100), index=True, nullable=False)
+    data = Column(Text, nullable=False)
+    status = Column(String(50), nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    processed_at = Column(DateTime, nullable=True)
+    worker_id = Column(String(100), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    
+    def __repr__(self):
+        return f"<ArchivedEvent(id={self.id}, type={self.event_type})>"
+
+
 class UserStoryRecord(Base):
     """User story model."""
     
@@ -41,3 +65,55 @@ class UserStoryRecord(Base):
     
     def __repr__(self):
         return f"<UserStoryRecord(id={self.id}, azure_id={self.azure_story_id}, title={self.title})>"
+
+
+class SubtaskLedgerEntry(Base):
+    """Progress of one template task for a user story, so retries can resume."""
+    
+    __tablename__ = "subtask_ledger"
+    __table_args__ = (
+        UniqueConstraint("azure_story_id", "position", name="uq_subtask_ledger_story_position"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    azure_story_id = Column(Integer, index=True, nullable=False)
+    position = Column(Integer, nullable=False)
+    title = Column(String(500), nullable=False)
+    task_id = Column(Integer, nullable=True)
+    linked = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return (
+            f"<SubtaskLedgerEntry(story={self.azure_story_id}, position={self.position}, "
+            f"task_id={self.task_id}, linked={self.linked})>"
+        )
+
+
+class IdempotencyKey(Base):
+    """Delivery key already ingested, mapped to the event it produced."""
+    
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    azure_story_id = Column(Integer, index=True, nullable=False)
+    event_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, story={self.azure_story_id}, event_id={self.event_id})>"
+
+
+class LeaderLease(Base):
+    """Heartbeat lease naming the process that currently leads a role."""
+    
+    __tablename__ = "leader_leases"
+    
+    name = Column(String(100), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    acquired_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<LeaderLease(name={self.name}, holder={self.holder}, expires_at={self.expires_at})>"
@@ -2,21 +2,117 @@
 FastAPI application entry point.
 """
 
+import asyncio
 import threading
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from src.core.config import get_settings
+from src.core.constants import LeaderConfig
 from src.core.database import init_db
 from src.api import api_router
-from src.utils import setup_logger
+from src.services import LeaderElection, close_story_ingest_buffer
+from src.utils import setup_logger, tracing
 
 settings = get_settings()
 logger = setup_logger(__name__)
 
 # Worker daemon reference (global for lifespan management)
 worker_thread = None
+worker_task = None
 worker_daemon = None
+worker_election = None
+
+
+def _embedded_worker_alive() -> bool:
+    """Whether the thread or task of the last embedded worker is still running."""
+    return bool(
+        (worker_thread and worker_thread.is_alive())
+        or (worker_task and not worker_task.done())
+    )
+
+
+def _wait_for_embedded_worker(timeout: float) -> bool:
+    """
+    Wait for the last embedded worker to exit.
+    
+    Returns:
+        True if it is no longer running
+    """
+    if worker_thread and worker_thread.is_alive():
+        worker_thread.join(timeout=timeout)
+    if worker_task and not worker_task.done():
+        try:
+            worker_task.result(timeout=timeout)
+        except Exception:
+            pass
+    return not _embedded_worker_alive()
+
+
+def start_embedded_worker(loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Start the embedded worker daemon.
+    
+    Safe to call from any thread: async workers are scheduled on `loop`.
+    A previous daemon that is still draining is waited for first, so two
+    never run at once.
+    
+    Raises:
+        RuntimeError: If the previous daemon does not exit in time
+    """
+    global worker_thread, worker_task, worker_daemon
+    
+    from worker_daemon import WorkerDaemon
+    from src.core.constants import WorkerConfig, WorkerMode
+    
+    if worker_daemon is not None:
+        if not _wait_for_embedded_worker(WorkerConfig.SHUTDOWN_TIMEOUT):
+            raise RuntimeError("Previous worker daemon is still running, not starting another")
+        worker_thread = worker_task = worker_daemon = None
+    
+    worker_daemon = WorkerDaemon(
+        poll_interval=WorkerConfig.DEFAULT_POLL_INTERVAL,
+        concurrency=settings.WORKER_CONCURRENCY,
+        max_in_flight=settings.WORKER_MAX_IN_FLIGHT,
+        batch_size=settings.WORKER_BATCH_SIZE,
+        lease_seconds=settings.WORKER_LEASE_SECONDS,
+        embedded=True,
+        fallback_poll_interval=settings.WORKER_FALLBACK_POLL_INTERVAL,
+        inprocess_dispatch=settings.WORKER_INPROCESS_DISPATCH,
+        dispatch_queue_size=settings.WORKER_DISPATCH_QUEUE_SIZE,
+        sole_publisher=not settings.WORKER_LEADER_ELECTION
+    )
+    if settings.WORKER_MODE == WorkerMode.ASYNC.value:
+        # Runs on the application's event loop
+        worker_task = asyncio.run_coroutine_threadsafe(worker_daemon.run_async(), loop)
+        logger.info("✓ Worker daemon started as asyncio task")
+    else:
+        worker_thread = threading.Thread(target=worker_daemon.start, daemon=True)
+        worker_thread.start()
+        logger.info("✓ Worker daemon started in background")
+
+
+def stop_embedded_worker() -> None:
+    """
+    Stop the embedded worker daemon and wait briefly for it to drain.
+    
+    If it is still busy after the wait, its references are kept so a
+    later start waits for it instead of running a second daemon.
+    Blocks, so it must not run on the event loop an async worker uses.
+    """
+    global worker_thread, worker_task, worker_daemon
+    
+    from src.core.constants import WorkerConfig
+    
+    if not worker_daemon:
+        return
+    
+    worker_daemon.stop()
+    if not _wait_for_embedded_worker(WorkerConfig.EMBEDDED_STOP_TIMEOUT):
+        logger.warning("⚠️ Worker daemon still draining, it will finish in the background")
+        return
+    worker_thread = worker_task = worker_daemon = None
+    logger.info("✓ Worker daemon stopped")
 
 
 @asynccontextmanager
@@ -25,12 +121,12 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     Handles startup and shutdown events.
     """
-    global worker_thread, worker_daemon
+    global worker_election
     
     # Startup
     logger.info("=" * 70)
     logger.info("STARTING APPLICATION")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info("Environment: %s", settings.ENVIRONMENT)
     logger.info("=" * 70)
     
     init_db()
@@ -40,13 +136,19 @@ async def lifespan(app: FastAPI):
     # Start worker daemon in background thread
     auto_start = settings.AUTO_START_WORKER
     if auto_start:
-        from worker_daemon import WorkerDaemon
-        from src.core.constants import WorkerConfig
-        
-        worker_daemon = WorkerDaemon(poll_interval=WorkerConfig.DEFAULT_POLL_INTERVAL)
-        worker_thread = threading.Thread(target=worker_daemon.start, daemon=True)
-        worker_thread.start()
-        logger.info("✓ Worker daemon started in background")
+        loop = asyncio.get_running_loop()
+        if settings.WORKER_LEADER_ELECTION:
+            # Only the API process holding leadership runs the worker
+            worker_election = LeaderElection(
+                LeaderConfig.EMBEDDED_WORKER_ROLE,
+                on_elected=lambda: start_embedded_worker(loop),
+                on_demoted=stop_embedded_worker,
+                lease_seconds=settings.WORKER_LEADER_LEASE_SECONDS,
+                renew_interval=settings.WORKER_LEADER_RENEW_INTERVAL
+            )
+            worker_election.start()
+        else:
+            start_embedded_worker(loop)
     else:
         logger.info("⊘ Worker daemon auto-start disabled (use: AUTO_START_WORKER=true)")
     
@@ -59,12 +161,18 @@ async def lifespan(app: FastAPI):
     logger.info("SHUTTING DOWN APPLICATION")
     logger.info("=" * 70)
     
-    # Stop worker daemon
-    if worker_daemon:
-        worker_daemon.stop()
-        if worker_thread and worker_thread.is_alive():
-            worker_thread.join(timeout=5)
-        logger.info("✓ Worker daemon stopped")
+    # Commit any webhook stories still buffered
+    close_story_ingest_buffer()
+    
+    # Stop worker daemon off the event loop, which an async worker still needs to drain
+    if worker_election:
+        await asyncio.to_thread(worker_election.stop)
+        worker_election = None
+    else:
+        await asyncio.to_thread(stop_embedded_worker)
+    
+    # Export spans still queued
+    await asyncio.to_thread(tracing.shutdown_tracing)
     
     logger.info("✓ Shutdown complete")
 
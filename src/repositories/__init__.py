@@ -1,6 +1,18 @@
 """Repository layer for database operations."""
 
 from src.repositories.event_repository import EventRepository
-from src.repositories.user_story_repository import UserStoryRepository
+from src.repositories.event_archive_repository import EventArchiveRepository
+from src.repositories.user_story_repository import UserStoryRepository, get_story_cache
+from src.repositories.subtask_ledger_repository import SubtaskLedgerRepository
+from src.repositories.idempotency_repository import IdempotencyRepository
+from src.repositories.leader_lease_repository import LeaderLeaseRepository
 
-__all__ = ["EventRepository", "UserStoryRepository"]
+__all__ = [
+    "EventRepository",
+    "EventArchiveRepository",
+    "UserStoryRepository",
+    "get_story_cache",
+    "SubtaskLedgerRepository",
+    "IdempotencyRepository",
+    "LeaderLeaseRepository",
+]
@@ -0,0 +1,35 @@
+"""Event archive repository for database operations."""
+
+from typing import Any, Dict, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.models import ArchivedEvent
+from src.core.constants import IngestConfig
+
+
+class EventArchiveRepository:
+    """Repository for ArchivedEvent database operations."""
+    
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+    
+    def insert_many(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Copy events into the archive (no commit).
+        
+        Rows already archived by an earlier, interrupted run are skipped
+        with ON CONFLICT DO NOTHING.
+        
+        Args:
+            rows: Column values keyed like ArchivedEvent
+        """
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        for start in range(0, len(rows), IngestConfig.BULK_INSERT_CHUNK):
+            chunk = rows[start:start + IngestConfig.BULK_INSERT_CHUNK]
+            self.db.execute(
+                dialect.insert(ArchivedEvent)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[ArchivedEvent.id])
+            )
@@ -1,10 +1,14 @@
 """Event repository for database operations."""
 
-from typing import List
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import JSON, case, cast, delete, func, insert, null, or_, select, type_coerce, update, text
+from sqlalchemy import event as orm_event
 from sqlalchemy.orm import Session
 
 from src.core.models import Event
-from src.core.constants import EventStatus
+from src.core.constants import EventStatus, IngestConfig
+from src.utils import metrics
 
 
 class EventRepository:
@@ -14,39 +18,523 @@ class EventRepository:
         """Initialize repository with database session."""
         self.db = db
     
-    def create(self, event_type: str, data: str, status: str) -> Event:
-        """Create a new event."""
+    def create(
+        self,
+        event_type: str,
+        data: str,
+        status: str,
+        notify_channel: Optional[str] = None
+    ) -> Event:
+        """
+        Create a new event.
+        
+        On PostgreSQL, if notify_channel is given, a NOTIFY is queued in the
+        same transaction so listeners are woken exactly when it commits.
+        """
         event = Event(event_type=event_type, data=data, status=status)
         self.db.add(event)
+        if notify_channel and self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": notify_channel})
         self.db.commit()
         self.db.refresh(event)
         return event
     
+    def insert_many(
+        self,
+        event_type: str,
+        data: List[str],
+        status: str,
+        notify_channel: Optional[str] = None
+    ) -> List[int]:
+        """
+        Insert several events of one type with a single executemany (no commit).
+        
+        Args:
+            event_type: Type shared by every event
+            data: Serialized data for each event
+            status: Initial status
+            notify_channel: PostgreSQL channel to NOTIFY once on commit
+        
+        Returns:
+            Event IDs in the same order as `data`
+        """
+        if not data:
+            return []
+        
+        now = datetime.utcnow()
+        rows = [
+            {"event_type": event_type, "data": item, "status": status, "created_at": now}
+            for item in data
+        ]
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            stmt = insert(Event).returning(Event.id, sort_by_parameter_order=True)
+            event_ids = list(self.db.scalars(stmt, rows))
+            if notify_channel:
+                self.db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": notify_channel})
+            return event_ids
+        
+        # SQLite can only batch without sort_by_parameter_order; it holds the
+        # write lock for the whole transaction, so new IDs ascend in row order
+        return sorted(self.db.scalars(insert(Event).returning(Event.id), rows))
+    
+    def get_by_id(self, event_id: int) -> Optional[Event]:
+        """Get event by ID."""
+        return self.db.query(Event).filter(Event.id == event_id).first()
+    
     def get_pending_events(self) -> List[Event]:
         """Get all pending events."""
         return self.db.query(Event).filter(
             Event.status == EventStatus.PENDING.value
         ).all()
     
+    def latest_ids_for_stories(self, event_type: str, story_ids: List[int]) -> Dict[int, int]:
+        """
+        Get the newest event of a type for each story, read from the event data.
+        
+        Used for stories stored before idempotency keys existed, so it scans
+        the events of that type rather than an index.
+        
+        Returns:
+            Mapping of each story ID that has an event to its newest event ID
+        """
+        # SQLite reads JSON from text as is; PostgreSQL needs the column cast
+        if self.db.get_bind().dialect.name == "postgresql":
+            data = cast(Event.data, JSON)
+        else:
+            data = type_coerce(Event.data, JSON)
+        story_id = data["story_id"].as_integer()
+        found: Dict[int, int] = {}
+        for start in range(0, len(story_ids), IngestConfig.BULK_INSERT_CHUNK):
+            chunk = story_ids[start:start + IngestConfig.BULK_INSERT_CHUNK]
+            rows = self.db.execute(
+                select(story_id, func.max(Event.id))
+                .where(Event.event_type == event_type, story_id.in_(chunk))
+                .group_by(story_id)
+            )
+            found.update({story: event_id for story, event_id in rows})
+        return found
+    
+    def claim_pending_events(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int
+    ) -> List[Event]:
+        """
+        Atomically claim up to `limit` of the oldest pending events.
+        
+        Expired leases are returned to pending first. Events waiting out a
+        retry delay are skipped. Claimed events are moved to processing with
+        the worker ID and lease expiry stamped.
+        On PostgreSQL the candidate rows are locked with FOR UPDATE SKIP
+        LOCKED so concurrent workers never claim the same event; SQLite
+        serializes writers, so the same UPDATE ... RETURNING is atomic there.
+        
+        Returns:
+            Claimed events, oldest first, detached from the session
+        """
+        with metrics.DB_OPERATION_DURATION.labels("claim_pending").time():
+            now = datetime.utcnow()
+            reclaimed = self._reclaim_expired_leases(now)
+            events = self._claim_pending(worker_id, limit, lease_seconds, now)
+        
+        if reclaimed:
+            metrics.EVENTS_RECLAIMED.inc(reclaimed)
+            metrics.QUEUE_DEPTH.labels(EventStatus.PROCESSING.value).dec(reclaimed)
+            metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).inc(reclaimed)
+        if events:
+            self._record_claimed(len(events))
+            for event in events:
+                metrics.QUEUE_WAIT.observe(max(0.0, (now - event.created_at).total_seconds()))
+        
+        return sorted(events, key=lambda event: (event.created_at, event.id))
+    
+    def _claim_pending(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        now: datetime
+    ) -> List[Event]:
+        """Move the oldest pending events to processing and commit."""
+        
+        candidates = (
+            select(Event.id)
+            .where(Event.status == EventStatus.PENDING.value)
+            .where(self._available(now))
+            .order_by(Event.created_at, Event.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Event)
+            .where(Event.id.in_(candidates.scalar_subquery()))
+            .where(Event.status == EventStatus.PENDING.value)
+            .values(
+                status=EventStatus.PROCESSING.value,
+                worker_id=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds)
+            )
+            .returning(Event)
+            .execution_options(synchronize_session=False)
+        )
+        events = list(self.db.scalars(stmt))
+        
+        # Detach so the commit does not expire (and later reload) each row
+        for event in events:
+            self.db.expunge(event)
+        self.db.commit()
+        return events
+    
+    def claim_events_by_id(
+        self,
+        worker_id: str,
+        event_ids: List[int],
+        lease_seconds: int
+    ) -> List[int]:
+        """
+        Claim specific pending events in one statement.
+        
+        Used for events handed over in memory: the caller already holds the
+        payload, so only the IDs that were still pending come back.
+        
+        Returns:
+            IDs of the events this worker now owns
+        """
+        if not event_ids:
+            return []
+        
+        now = datetime.utcnow()
+        with metrics.DB_OPERATION_DURATION.labels("claim_by_id").time():
+            claimed = self._claim_by_id(worker_id, event_ids, lease_seconds, now)
+        if claimed:
+            self._record_claimed(len(claimed))
+        return claimed
+    
+    def _claim_by_id(
+        self,
+        worker_id: str,
+        event_ids: List[int],
+        lease_seconds: int,
+        now: datetime
+    ) -> List[int]:
+        """Move the given pending events to processing and commit."""
+        stmt = (
+            update(Event)
+            .where(Event.id.in_(event_ids))
+            .where(Event.status == EventStatus.PENDING.value)
+            .where(self._available(now))
+            .values(
+                status=EventStatus.PROCESSING.value,
+                worker_id=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds)
+            )
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list(self.db.scalars(stmt))
+        self.db.commit()
+        return claimed
+    
+    @staticmethod
+    def _available(now: datetime):
+        """Condition for pending events whose retry delay, if any, has passed."""
+        return or_(Event.available_at.is_(None), Event.available_at <= now)
+    
+    @staticmethod
+    def _record_claimed(count: int) -> None:
+        """Count claimed events and move them from the pending to the processing gauge."""
+        metrics.EVENTS_CLAIMED.inc(count)
+        metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).dec(count)
+        metrics.QUEUE_DEPTH.labels(EventStatus.PROCESSING.value).inc(count)
+    
+    def _reclaim_expired_leases(self, now: datetime) -> int:
+        """Return events whose lease has expired to pending (no commit)."""
+        result = self.db.execute(
+            update(Event)
+            .where(Event.status == EventStatus.PROCESSING.value)
+            .where(Event.lease_expires_at < now)
+            .values(
+                status=EventStatus.PENDING.value,
+                worker_id=None,
+                lease_expires_at=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Count events per status with a single GROUP BY."""
+        rows = self.db.execute(
+            select(Event.status, func.count()).group_by(Event.status)
+        )
+        return {status: count for status, count in rows}
+    
+    def oldest_pending_created_at(self) -> Optional[datetime]:
+        """Creation time of the oldest pending event, if any."""
+        return self.db.scalar(
+            select(func.min(Event.created_at)).where(Event.status == EventStatus.PENDING.value)
+        )
+    
+    def get_archivable(self, cutoff: datetime, limit: int) -> List[Event]:
+        """
+        Get the oldest completed events finished before `cutoff`.
+        
+        Events completed before processed_at was recorded fall back to
+        their creation time.
+        
+        Returns:
+            Up to `limit` events, detached from the session
+        """
+        events = list(self.db.scalars(
+            select(Event)
+            .where(Event.status == EventStatus.COMPLETED.value)
+            .where(func.coalesce(Event.processed_at, Event.created_at) < cutoff)
+            .order_by(Event.id)
+            .limit(limit)
+        ))
+        for event in events:
+            self.db.expunge(event)
+        return events
+    
+    def delete_by_ids(self, event_ids: List[int]) -> int:
+        """Delete events by ID (no commit)."""
+        result = self.db.execute(
+            delete(Event)
+            .where(Event.id.in_(event_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
     def mark_processing(self, event_id: int) -> None:
         """Mark event as processing."""
-        event = self.db.query(Event).filter(Event.id == event_id).first()
-        if event:
-            event.status = EventStatus.PROCESSING.value
+        self._update(event_id, status=EventStatus.PROCESSING.value)
+        metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).dec()
+        metrics.QUEUE_DEPTH.labels(EventStatus.PROCESSING.value).inc()
+    
+    def mark_completed(
+        self,
+        event_id: int,
+        result: str = None,
+        commit: bool = True,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Mark event as completed.
+        
+        Args:
+            event_id: Event ID
+            result: Serialized result
+            commit: Commit immediately; pass False to join the caller's transaction
+            worker_id: Worker that claimed the event; when given, the update
+                only applies while that worker still holds the lease
+        
+        Returns:
+            False if the worker's lease was lost; nothing was updated and
+            the transaction was rolled back
+        """
+        with metrics.DB_OPERATION_DURATION.labels("mark_completed").time():
+            updated = self._finish(
+                event_id,
+                worker_id,
+                commit=commit,
+                status=EventStatus.COMPLETED.value,
+                result=result,
+                processed_at=datetime.utcnow(),
+                lease_expires_at=None
+            )
+        if updated:
+            self._after_commit(commit, metrics.QUEUE_DEPTH.labels(EventStatus.PROCESSING.value).dec)
+        return updated
+    
+    def mark_failed(
+        self,
+        event_id: int,
+        error: str,
+        worker_id: Optional[str] = None,
+        max_retries: int = 0,
+        retry_delay: float = 0
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Record a failed attempt, returning the event to pending while retries remain.
+        
+        One UPDATE decides from the stored retry count: below `max_retries`
+        the event goes back to pending, claimable after `retry_delay`
+        seconds, with the count incremented; otherwise it stays failed.
+        
+        Args:
+            event_id: Event ID
+            error: Error message
+            worker_id: Worker that claimed the event; when given, the update
+                only applies while that worker still holds the lease
+            max_retries: Attempts allowed after the first one
+            retry_delay: Seconds before a returned event may be claimed again
+        
+        Returns:
+            Tuple of (new status, retry count), or None if the worker's lease
+            was lost; nothing was updated and the transaction was rolled back
+        """
+        now = datetime.utcnow()
+        retry = Event.retry_count < max_retries
+        
+        with metrics.DB_OPERATION_DURATION.labels("mark_failed").time():
+            row = self.db.execute(
+                self._guarded_update(event_id, worker_id)
+                .values(
+                    status=case((retry, EventStatus.PENDING.value), else_=EventStatus.FAILED.value),
+                    retry_count=case((retry, Event.retry_count + 1), else_=Event.retry_count),
+                    available_at=case((retry, now + timedelta(seconds=retry_delay)), else_=null()),
+                    worker_id=case((retry, null()), else_=Event.worker_id),
+                    processed_at=case((retry, null()), else_=now),
+                    error=error,
+                    lease_expires_at=None
+                )
+                .returning(Event.status, Event.retry_count)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if row is None:
+                # End the transaction so no row lock or idle connection is kept
+                self.db.rollback()
+                if worker_id is not None:
+                    metrics.EVENTS_LEASE_LOST.inc()
+                return None
             self.db.commit()
+        
+        metrics.QUEUE_DEPTH.labels(EventStatus.PROCESSING.value).dec()
+        if row.status == EventStatus.PENDING.value:
+            metrics.EVENTS_RETRIED.inc()
+            metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).inc()
+        return row.status, row.retry_count
     
-    def mark_completed(self, event_id: int, result: str = None) -> None:
-        """Mark event as completed."""
-        event = self.db.query(Event).filter(Event.id == event_id).first()
-        if event:
-            event.status = EventStatus.COMPLETED.value
-            event.result = result
+    def retry_failed(self, event_ids: Optional[List[int]] = None) -> List[int]:
+        """
+        Return failed events to pending with a fresh retry budget and commit.
+        
+        Args:
+            event_ids: Events to retry; all failed events if None
+        
+        Returns:
+            IDs of the events returned to pending
+        """
+        stmt = update(Event).where(Event.status == EventStatus.FAILED.value)
+        if event_ids is not None:
+            stmt = stmt.where(Event.id.in_(event_ids))
+        retried = list(self.db.scalars(
+            stmt.values(
+                status=EventStatus.PENDING.value,
+                retry_count=0,
+                available_at=None,
+                worker_id=None,
+                processed_at=None,
+                error=None
+            )
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        ))
+        self.db.commit()
+        metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).inc(len(retried))
+        return retried
+    
+    def renew_leases(self, worker_id: str, event_ids: List[int], lease_seconds: int) -> List[int]:
+        """
+        Extend the leases a worker still holds and commit.
+        
+        Args:
+            worker_id: Worker that claimed the events
+            event_ids: Events the worker is still processing
+            lease_seconds: New lease length, counted from now
+        
+        Returns:
+            IDs whose lease was renewed; the others were reclaimed or finished
+        """
+        if not event_ids:
+            return []
+        
+        with metrics.DB_OPERATION_DURATION.labels("renew_leases").time():
+            renewed = list(self.db.scalars(
+                update(Event)
+                .where(Event.id.in_(event_ids))
+                .where(Event.worker_id == worker_id)
+                .where(Event.status == EventStatus.PROCESSING.value)
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+                .returning(Event.id)
+                .execution_options(synchronize_session=False)
+            ))
+            self.db.commit()
+        return renewed
+    
+    def _finish(self, event_id: int, worker_id: Optional[str], commit: bool = True, **values) -> bool:
+        """
+        Apply a final status, guarded by the lease when a worker ID is given.
+        
+        If the lease was lost, the transaction is rolled back, including
+        anything the caller staged in it with commit=False.
+        
+        Returns:
+            True if the event was updated
+        """
+        result = self.db.execute(
+            self._guarded_update(event_id, worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0 and worker_id is not None:
+            self.db.rollback()
+            metrics.EVENTS_LEASE_LOST.inc()
+            return False
+        if commit:
             self.db.commit()
+        return True
+    
+    def _after_commit(self, committed: bool, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` once the current change is committed.
+        
+        If the caller still has to commit, it runs on that commit and is
+        dropped if the transaction rolls back instead, so gauges never
+        count work that did not land.
+        """
+        if committed or not self.db.in_transaction():
+            callback()
+            return
+        
+        state = {"done": False}
+        
+        def on_commit(*_) -> None:
+            if not state["done"]:
+                state["done"] = True
+                callback()
+        
+        def on_rollback(*_) -> None:
+            state["done"] = True
+        
+        orm_event.listen(self.db, "after_commit", on_commit, once=True)
+        orm_event.listen(self.db, "after_rollback", on_rollback, once=True)
+    
+    @staticmethod
+    def _guarded_update(event_id: int, worker_id: Optional[str]):
+        """
+        UPDATE of one event, restricted to its claiming worker when given.
+        
+        A claimed event whose lease expired may have been reclaimed by
+        another worker; then no row matches and the update is skipped.
+        """
+        stmt = update(Event).where(Event.id == event_id)
+        if worker_id is not None:
+            stmt = (
+                stmt.where(Event.worker_id == worker_id)
+                .where(Event.status == EventStatus.PROCESSING.value)
+            )
+        return stmt
     
-    def mark_failed(self, event_id: int, error: str) -> None:
-        """Mark event as failed."""
-        event = self.db.query(Event).filter(Event.id == event_id).first()
-        if event:
-            event.status = EventStatus.FAILED.value
-            event.error_message = error
+    def _update(self, event_id: int, commit: bool = True, **values) -> None:
+        """Apply a direct UPDATE ... WHERE id = :id without loading the row."""
+        self.db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
             self.db.commit()
@@ -0,0 +1,50 @@
+"""Idempotency key repository for database operations."""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.models import IdempotencyKey
+from src.core.constants import IngestConfig
+
+
+class IdempotencyRepository:
+    """Repository for IdempotencyKey database operations."""
+    
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+    
+    def get_event_ids(self, keys: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Get the events recorded for any of the given keys.
+        
+        Returns:
+            Mapping of each known key to its event ID
+        """
+        found: Dict[str, Optional[int]] = {}
+        for start in range(0, len(keys), IngestConfig.BULK_INSERT_CHUNK):
+            chunk = keys[start:start + IngestConfig.BULK_INSERT_CHUNK]
+            rows = self.db.execute(
+                select(IdempotencyKey.key, IdempotencyKey.event_id)
+                .where(IdempotencyKey.key.in_(chunk))
+            )
+            found.update({key: event_id for key, event_id in rows})
+        return found
+    
+    def insert_keys(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Record keys with INSERT ... ON CONFLICT DO NOTHING (no commit).
+        
+        Args:
+            rows: Dictionaries with key, azure_story_id and event_id
+        """
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        for start in range(0, len(rows), IngestConfig.BULK_INSERT_CHUNK):
+            chunk = rows[start:start + IngestConfig.BULK_INSERT_CHUNK]
+            self.db.execute(
+                dialect.insert(IdempotencyKey)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+            )
@@ -0,0 +1,67 @@
+"""Leader lease repository for database operations."""
+
+from datetime import datetime, timedelta
+from sqlalchemy import case, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.core.models import LeaderLease
+
+
+class LeaderLeaseRepository:
+    """Repository for LeaderLease database operations."""
+    
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+    
+    def try_acquire(self, name: str, holder: str, lease_seconds: int) -> bool:
+        """
+        Take or renew the lease for a role.
+        
+        The lease is granted when nobody holds it, when it has expired, or
+        when the caller already holds it; renewing extends the expiry.
+        
+        Args:
+            name: Role name
+            holder: Unique ID of the calling process
+            lease_seconds: Lease length from now
+        
+        Returns:
+            True if the caller holds the lease
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=lease_seconds)
+        
+        result = self.db.execute(
+            update(LeaderLease)
+            .where(
+                LeaderLease.name == name,
+                or_(LeaderLease.holder == holder, LeaderLease.expires_at < now)
+            )
+            .values(
+                holder=holder,
+                expires_at=expires_at,
+                acquired_at=case((LeaderLease.holder == holder, LeaderLease.acquired_at), else_=now)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+            result = self.db.execute(
+                dialect.insert(LeaderLease)
+                .values(name=name, holder=holder, acquired_at=now, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[LeaderLease.name])
+            )
+        self.db.commit()
+        return result.rowcount > 0
+    
+    def release(self, name: str, holder: str) -> None:
+        """Expire the lease now if the caller holds it, so another process can take over."""
+        self.db.execute(
+            update(LeaderLease)
+            .where(LeaderLease.name == name, LeaderLease.holder == holder)
+            .values(expires_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
@@ -0,0 +1,65 @@
+"""Subtask ledger repository for database operations."""
+
+from typing import Dict, Any
+from sqlalchemy.orm import Session
+
+from src.core.models import SubtaskLedgerEntry
+
+
+class SubtaskLedgerRepository:
+    """Repository for SubtaskLedgerEntry database operations."""
+    
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+    
+    def get_progress(self, azure_story_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Get recorded progress for a story.
+        
+        Returns:
+            Mapping of template position to title, task ID and link status
+        """
+        entries = self.db.query(SubtaskLedgerEntry).filter(
+            SubtaskLedgerEntry.azure_story_id == azure_story_id
+        ).all()
+        return {
+            entry.position: {
+                "title": entry.title,
+                "task_id": entry.task_id,
+                "linked": entry.linked
+            }
+            for entry in entries
+        }
+    
+    def record_task(
+        self,
+        azure_story_id: int,
+        position: int,
+        title: str,
+        task_id: int,
+        linked: bool = False
+    ) -> None:
+        """Record a created task, replacing any entry at the same position."""
+        entry = self._get_entry(azure_story_id, position)
+        if entry is None:
+            entry = SubtaskLedgerEntry(azure_story_id=azure_story_id, position=position)
+            self.db.add(entry)
+        entry.title = title
+        entry.task_id = task_id
+        entry.linked = linked
+        self.db.commit()
+    
+    def mark_linked(self, azure_story_id: int, position: int) -> None:
+        """Mark the task at a position as linked to its parent story."""
+        entry = self._get_entry(azure_story_id, position)
+        if entry:
+            entry.linked = True
+            self.db.commit()
+    
+    def _get_entry(self, azure_story_id: int, position: int):
+        """Get the ledger entry for one template position."""
+        return self.db.query(SubtaskLedgerEntry).filter(
+            SubtaskLedgerEntry.azure_story_id == azure_story_id,
+            SubtaskLedgerEntry.position == position
+        ).first()
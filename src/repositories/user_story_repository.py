@@ -1,9 +1,17 @@
 """User story repository for database operations."""
 
-from typing import Optional
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from src.core.config import get_settings
+from src.core.database import is_lagging_read
 from src.core.models import UserStoryRecord
+from src.core.constants import IngestConfig
+from src.utils import LRUCache
 
 
 class UserStoryRepository:
@@ -32,14 +40,72 @@ class UserStoryRepository:
         self.db.add(story)
         self.db.commit()
         self.db.refresh(story)
+        self._invalidate([azure_story_id])
         return story
     
+    def insert_new_stories(self, stories: List[Dict[str, Any]]) -> Set[int]:
+        """
+        Insert stories with multi-row INSERTs, skipping existing Azure IDs (no commit).
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING, so stories inserted
+        concurrently by another request are skipped instead of failing the
+        whole transaction.
+        
+        Args:
+            stories: Column values for each story, unique by azure_story_id
+        
+        Returns:
+            Azure story IDs that were inserted
+        """
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        inserted: Set[int] = set()
+        
+        for start in range(0, len(stories), IngestConfig.BULK_INSERT_CHUNK):
+            chunk = stories[start:start + IngestConfig.BULK_INSERT_CHUNK]
+            stmt = (
+                dialect.insert(UserStoryRecord)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[UserStoryRecord.azure_story_id])
+                .returning(UserStoryRecord.azure_story_id)
+            )
+            inserted.update(self.db.scalars(stmt))
+        
+        self._invalidate(inserted)
+        return inserted
+    
     def get_by_azure_id(self, azure_story_id: int) -> Optional[UserStoryRecord]:
         """Get user story by Azure DevOps ID."""
         return self.db.query(UserStoryRecord).filter(
             UserStoryRecord.azure_story_id == azure_story_id
         ).first()
     
+    def get_record(self, azure_story_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a user story as a plain dictionary, read through the story cache.
+        
+        Repeated lookups within the cache TTL are served from memory. Writes
+        through this repository invalidate the entry. Rows read from a
+        lagging replica are returned but not cached, so a stale copy cannot
+        outlive a later invalidation.
+        
+        Returns:
+            Column values of the story, or None if it does not exist
+        """
+        cache = get_story_cache()
+        if cache is not None:
+            record = cache.get(azure_story_id)
+            if record is not None:
+                return dict(record)
+        
+        story = self.get_by_azure_id(azure_story_id)
+        if story is None:
+            return None
+        
+        record = {column.name: getattr(story, column.name) for column in UserStoryRecord.__table__.columns}
+        if cache is not None and not is_lagging_read(self.db):
+            cache.put(azure_story_id, record)
+        return dict(record)
+    
     def update_status(self, azure_story_id: int, status: str) -> Optional[UserStoryRecord]:
         """Update user story status."""
         story = self.get_by_azure_id(azure_story_id)
@@ -47,4 +113,72 @@ class UserStoryRepository:
             story.status = status
             self.db.commit()
             self.db.refresh(story)
+            self._invalidate([azure_story_id])
         return story
+    
+    def set_status(self, azure_story_id: int, status: str, commit: bool = True) -> bool:
+        """
+        Update user story status with a direct UPDATE, without loading the row.
+        
+        Args:
+            azure_story_id: Azure DevOps story ID
+            status: New status
+            commit: Commit immediately; pass False to join the caller's transaction
+        
+        Returns:
+            True if a story was updated
+        """
+        result = self.db.execute(
+            update(UserStoryRecord)
+            .where(UserStoryRecord.azure_story_id == azure_story_id)
+            .values(status=status, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self._invalidate([azure_story_id])
+        if commit:
+            self.db.commit()
+        return result.rowcount > 0
+    
+    def _invalidate(self, azure_story_ids: Iterable[int]) -> None:
+        """
+        Drop cached copies of written stories.
+        
+        Entries are dropped now and again when the transaction commits, so
+        a read racing the write cannot leave the old row cached.
+        """
+        cache = get_story_cache()
+        if cache is None:
+            return
+        
+        azure_story_ids = list(azure_story_ids)
+        
+        def discard(*_) -> None:
+            for azure_story_id in azure_story_ids:
+                cache.discard(azure_story_id)
+        
+        discard()
+        if self.db.in_transaction():
+            event.listen(self.db, "after_commit", discard, once=True)
+
+
+_story_cache: Optional[LRUCache] = None
+_story_cache_lock = threading.Lock()
+
+
+def get_story_cache() -> Optional[LRUCache]:
+    """Get the process-wide story cache, or None when disabled."""
+    global _story_cache
+    
+    settings = get_settings()
+    if not settings.STORY_CACHE_ENABLED:
+        return None
+    
+    if _story_cache is None:
+        with _story_cache_lock:
+            if _story_cache is None:
+                _story_cache = LRUCache(
+                    settings.STORY_CACHE_SIZE,
+                    ttl=settings.STORY_CACHE_TTL_SECONDS
+                )
+    
+    return _story_cache
@@ -3,6 +3,9 @@
 from src.schemas.user_story import (
     UserStoryCreate,
     UserStoryResponse,
+    UserStoryBulkCreate,
+    UserStoryBulkItemResult,
+    UserStoryBulkResponse,
     UserStoryInDB
 )
 from src.schemas.event import (
@@ -14,6 +17,9 @@ from src.schemas.event import (
 __all__ = [
     "UserStoryCreate",
     "UserStoryResponse",
+    "UserStoryBulkCreate",
+    "UserStoryBulkItemResult",
+    "UserStoryBulkResponse",
     "UserStoryInDB",
     "EventCreate",
     "EventResponse",
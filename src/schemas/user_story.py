@@ -1,9 +1,11 @@
 """User story schemas for data transfer."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
+from src.core.constants import IngestConfig
+
 
 class UserStoryBase(BaseModel):
     """Base user story schema."""
@@ -22,11 +24,37 @@ class UserStoryResponse(BaseModel):
     status: str
     message: str
     story_id: int
-    event_id: int
+    event_id: Optional[int] = None
     
     model_config = {"from_attributes": True}
 
 
+class UserStoryBulkCreate(BaseModel):
+    """Schema for creating many user stories in one request."""
+    stories: List[UserStoryCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=IngestConfig.BULK_MAX_STORIES
+    )
+
+
+class UserStoryBulkItemResult(BaseModel):
+    """Outcome for one story in a bulk request."""
+    story_id: int
+    status: str
+    event_id: Optional[int] = None
+    message: str
+
+
+class UserStoryBulkResponse(BaseModel):
+    """Schema for bulk user story API response."""
+    status: str
+    message: str
+    accepted: int
+    duplicates: int
+    results: List[UserStoryBulkItemResult]
+
+
 class UserStoryInDB(UserStoryBase):
     """Schema for user story in database."""
     id: int
@@ -1,12 +1,52 @@
 """Service layer exports."""
 
+from src.services.event_notifier import EventNotifier, get_event_notifier
+from src.services.event_dispatcher import EventDispatcher, get_event_dispatcher
 from src.services.event_queue_service import EventQueueService, EventQueueServiceSingleton
+from src.services.idempotency_service import IdempotencyService, get_idempotency_cache
 from src.services.user_story_service import UserStoryService
-from src.services.azure_devops_service import AzureDevOpsService
+from src.services.story_ingest_buffer import (
+    StoryIngestBuffer,
+    get_story_ingest_buffer,
+    close_story_ingest_buffer
+)
+from src.services.subtask_ledger_service import SubtaskLedgerService
+from src.services.task_template_registry import (
+    CompiledTaskTemplate,
+    TaskTemplateRegistry,
+    get_task_template_registry
+)
+from src.services.azure_devops_service import AzureDevOpsService, AzureDevOpsError
+from src.services.async_azure_devops_service import AsyncAzureDevOpsService
+from src.services.event_retention_service import EventRetentionService, EventRetentionJob
+from src.services.leader_election import LeaderElection
+from src.services.lease_heartbeat import LeaseHeartbeat
+from src.services.queue_metrics import QueueMetricsReconciler, get_queue_metrics_reconciler
 
 __all__ = [
+    "EventNotifier",
+    "get_event_notifier",
+    "EventDispatcher",
+    "get_event_dispatcher",
     "EventQueueService",
     "EventQueueServiceSingleton",
+    "IdempotencyService",
+    "get_idempotency_cache",
     "UserStoryService",
+    "StoryIngestBuffer",
+    "get_story_ingest_buffer",
+    "close_story_ingest_buffer",
+    "SubtaskLedgerService",
+    "CompiledTaskTemplate",
+    "TaskTemplateRegistry",
+    "get_task_template_registry",
     "AzureDevOpsService",
+    "AzureDevOpsError",
+    "AsyncAzureDevOpsService",
+    "EventRetentionService",
+    "EventRetentionJob",
+    "LeaderElection",
+    "LeaseHeartbeat",
+    "QueueMetricsReconciler",
+    "get_queue_metrics_reconciler",
 ]
@@ -0,0 +1,285 @@
+"""Asynchronous Azure DevOps integration service."""
+
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import httpx
+
+from src.core.config import get_settings
+from src.services.azure_devops_service import AzureDevOpsClientBase, AzureDevOpsError
+from src.services.subtask_ledger_service import SubtaskLedgerService
+from src.services.task_template_registry import CompiledTaskTemplate
+from src.utils import AdaptiveRateLimiter, get_logger, tracing
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class AsyncAzureDevOpsService(AzureDevOpsClientBase):
+    """
+    Asyncio variant of AzureDevOpsService.
+    Calls share one httpx.AsyncClient and a semaphore caps how many
+    requests are in flight at once, so many events can wait on Azure
+    DevOps from a single thread.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None
+    ):
+        """
+        Initialize async Azure DevOps service.
+        
+        Args:
+            max_concurrency: Maximum concurrent requests (defaults to settings)
+            rate_limiter: Limiter for this client's calls (default: the process-wide one)
+        """
+        super().__init__(rate_limiter)
+        
+        max_concurrency = max_concurrency or settings.AZURE_ASYNC_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=settings.AZURE_HTTP_POOL_SIZE
+            )
+        )
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.aclose()
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        body: Union[list, bytes],
+        headers: Dict[str, str]
+    ) -> httpx.Response:
+        """
+        Send one request, waiting for a free concurrency slot first.
+        
+        Goes through the same process-wide rate limiter as the sync client;
+        throttled responses are retried after the requested delay.
+        Pre-serialized bodies (bytes) are sent as-is.
+        """
+        payload = {"content": body} if isinstance(body, bytes) else {"json": body}
+        attempt = 0
+        while True:
+            with self._request_span(method, url, attempt) as span:
+                async with self._semaphore:
+                    await self.rate_limiter.acquire_async()
+                    started = time.monotonic()
+                    try:
+                        response = await self.client.request(method, url, headers=headers, **payload)
+                    except Exception:
+                        elapsed = time.monotonic() - started
+                        self.rate_limiter.release(None, elapsed)
+                        self._record_response(method, None, elapsed)
+                        raise
+                
+                elapsed = time.monotonic() - started
+                span.set_attribute("http.status_code", response.status_code)
+                self._record_response(method, response.status_code, elapsed)
+                retry_after = self.rate_limiter.release(response.status_code, elapsed, response.headers)
+            
+            if not self._should_retry(response, retry_after, attempt):
+                return response
+            attempt += 1
+    
+    async def create_task(
+        self,
+        title: str,
+        area_path: str,
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
+    ) -> Optional[int]:
+        """
+        Create a task in Azure DevOps.
+        
+        Args:
+            title: Task title
+            area_path: Area path
+            iteration_path: Iteration path
+            template: Optional compiled template containing the title
+        
+        Returns:
+            Task ID if successful, None otherwise
+        """
+        if not self.pat:
+            logger.error("✗ AZURE_DEVOPS_PAT is not configured. Cannot create task.")
+            return None
+        
+        url, task_data = self._task_request(title, area_path, iteration_path, template)
+        
+        try:
+            with tracing.start_span("azure.create_task", {"task.title": title}):
+                response = await self._send("POST", url, task_data, self.headers)
+                return self._handle_task_response(response, url, title)
+        except Exception as e:
+            logger.error("✗ Exception creating task: %s", e, exc_info=True)
+            return None
+    
+    async def link_task_to_story(self, task_id: int, story_id: int) -> bool:
+        """
+        Link a task to its parent story.
+        
+        Args:
+            task_id: Task ID
+            story_id: Parent story ID
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        url, link_data = self._link_request(task_id, story_id)
+        
+        try:
+            with tracing.start_span("azure.link_task", {"task.id": task_id, "story.id": story_id}):
+                response = await self._send("PATCH", url, link_data, self.headers)
+                return self._handle_link_response(response, task_id, story_id)
+        except Exception as e:
+            logger.error("  ✗ Exception linking task: %s", e)
+            return False
+    
+    async def create_subtasks_for_story(
+        self,
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        tasks: Optional[List[str]] = None,
+        ledger: Optional[SubtaskLedgerService] = None
+    ) -> Dict[str, Any]:
+        """
+        Create standard subtasks for a user story.
+        
+        Tasks are created concurrently; each is linked as soon as it exists.
+        
+        Args:
+            story_id: Parent story ID
+            area_path: Area path
+            iteration_path: Iteration path
+            tasks: Optional custom task list (uses the area's template if None)
+            ledger: Optional progress ledger without a bound session; its
+                calls run in worker threads
+            
+        Returns:
+            Dictionary with created task count and IDs
+        """
+        template = self._template_for(area_path, tasks)
+        tasks = template.titles
+        
+        if self.use_batch:
+            return await self.create_subtasks_batch(story_id, area_path, iteration_path, tasks, ledger)
+        
+        progress = await asyncio.to_thread(ledger.load, story_id) if ledger else {}
+        
+        async def create_and_link(position: int, task_title: str) -> Optional[int]:
+            task_id, linked = SubtaskLedgerService.completed_step(progress, position, task_title)
+            if task_id:
+                logger.info("  ↷ Reusing task #%s from previous attempt: %s", task_id, task_title)
+            else:
+                task_id = await self.create_task(task_title, area_path, iteration_path, template)
+                if not task_id:
+                    return None
+                if ledger:
+                    await asyncio.to_thread(ledger.record_created, story_id, position, task_title, task_id)
+            
+            if not linked and await self.link_task_to_story(task_id, story_id) and ledger:
+                await asyncio.to_thread(ledger.record_linked, story_id, position)
+            return task_id
+        
+        task_ids = await asyncio.gather(
+            *(create_and_link(position, task_title) for position, task_title in enumerate(tasks))
+        )
+        
+        failed = [task_title for task_title, task_id in zip(tasks, task_ids) if not task_id]
+        if failed:
+            for task_title in failed:
+                logger.error("Failed to create task: %s", task_title)
+            raise AzureDevOpsError(f"Task creation failed for: {', '.join(failed)}")
+        
+        return {
+            "story_id": story_id,
+            "tasks_created": len(task_ids),
+            "task_ids": list(task_ids)
+        }
+    
+    async def create_subtasks_batch(
+        self,
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        tasks: Optional[List[str]] = None,
+        ledger: Optional[SubtaskLedgerService] = None
+    ) -> Dict[str, Any]:
+        """
+        Create subtasks and their parent links with a single $batch request.
+        
+        Args:
+            story_id: Parent story ID
+            area_path: Area path
+            iteration_path: Iteration path
+            tasks: Optional custom task list (uses the area's template if None)
+            ledger: Optional progress ledger without a bound session
+            
+        Returns:
+            Dictionary with created task count and IDs
+        """
+        template = self._template_for(area_path, tasks)
+        tasks = template.titles
+        progress = await asyncio.to_thread(ledger.load, story_id) if ledger else {}
+        task_ids, pending, unlinked = self._plan_batch(tasks, progress)
+        failed: Dict[int, str] = {}
+        
+        if pending:
+            created, errors = await self._submit_task_batch(
+                [task_title for _, task_title in pending], story_id, area_path, iteration_path,
+                template
+            )
+            # Batch results are keyed by request index; titles may repeat
+            failed = {pending[index][0]: error for index, error in errors.items()}
+            for index, (position, task_title) in enumerate(pending):
+                if index in created:
+                    task_ids[position] = created[index]
+                    if ledger:
+                        await asyncio.to_thread(
+                            ledger.record_created, story_id, position, task_title,
+                            created[index], True
+                        )
+        
+        for position in unlinked:
+            if await self.link_task_to_story(task_ids[position], story_id) and ledger:
+                await asyncio.to_thread(ledger.record_linked, story_id, position)
+        
+        return self._batch_result(story_id, tasks, task_ids, failed)
+    
+    async def _submit_task_batch(
+        self,
+        tasks: List[str],
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
+    ) -> Tuple[Dict[int, int], Dict[int, str]]:
+        """
+        Send one $batch request creating the given tasks under a story.
+        
+        Returns:
+            Tuple of (created task IDs, error messages), both keyed by index in `tasks`
+        """
+        if not self.pat:
+            logger.error("✗ AZURE_DEVOPS_PAT is not configured. Cannot create tasks.")
+            return {}, {index: "AZURE_DEVOPS_PAT is not configured" for index in range(len(tasks))}
+        
+        url, batch, headers = self._batch_request(tasks, story_id, area_path, iteration_path, template)
+        
+        try:
+            with tracing.start_span("azure.task_batch", {"story.id": story_id, "tasks": len(tasks)}):
+                response = await self._send("POST", url, batch, headers)
+                return self._handle_batch_response(response, url, tasks)
+        except Exception as e:
+            logger.error("✗ Exception sending task batch: %s", e, exc_info=True)
+            return {}, {index: str(e) for index in range(len(tasks))}
@@ -1,44 +1,398 @@
 """Azure DevOps integration service."""
 
-import requests
-from typing import List, Dict, Any, Optional
+import json
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 from src.core.config import get_settings
-from src.core.constants import AzureDevOpsConstants, TaskTemplates
+from src.core.constants import AzureDevOpsConstants
+from src.services.subtask_ledger_service import SubtaskLedgerService
+from src.services.task_template_registry import (
+    CompiledTaskTemplate,
+    get_task_template_registry
+)
 from src.utils import (
     create_auth_header,
     build_work_item_url,
-    create_work_item_patch,
+    build_batch_url,
     create_parent_link_patch,
-    get_logger
+    get_http_session,
+    warm_up_connections,
+    AdaptiveRateLimiter,
+    get_rate_limiter,
+    get_logger,
+    sample_payload,
+    metrics,
+    tracing
 )
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
-class AzureDevOpsService:
+class AzureDevOpsError(Exception):
+    """Azure DevOps did not create or link a story's subtasks."""
+
+
+class AzureDevOpsClientBase:
     """
-    Service for Azure DevOps API integration.
-    Implements Single Responsibility Principle - handles only Azure DevOps operations.
+    Shared configuration, request building and response handling for the
+    synchronous and asynchronous Azure DevOps clients.
+    Subclasses only perform the HTTP I/O.
     """
     
-    def __init__(self):
-        """Initialize Azure DevOps service."""
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        Initialize Azure DevOps client configuration.
+        
+        Args:
+            rate_limiter: Limiter for this client's calls (default: the process-wide one)
+        """
         self.org = settings.AZURE_DEVOPS_ORG
         self.project = settings.AZURE_DEVOPS_PROJECT
         self.pat = settings.AZURE_DEVOPS_PAT
+        self.base_url = settings.AZURE_DEVOPS_BASE_URL.rstrip("/")
+        self.use_batch = settings.AZURE_DEVOPS_USE_BATCH
+        self.timeout = settings.AZURE_HTTP_TIMEOUT
         
         if not self.pat:
             logger.warning("⚠️ AZURE_DEVOPS_PAT is not set or is empty!")
         
         self.headers = create_auth_header(self.pat) if self.pat else {}
+        
+        # Process-wide limiter shared by every Azure call, sync or async, unless one is given
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_retries = settings.AZURE_MAX_RETRIES
+        
+        # Process-wide task templates, compiled once per task list
+        self.templates = get_task_template_registry()
+    
+    def _should_retry(self, response, retry_after: float, attempt: int) -> bool:
+        """
+        Decide whether a throttled response should be retried.
+        
+        The limiter has already paused new requests for retry_after seconds,
+        so the retry waits in acquire() rather than failing the task.
+        """
+        if retry_after <= 0 or attempt >= self.max_retries:
+            return False
+        logger.warning(
+            "⚠️ Throttled by Azure DevOps (%s), retrying in %.1fs (attempt %d/%d, rate %s/s)",
+            response.status_code, retry_after, attempt + 1, self.max_retries,
+            self.rate_limiter.stats()['rate_per_second']
+        )
+        return True
+    
+    @staticmethod
+    def _record_response(method: str, status_code: Optional[int], elapsed: float) -> None:
+        """Count an API response by status class and observe its latency."""
+        metrics.AZURE_REQUESTS.labels(method, metrics.status_class(status_code)).inc()
+        metrics.AZURE_REQUEST_DURATION.labels(method).observe(elapsed)
+    
+    @staticmethod
+    def _request_span(method: str, url: str, attempt: int):
+        """Trace span for one HTTP attempt, including its wait for the rate limiter."""
+        return tracing.start_span(
+            f"azure {method}",
+            {"http.method": method, "http.url": url, "retry.attempt": attempt},
+            kind=tracing.SpanKind.CLIENT
+        )
+    
+    def _template_for(
+        self,
+        area_path: str,
+        tasks: Optional[List[str]] = None
+    ) -> CompiledTaskTemplate:
+        """Get the compiled template for a custom task list, or for the story's area."""
+        if tasks:
+            return self.templates.compile(tasks)
+        return self.templates.for_area(area_path)
+    
+    def _task_request(
+        self,
+        title: str,
+        area_path: str,
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
+    ) -> Tuple[str, bytes]:
+        """Build URL and serialized patch body for creating a task."""
+        template = template or self.templates.compile([title])
+        return template.task_url, template.task_body(title, area_path, iteration_path)
+    
+    def _handle_task_response(self, response, url: str, title: str) -> Optional[int]:
+        """
+        Extract the new task ID from a create response.
+        
+        Returns:
+            Task ID if successful, None otherwise
+        """
+        logger.info("Azure API Response: Status=%s", response.status_code)
+        if sample_payload(logger, settings.LOG_PAYLOAD_SAMPLE_RATE):
+            logger.debug("Response body (first 500 chars): %s", response.text[:500])
+        
+        # Check for authentication errors (HTML response)
+        if response.headers.get('content-type', '').startswith('text/html'):
+            logger.error("✗ Authentication failed - received HTML instead of JSON")
+            logger.error("  This usually means: Invalid PAT token, PAT token expired, or wrong org/project")
+            logger.error("  URL: %s", url)
+            logger.error("  Response status: %s", response.status_code)
+            return None
+        
+        # Accept 200, 201, 203 as success
+        if response.status_code in [200, 201, 203]:
+            try:
+                response_json = response.json()
+                task_id = response_json.get('id')
+                if task_id is None:
+                    logger.error("✗ No 'id' field in response: %s", response_json)
+                    return None
+                logger.info("✓ Created task #%s: %s", task_id, title)
+                return task_id
+            except ValueError as json_err:
+                logger.error("✗ Failed to parse JSON response: %s", json_err)
+                logger.error("  Response status: %s", response.status_code)
+                logger.error("  Response body: %s", response.text[:500])
+                return None
+        else:
+            logger.error("✗ Failed to create task: %s - %s", response.status_code, response.text[:200])
+            logger.error("  URL: %s", url)
+            return None
+    
+    def _link_request(self, task_id: int, story_id: int) -> Tuple[str, list]:
+        """Build URL and patch body for linking a task to its parent."""
+        url = build_work_item_url(
+            self.org,
+            self.project,
+            AzureDevOpsConstants.WORK_ITEM_TYPE_TASK,
+            work_item_id=task_id,
+            base_url=self.base_url
+        )
+        return url, create_parent_link_patch(self.org, self.project, story_id, self.base_url)
+    
+    def _handle_link_response(self, response, task_id: int, story_id: int) -> bool:
+        """Check a link response, returning True if the link was created."""
+        if response.status_code == 200:
+            logger.info("  └─ Linked task #%s to story #%s", task_id, story_id)
+            return True
+        
+        logger.warning("  ⚠️ Linking failed (status %s): %s", response.status_code, response.text[:100])
+        logger.warning("  ℹ️ Task created but not linked. Verify story #%s exists in Azure DevOps", story_id)
+        return False
+    
+    def _batch_request(
+        self,
+        tasks: List[str],
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
+    ) -> Tuple[str, bytes, Dict[str, str]]:
+        """Build URL, serialized body and headers for a $batch request creating linked tasks."""
+        template = template or self.templates.compile(tasks)
+        batch = template.batch_body(tasks, story_id, area_path, iteration_path)
+        url = build_batch_url(self.org, AzureDevOpsConstants.API_VERSION, self.base_url)
+        headers = {**self.headers, "Content-Type": AzureDevOpsConstants.BATCH_CONTENT_TYPE}
+        return url, batch, headers
+    
+    def _handle_batch_response(
+        self,
+        response,
+        url: str,
+        tasks: List[str]
+    ) -> Tuple[Dict[int, int], Dict[int, str]]:
+        """
+        Map per-entry $batch results back to the request entries.
+        
+        Azure DevOps executes batch entries independently, so some entries
+        may succeed while others fail. Results are matched by position,
+        since titles need not be unique.
+        
+        Returns:
+            Tuple of (created task IDs, error messages), both keyed by index in `tasks`
+        """
+        logger.info("Azure batch API Response: Status=%s", response.status_code)
+        
+        if response.headers.get('content-type', '').startswith('text/html'):
+            logger.error("✗ Authentication failed - received HTML instead of JSON")
+            logger.error("  URL: %s", url)
+            return {}, {index: "Authentication failed" for index in range(len(tasks))}
+        
+        if response.status_code != 200:
+            error = f"Batch request failed: {response.status_code} - {response.text[:200]}"
+            logger.error("✗ %s", error)
+            return {}, {index: error for index in range(len(tasks))}
+        
+        results = response.json().get("value", [])
+        created: Dict[int, int] = {}
+        failed: Dict[int, str] = {}
+        
+        for index, task_title in enumerate(tasks):
+            if index >= len(results):
+                failed[index] = "Missing from batch response"
+                continue
+            
+            item = results[index]
+            code = item.get("code")
+            body = item.get("body")
+            try:
+                body = json.loads(body) if isinstance(body, str) else (body or {})
+            except ValueError:
+                body = {"message": str(body)[:200]}
+            
+            task_id = body.get("id") if code in [200, 201, 203] else None
+            if task_id is None:
+                failed[index] = f"{code} - {body.get('message', 'No id in response')}"
+            else:
+                created[index] = task_id
+                logger.info("✓ Created task #%s: %s", task_id, task_title)
+        
+        return created, failed
+    
+    def _plan_batch(
+        self,
+        tasks: List[str],
+        progress: Dict[int, Dict[str, Any]]
+    ) -> Tuple[Dict[int, int], List[Tuple[int, str]], List[int]]:
+        """
+        Split template entries by what a previous attempt already did.
+        
+        Returns:
+            Tuple of (existing task IDs by position, entries still to create,
+            positions created but not yet linked)
+        """
+        task_ids: Dict[int, int] = {}
+        pending: List[Tuple[int, str]] = []
+        unlinked: List[int] = []
+        
+        for position, task_title in enumerate(tasks):
+            task_id, linked = SubtaskLedgerService.completed_step(progress, position, task_title)
+            if task_id:
+                logger.info("  ↷ Reusing task #%s from previous attempt: %s", task_id, task_title)
+                task_ids[position] = task_id
+                if not linked:
+                    unlinked.append(position)
+            else:
+                pending.append((position, task_title))
+        
+        return task_ids, pending, unlinked
+    
+    def _batch_result(
+        self,
+        story_id: int,
+        tasks: List[str],
+        task_ids: Dict[int, int],
+        failed: Dict[int, str]
+    ) -> Dict[str, Any]:
+        """
+        Build the subtask result for a batch, raising if any entry failed.
+        
+        Args:
+            story_id: Parent story ID
+            tasks: Template task titles
+            task_ids: Task IDs by template position
+            failed: Error messages by template position
+        
+        Raises:
+            AzureDevOpsError: If any task in the batch failed
+        """
+        if failed:
+            for position, error in sorted(failed.items()):
+                logger.error("Failed to create task: %s (%s)", tasks[position], error)
+            raise AzureDevOpsError(
+                f"Task creation failed for: {', '.join(tasks[position] for position in sorted(failed))} "
+                f"(created: {[task_ids[position] for position in sorted(task_ids)]})"
+            )
+        
+        ordered_ids = [task_ids[position] for position in range(len(tasks))]
+        logger.info("  └─ Created and linked %s task(s) to story #%s in one batch", len(ordered_ids), story_id)
+        
+        return {
+            "story_id": story_id,
+            "tasks_created": len(ordered_ids),
+            "task_ids": ordered_ids
+        }
+
+
+class AzureDevOpsService(AzureDevOpsClientBase):
+    """
+    Service for Azure DevOps API integration.
+    Implements Single Responsibility Principle - handles only Azure DevOps operations.
+    """
+    
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        Initialize Azure DevOps service.
+        
+        Args:
+            rate_limiter: Limiter for this client's calls (default: the process-wide one)
+        """
+        super().__init__(rate_limiter)
+        
+        # Process-wide keep-alive pool shared by every service instance
+        self.session = get_http_session(settings.AZURE_HTTP_POOL_SIZE)
+    
+    def _request(self, method: str, url: str, body: Union[list, bytes], headers: Dict[str, str]):
+        """
+        Send a request through the shared rate limiter.
+        
+        Pre-serialized bodies (bytes) are sent as-is. Throttled responses
+        (429, or 503 with Retry-After) are retried after the delay Azure
+        DevOps asked for, up to AZURE_MAX_RETRIES times.
+        """
+        payload = {"data": body} if isinstance(body, bytes) else {"json": body}
+        attempt = 0
+        while True:
+            with self._request_span(method, url, attempt) as span:
+                self.rate_limiter.acquire()
+                started = time.monotonic()
+                try:
+                    response = self.session.request(
+                        method, url, headers=headers, timeout=self.timeout, **payload
+                    )
+                except Exception:
+                    elapsed = time.monotonic() - started
+                    self.rate_limiter.release(None, elapsed)
+                    self._record_response(method, None, elapsed)
+                    raise
+                
+                elapsed = time.monotonic() - started
+                span.set_attribute("http.status_code", response.status_code)
+                self._record_response(method, response.status_code, elapsed)
+                retry_after = self.rate_limiter.release(response.status_code, elapsed, response.headers)
+            
+            if not self._should_retry(response, retry_after, attempt):
+                return response
+            attempt += 1
+    
+    def warm_up(self, connections: int = None) -> int:
+        """
+        Open pooled connections to Azure DevOps before the first request.
+        
+        Args:
+            connections: Number of connections to open (defaults to settings)
+            
+        Returns:
+            Number of connections opened
+        """
+        if connections is None:
+            connections = settings.AZURE_HTTP_WARMUP_CONNECTIONS
+        if not self.org or connections <= 0:
+            return 0
+        
+        opened = warm_up_connections(
+            f"{self.base_url}/{self.org}",
+            connections,
+            self.timeout
+        )
+        logger.info("✓ Warmed up %s/%s Azure DevOps connection(s)", opened, connections)
+        return opened
     
     def create_task(
         self,
         title: str,
         area_path: str,
-        iteration_path: str
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
     ) -> Optional[int]:
         """
         Create a task in Azure DevOps.
@@ -47,6 +401,7 @@ class AzureDevOpsService:
             title: Task title
             area_path: Area path
             iteration_path: Iteration path
+            template: Optional compiled template containing the title
             
         Returns:
             Task ID if successful, None otherwise
@@ -56,49 +411,14 @@ class AzureDevOpsService:
             logger.error("✗ AZURE_DEVOPS_PAT is not configured. Cannot create task.")
             return None
         
-        url = build_work_item_url(
-            self.org,
-            self.project,
-            AzureDevOpsConstants.WORK_ITEM_TYPE_TASK
-        )
-        
-        task_data = create_work_item_patch(title, area_path, iteration_path)
+        url, task_data = self._task_request(title, area_path, iteration_path, template)
         
         try:
-            response = requests.post(url, json=task_data, headers=self.headers)
-            
-            logger.info(f"Azure API Response: Status={response.status_code}")
-            logger.debug(f"Response body (first 500 chars): {response.text[:500]}")
-            
-            # Check for authentication errors (HTML response)
-            if response.headers.get('content-type', '').startswith('text/html'):
-                logger.error("✗ Authentication failed - received HTML instead of JSON")
-                logger.error(f"  This usually means: Invalid PAT token, PAT token expired, or wrong org/project")
-                logger.error(f"  URL: {url}")
-                logger.error(f"  Response status: {response.status_code}")
-                return None
-            
-            # Accept 200, 201, 203 as success
-            if response.status_code in [200, 201, 203]:
-                try:
-                    response_json = response.json()
-                    task_id = response_json.get('id')
-                    if task_id is None:
-                        logger.error(f"✗ No 'id' field in response: {response_json}")
-                        return None
-                    logger.info(f"✓ Created task #{task_id}: {title}")
-                    return task_id
-                except ValueError as json_err:
-                    logger.error(f"✗ Failed to parse JSON response: {json_err}")
-                    logger.error(f"  Response status: {response.status_code}")
-                    logger.error(f"  Response body: {response.text[:500]}")
-                    return None
-            else:
-                logger.error(f"✗ Failed to create task: {response.status_code} - {response.text[:200]}")
-                logger.error(f"  URL: {url}")
-                return None
+            with tracing.start_span("azure.create_task", {"task.title": title}):
+                response = self._request("POST", url, task_data, self.headers)
+                return self._handle_task_response(response, url, title)
         except Exception as e:
-            logger.error(f"✗ Exception creating task: {e}", exc_info=True)
+            logger.error("✗ Exception creating task: %s", e, exc_info=True)
             return None
     
     def link_task_to_story(self, task_id: int, story_id: int) -> bool:
@@ -112,31 +432,14 @@ class AzureDevOpsService:
         Returns:
             True if successful, False otherwise
         """
-        url = build_work_item_url(
-            self.org,
-            self.project,
-            AzureDevOpsConstants.WORK_ITEM_TYPE_TASK,
-            work_item_id=task_id
-        )
-        
-        link_data = create_parent_link_patch(self.org, self.project, story_id)
+        url, link_data = self._link_request(task_id, story_id)
         
         try:
-            response = requests.patch(url, json=link_data, headers=self.headers)
-            
-            if response.status_code == 200:
-                logger.info(f"  └─ Linked task #{task_id} to story #{story_id}")
-                return True
-            else:
-                logger.warning(
-                    f"  ⚠️ Linking failed (status {response.status_code}): {response.text[:100]}"
-                )
-                logger.warning(
-                    f"  ℹ️ Task created but not linked. Verify story #{story_id} exists in Azure DevOps"
-                )
-                return False
+            with tracing.start_span("azure.link_task", {"task.id": task_id, "story.id": story_id}):
+                response = self._request("PATCH", url, link_data, self.headers)
+                return self._handle_link_response(response, task_id, story_id)
         except Exception as e:
-            logger.error(f"  ✗ Exception linking task: {e}")
+            logger.error("  ✗ Exception linking task: %s", e)
             return False
     
     def create_subtasks_for_story(
@@ -144,7 +447,8 @@ class AzureDevOpsService:
         story_id: int,
         area_path: str,
         iteration_path: str,
-        tasks: Optional[List[str]] = None
+        tasks: Optional[List[str]] = None,
+        ledger: Optional[SubtaskLedgerService] = None
     ) -> Dict[str, Any]:
         """
         Create standard subtasks for a user story.
@@ -153,26 +457,123 @@ class AzureDevOpsService:
             story_id: Parent story ID
             area_path: Area path
             iteration_path: Iteration path
-            tasks: Optional custom task list (uses standard template if None)
+            tasks: Optional custom task list (uses the area's template if None)
+            ledger: Optional progress ledger; steps already recorded there
+                are skipped and each new step is recorded as it completes
             
         Returns:
             Dictionary with created task count and IDs
         """
-        tasks = tasks or TaskTemplates.STANDARD_TASKS
+        template = self._template_for(area_path, tasks)
+        tasks = template.titles
+        
+        if self.use_batch:
+            return self.create_subtasks_batch(story_id, area_path, iteration_path, tasks, ledger)
+        
+        progress = ledger.load(story_id) if ledger else {}
         created_tasks = []
         
-        for task_title in tasks:
-            task_id = self.create_task(task_title, area_path, iteration_path)
+        for position, task_title in enumerate(tasks):
+            task_id, linked = SubtaskLedgerService.completed_step(progress, position, task_title)
             
             if task_id:
-                created_tasks.append(task_id)
-                self.link_task_to_story(task_id, story_id)
+                logger.info("  ↷ Reusing task #%s from previous attempt: %s", task_id, task_title)
             else:
-                logger.error(f"Failed to create task: {task_title}")
-                raise Exception(f"Task creation failed for: {task_title}")
+                task_id = self.create_task(task_title, area_path, iteration_path, template)
+                if not task_id:
+                    logger.error("Failed to create task: %s", task_title)
+                    raise AzureDevOpsError(f"Task creation failed for: {task_title}")
+                if ledger:
+                    ledger.record_created(story_id, position, task_title, task_id)
+            
+            created_tasks.append(task_id)
+            
+            if not linked and self.link_task_to_story(task_id, story_id) and ledger:
+                ledger.record_linked(story_id, position)
         
         return {
             "story_id": story_id,
             "tasks_created": len(created_tasks),
             "task_ids": created_tasks
         }
+    
+    def create_subtasks_batch(
+        self,
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        tasks: Optional[List[str]] = None,
+        ledger: Optional[SubtaskLedgerService] = None
+    ) -> Dict[str, Any]:
+        """
+        Create subtasks and their parent links with a single $batch request.
+        
+        Each task is created with the parent relation already in its payload,
+        so no separate linking call is needed. With a ledger, only entries
+        not created by a previous attempt are sent.
+        
+        Args:
+            story_id: Parent story ID
+            area_path: Area path
+            iteration_path: Iteration path
+            tasks: Optional custom task list (uses the area's template if None)
+            ledger: Optional progress ledger
+            
+        Returns:
+            Dictionary with created task count and IDs
+            
+        Raises:
+            AzureDevOpsError: If any task in the batch failed
+        """
+        template = self._template_for(area_path, tasks)
+        tasks = template.titles
+        progress = ledger.load(story_id) if ledger else {}
+        task_ids, pending, unlinked = self._plan_batch(tasks, progress)
+        failed: Dict[int, str] = {}
+        
+        if pending:
+            created, errors = self._submit_task_batch(
+                [task_title for _, task_title in pending], story_id, area_path, iteration_path,
+                template
+            )
+            # Batch results are keyed by request index; titles may repeat
+            failed = {pending[index][0]: error for index, error in errors.items()}
+            for index, (position, task_title) in enumerate(pending):
+                if index in created:
+                    task_ids[position] = created[index]
+                    if ledger:
+                        ledger.record_created(story_id, position, task_title, created[index], linked=True)
+        
+        for position in unlinked:
+            if self.link_task_to_story(task_ids[position], story_id) and ledger:
+                ledger.record_linked(story_id, position)
+        
+        return self._batch_result(story_id, tasks, task_ids, failed)
+    
+    def _submit_task_batch(
+        self,
+        tasks: List[str],
+        story_id: int,
+        area_path: str,
+        iteration_path: str,
+        template: Optional[CompiledTaskTemplate] = None
+    ) -> Tuple[Dict[int, int], Dict[int, str]]:
+        """
+        Send one $batch request creating the given tasks under a story.
+        
+        Returns:
+            Tuple of (created task IDs, error messages), both keyed by index in `tasks`
+        """
+        if not self.pat:
+            logger.error("✗ AZURE_DEVOPS_PAT is not configured. Cannot create tasks.")
+            return {}, {index: "AZURE_DEVOPS_PAT is not configured" for index in range(len(tasks))}
+        
+        url, batch, headers = self._batch_request(tasks, story_id, area_path, iteration_path, template)
+        
+        try:
+            with tracing.start_span("azure.task_batch", {"story.id": story_id, "tasks": len(tasks)}):
+                response = self._request("POST", url, batch, headers)
+                return self._handle_batch_response(response, url, tasks)
+        except Exception as e:
+            logger.error("✗ Exception sending task batch: %s", e, exc_info=True)
+            return {}, {index: str(e) for index in range(len(tasks))}
@@ -0,0 +1,111 @@
+"""In-process hand-off of freshly published events to an embedded worker."""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.core.config import get_settings
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+DispatchedEvent = Tuple[int, str, Dict[str, Any]]
+
+
+class EventDispatcher:
+    """
+    Bounded queue of already-persisted events for a worker in the same process.
+    
+    Publishers offer the event ID and payload right after the insert commits,
+    so the worker can claim the row by ID and use the payload it already has
+    instead of reading the event back. The database row stays the source of
+    truth: anything not handed off (no worker attached, queue full, process
+    crash) is still picked up by polling.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Initialize event dispatcher.
+        
+        Args:
+            max_size: Maximum events held before offers are refused
+                (default: WORKER_DISPATCH_QUEUE_SIZE)
+        """
+        self.max_size = max_size or get_settings().WORKER_DISPATCH_QUEUE_SIZE
+        self._queue: Deque[DispatchedEvent] = deque()
+        self._lock = threading.Lock()
+        self._attached = False
+    
+    @property
+    def is_attached(self) -> bool:
+        """Whether a worker is consuming handed-off events."""
+        return self._attached
+    
+    def attach(self, max_size: Optional[int] = None) -> None:
+        """
+        Start accepting events for a worker in this process.
+        
+        Args:
+            max_size: Optional new queue bound
+        """
+        with self._lock:
+            if max_size:
+                self.max_size = max_size or get_settings().WORKER_DISPATCH_QUEUE_SIZE
+            self._attached = True
+    
+    def detach(self) -> None:
+        """Stop accepting events; queued ones are left to polling."""
+        with self._lock:
+            self._attached = False
+            self._queue.clear()
+    
+    def offer(self, event_id: int, event_type: str, data: Dict[str, Any]) -> bool:
+        """
+        Hand a committed event to the attached worker.
+        
+        Args:
+            event_id: Event ID
+            event_type: Type of event
+            data: Event data
+        
+        Returns:
+            True if queued, False if the event is left to polling
+        """
+        with self._lock:
+            if not self._attached:
+                return False
+            if len(self._queue) >= self.max_size:
+                logger.warning("⚠️ Dispatch queue full, event #%s left to polling", event_id)
+                return False
+            self._queue.append((event_id, event_type, data))
+            return True
+    
+    def take(self, limit: int) -> List[DispatchedEvent]:
+        """
+        Remove up to `limit` queued events, oldest first.
+        
+        Args:
+            limit: Maximum events to return
+        
+        Returns:
+            List of (event ID, event type, data) tuples
+        """
+        with self._lock:
+            count = min(limit, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+
+_dispatcher: Optional[EventDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_event_dispatcher() -> EventDispatcher:
+    """Get the process-wide event dispatcher."""
+    global _dispatcher
+    
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = EventDispatcher()
+    
+    return _dispatcher
@@ -0,0 +1,148 @@
+"""Push notifications that wake workers when events are published."""
+
+import select
+import threading
+from typing import Optional
+
+from src.core.constants import WorkerConfig
+from src.core.database import engine
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class EventNotifier:
+    """
+    Wakes waiting workers as soon as new events are published.
+    
+    Publishes in the same process signal a condition variable directly. On
+    PostgreSQL a background LISTEN connection forwards NOTIFYs sent by other
+    processes to the same condition. Waiters compare a generation counter,
+    so a notification that arrives between a claim and the next wait is
+    never lost.
+    """
+    
+    def __init__(self, channel: str = WorkerConfig.NOTIFY_CHANNEL):
+        """
+        Initialize event notifier.
+        
+        Args:
+            channel: PostgreSQL notification channel
+        """
+        self.channel = channel
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._listener: Optional[threading.Thread] = None
+        self._stop_listener = threading.Event()
+    
+    @property
+    def generation(self) -> int:
+        """Number of notifications seen so far."""
+        with self._condition:
+            return self._generation
+    
+    @property
+    def is_listening(self) -> bool:
+        """Whether cross-process notifications are being received."""
+        return self._listener is not None and self._listener.is_alive()
+    
+    def notify(self) -> None:
+        """Wake every waiting worker in this process."""
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+    
+    def wait(self, since: int, timeout: float) -> bool:
+        """
+        Wait until a notification newer than `since` arrives.
+        
+        Args:
+            since: Generation observed before the last claim
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if notified, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation != since, timeout)
+    
+    def start_listener(self) -> bool:
+        """
+        Start forwarding PostgreSQL NOTIFYs to local waiters.
+        
+        Returns:
+            True if a listener is running (PostgreSQL only)
+        """
+        if engine.dialect.name != "postgresql":
+            return False
+        if self.is_listening:
+            return True
+        
+        self._stop_listener.clear()
+        self._listener = threading.Thread(
+            target=self._listen_loop,
+            name="event-notify-listener",
+            daemon=True
+        )
+        self._listener.start()
+        logger.info("✓ Listening for event notifications on '%s'", self.channel)
+        return True
+    
+    def stop_listener(self) -> None:
+        """Stop the PostgreSQL listener thread."""
+        self._stop_listener.set()
+        if self._listener and self._listener.is_alive():
+            self._listener.join(timeout=WorkerConfig.NOTIFY_LISTEN_TIMEOUT + 1)
+        self._listener = None
+    
+    def _listen_loop(self) -> None:
+        """Hold a dedicated LISTEN connection, reconnecting on failure."""
+        while not self._stop_listener.is_set():
+            connection = None
+            try:
+                # Detached from the pool so it never counts against pool size
+                raw = engine.raw_connection()
+                raw.detach()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                
+                # Anything published while we were disconnected
+                self.notify()
+                
+                while not self._stop_listener.is_set():
+                    readable, _, _ = select.select(
+                        [connection], [], [], WorkerConfig.NOTIFY_LISTEN_TIMEOUT
+                    )
+                    if not readable:
+                        continue
+                    connection.poll()
+                    if connection.notifies:
+                        connection.notifies.clear()
+                        self.notify()
+            except Exception as e:
+                logger.warning("⚠️ Event notification listener error: %s", e)
+                self._stop_listener.wait(WorkerConfig.NOTIFY_RECONNECT_DELAY)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+_notifier: Optional[EventNotifier] = None
+_notifier_lock = threading.Lock()
+
+
+def get_event_notifier() -> EventNotifier:
+    """Get the process-wide event notifier."""
+    global _notifier
+    
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = EventNotifier()
+    
+    return _notifier
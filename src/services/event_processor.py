@@ -1,15 +1,57 @@
 """Event processor for handling different event types."""
 
+import asyncio
 import json
-from typing import Dict, Any
+import time
+from datetime import timezone
+from typing import Dict, Any, Optional, Tuple, Callable
+
+import httpx
+import requests
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from src.services import AzureDevOpsService, EventQueueService, UserStoryService
-from src.core.constants import EventType, AzureDevOpsConstants, StoryStatus
-from src.utils import get_logger
+from src.services import (
+    AzureDevOpsService,
+    AsyncAzureDevOpsService,
+    AzureDevOpsError,
+    EventQueueService,
+    UserStoryService,
+    SubtaskLedgerService
+)
+from src.core.constants import EventType, EventStatus, AzureDevOpsConstants, StoryStatus
+from src.core.database import get_db_context
+from src.utils import get_logger, metrics, tracing
 
 logger = get_logger(__name__)
 
+# Failures a later attempt can get past: Azure DevOps refusing or dropping a
+# call, or a lost connection. Anything else, such as an unknown event type or
+# malformed event data, fails the same way every time and is not retried.
+RETRYABLE_ERRORS = (AzureDevOpsError, requests.RequestException, httpx.HTTPError, OperationalError)
+
+
+def _parse_event_data(event) -> Any:
+    """Deserialize event data, or None if it is not valid JSON."""
+    if not isinstance(event.data, str):
+        return event.data
+    try:
+        return json.loads(event.data)
+    except ValueError:
+        return None
+
+
+def _check_event_data(event_data: Any) -> Dict[str, Any]:
+    """
+    Check that event data is a JSON object.
+    
+    Raises:
+        ValueError: If it is not
+    """
+    if not isinstance(event_data, dict):
+        raise ValueError("Malformed event data: expected a JSON object")
+    return event_data
+
 
 class EventProcessor:
     """
@@ -17,17 +59,32 @@ class EventProcessor:
     Implements Single Responsibility Principle and Open/Closed Principle.
     """
     
-    def __init__(self, event_queue: EventQueueService, db: Session):
+    def __init__(
+        self,
+        event_queue: EventQueueService,
+        db: Session,
+        azure_service: Optional[AzureDevOpsService] = None
+    ):
         """
         Initialize event processor.
         
         Args:
             event_queue: Event queue service instance
             db: Database session
+            azure_service: Shared Azure DevOps service (created on first use if None)
         """
+        self.db = db
         self.event_queue = event_queue
-        self.azure_service = AzureDevOpsService()
+        self._azure_service = azure_service
         self.story_service = UserStoryService(db)
+        self.ledger = SubtaskLedgerService(db)
+    
+    @property
+    def azure_service(self) -> AzureDevOpsService:
+        """Azure DevOps service, created lazily when none was injected."""
+        if self._azure_service is None:
+            self._azure_service = AzureDevOpsService()
+        return self._azure_service
     
     def process_event(self, event) -> None:
         """
@@ -38,63 +95,252 @@ class EventProcessor:
         """
         event_id = event.id
         event_type = event.event_type
-        event_data = json.loads(event.data) if isinstance(event.data, str) else event.data
+        event_data = _parse_event_data(event)
+        # Claimed events finish only while their worker still holds the lease
+        worker_id = event.worker_id
+        started = time.perf_counter()
+        outcome = EventStatus.COMPLETED.value
         
-        try:
-            self.event_queue.mark_processing(event_id)
-            logger.info(f"[Event {event_id}] Processing: {event_type}")
+        with self.start_event_span(event, event_data) as span:
+            try:
+                # Events claimed by a worker are already in processing
+                if event.status != EventStatus.PROCESSING.value:
+                    self.event_queue.mark_processing(event_id)
+                logger.info("[Event %s] Processing: %s", event_id, event_type)
+                
+                # Dispatch to appropriate handler
+                if event_type == EventType.USER_STORY_CREATED.value:
+                    self._process_user_story_created(event_id, _check_event_data(event_data), worker_id)
+                elif event_type == EventType.USER_STORY_COMPLETED.value:
+                    # Just mark as completed, no further processing needed
+                    logger.info("[Event %s] Completion event recorded", event_id)
+                    self.event_queue.mark_completed(event_id, {"status": "recorded"}, worker_id=worker_id)
+                else:
+                    raise ValueError(f"Unknown event type: {event_type}")
             
-            # Dispatch to appropriate handler
-            if event_type == EventType.USER_STORY_CREATED.value:
-                result = self._process_user_story_created(event_id, event_data)
-                self.event_queue.mark_completed(event_id, result)
-            elif event_type == EventType.USER_STORY_COMPLETED.value:
-                # Just mark as completed, no further processing needed
-                logger.info(f"[Event {event_id}] Completion event recorded")
-                self.event_queue.mark_completed(event_id, {"status": "recorded"})
-            else:
-                raise Exception(f"Unknown event type: {event_type}")
-        
-        except Exception as e:
-            logger.error(f"[Event {event_id}] ✗ Failed: {e}")
-            self.event_queue.mark_failed(event_id, str(e))
+            except Exception as e:
+                outcome = EventStatus.FAILED.value
+                span.record_error(str(e))
+                logger.error("[Event %s] ✗ Failed: %s", event_id, e)
+                self.event_queue.mark_failed(
+                    event_id, str(e), worker_id, retry=isinstance(e, RETRYABLE_ERRORS)
+                )
+            finally:
+                span.set_attribute("event.outcome", outcome)
+                self.record_outcome(event_type, outcome, started)
+    
+    @staticmethod
+    def start_event_span(event, event_data: Any):
+        """
+        Start the span for processing an event, continuing the trace it carries.
+        
+        The time the event spent queued, from its creation until now, is
+        recorded as a sibling span.
+        
+        Args:
+            event: Event being processed
+            event_data: Deserialized event data
+        
+        Returns:
+            Span to use as a context manager around processing
+        """
+        parent = tracing.extract(event_data)
+        if event.created_at is not None:
+            created_ns = int(event.created_at.replace(tzinfo=timezone.utc).timestamp() * 1e9)
+            tracing.start_span(
+                "queue.wait", {"event.id": event.id}, parent=parent, start_time_ns=created_ns
+            ).end()
+        return tracing.start_span(
+            f"process {event.event_type}",
+            {"event.id": event.id, "event.type": event.event_type},
+            parent=parent,
+            kind=tracing.SpanKind.CONSUMER
+        )
+    
+    @staticmethod
+    def record_outcome(event_type: str, outcome: str, started: float) -> None:
+        """
+        Count a processed event and observe how long it took.
+        
+        Args:
+            event_type: Type of the event
+            outcome: Final status, completed or failed
+            started: perf_counter() reading taken when processing began
+        """
+        metrics.EVENTS_PROCESSED.labels(event_type, outcome).inc()
+        metrics.EVENT_PROCESSING.labels(event_type, outcome).observe(time.perf_counter() - started)
     
-    def _process_user_story_created(self, event_id: int, story_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_user_story_created(
+        self,
+        event_id: int,
+        story_data: Dict[str, Any],
+        worker_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Process user story created event.
         
         Args:
             event_id: Event ID
             story_data: Story data from event
+            worker_id: Worker holding the event's lease
             
         Returns:
             Result dictionary with created task information
         """
-        story_id = story_data['story_id']
-        area_path = story_data.get('area_path') or AzureDevOpsConstants.DEFAULT_AREA_PATH
-        iteration_path = story_data.get('iteration_path') or AzureDevOpsConstants.DEFAULT_ITERATION_PATH
+        story_id, area_path, iteration_path = self._story_target(story_data)
         
-        logger.info(f"[Event {event_id}] Processing Story #{story_id}")
+        logger.info("[Event %s] Processing Story #%s", event_id, story_id)
         
-        # Create subtasks using Azure DevOps service
+        # Create subtasks using Azure DevOps service, resuming earlier progress
         result = self.azure_service.create_subtasks_for_story(
             story_id=story_id,
             area_path=area_path,
-            iteration_path=iteration_path
+            iteration_path=iteration_path,
+            ledger=self.ledger
         )
         
-        # Update story status to completed
-        self.story_service.update_story_status(story_id, StoryStatus.COMPLETED.value)
-        logger.info(f"[Event {event_id}] Updated story #{story_id} status to completed")
+        self._finish_user_story(event_id, story_id, result, worker_id)
+        return result
+    
+    @staticmethod
+    def _story_target(story_data: Dict[str, Any]) -> Tuple[int, str, str]:
+        """Get story ID, area path and iteration path from event data."""
+        story_id = story_data['story_id']
+        area_path = story_data.get('area_path') or AzureDevOpsConstants.DEFAULT_AREA_PATH
+        iteration_path = story_data.get('iteration_path') or AzureDevOpsConstants.DEFAULT_ITERATION_PATH
+        return story_id, area_path, iteration_path
+    
+    def _finish_user_story(
+        self,
+        event_id: int,
+        story_id: int,
+        result: Dict[str, Any],
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Record the outcome of subtask creation in one transaction.
         
-        # Publish completion event
-        self.event_queue.publish_event(
-            EventType.USER_STORY_COMPLETED.value,
-            result
-        )
+        The processed event, the story status and the completion event are
+        written with direct statements and committed together, so either
+        all of them land or none do. If the worker's lease was lost, the
+        event belongs to whoever reclaimed it and nothing is written.
+        
+        Args:
+            event_id: Event ID
+            story_id: Azure DevOps story ID
+            result: Subtask creation result
+            worker_id: Worker holding the event's lease
+        
+        Returns:
+            False if the lease was lost
+        """
+        # The completion event continues the story's trace
+        completion = dict(result)
+        tracing.inject(completion)
+        
+        with tracing.start_span("db.finish_story", {"story.id": story_id}):
+            try:
+                # A lost lease rolls the transaction back
+                if not self.event_queue.mark_completed(event_id, result, commit=False, worker_id=worker_id):
+                    return False
+                self.story_service.set_story_status(story_id, StoryStatus.COMPLETED.value, commit=False)
+                completion_ids = self.event_queue.stage_events(
+                    EventType.USER_STORY_COMPLETED.value, [completion]
+                )
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
         
-        logger.info(
-            f"[Event {event_id}] ✓ Completed: {result['tasks_created']} subtasks created"
+        self.event_queue.announce_events(
+            EventType.USER_STORY_COMPLETED.value, list(zip(completion_ids, [completion]))
         )
+        logger.info("[Event %s] Updated story #%s status to completed", event_id, story_id)
+        logger.info("[Event %s] ✓ Completed: %s subtasks created", event_id, result['tasks_created'])
+        return True
+
+
+class AsyncEventProcessor:
+    """
+    Processes events with the async Azure DevOps client.
+    Azure calls are awaited on the event loop; each database step runs in a
+    worker thread with its own session so the loop never blocks on the DB.
+    """
+    
+    def __init__(self, azure_service: AsyncAzureDevOpsService):
+        """
+        Initialize async event processor.
         
-        return result
+        Args:
+            azure_service: Shared async Azure DevOps service
+        """
+        self.azure_service = azure_service
+        # Session-less ledger: each call runs in a worker thread with its own session
+        self.ledger = SubtaskLedgerService()
+    
+    async def process_event(self, event) -> None:
+        """
+        Process a single event.
+        
+        Args:
+            event: Event object (detached from its session)
+        """
+        event_id = event.id
+        event_type = event.event_type
+        event_data = _parse_event_data(event)
+        worker_id = event.worker_id
+        started = time.perf_counter()
+        outcome = EventStatus.COMPLETED.value
+        
+        with EventProcessor.start_event_span(event, event_data) as span:
+            try:
+                if event.status != EventStatus.PROCESSING.value:
+                    await self._in_session(lambda p: p.event_queue.mark_processing(event_id))
+                logger.info("[Event %s] Processing: %s", event_id, event_type)
+                
+                if event_type == EventType.USER_STORY_CREATED.value:
+                    story_id, area_path, iteration_path = EventProcessor._story_target(
+                        _check_event_data(event_data)
+                    )
+                    logger.info("[Event %s] Processing Story #%s", event_id, story_id)
+                    
+                    result = await self.azure_service.create_subtasks_for_story(
+                        story_id=story_id,
+                        area_path=area_path,
+                        iteration_path=iteration_path,
+                        ledger=self.ledger
+                    )
+                    
+                    await self._in_session(
+                        lambda p: p._finish_user_story(event_id, story_id, result, worker_id)
+                    )
+                elif event_type == EventType.USER_STORY_COMPLETED.value:
+                    logger.info("[Event %s] Completion event recorded", event_id)
+                    await self._in_session(
+                        lambda p: p.event_queue.mark_completed(
+                            event_id, {"status": "recorded"}, worker_id=worker_id
+                        )
+                    )
+                else:
+                    raise ValueError(f"Unknown event type: {event_type}")
+            
+            except Exception as e:
+                outcome = EventStatus.FAILED.value
+                span.record_error(str(e))
+                logger.error("[Event %s] ✗ Failed: %s", event_id, e)
+                error, retry = str(e), isinstance(e, RETRYABLE_ERRORS)
+                await self._in_session(
+                    lambda p: p.event_queue.mark_failed(event_id, error, worker_id, retry=retry)
+                )
+            finally:
+                span.set_attribute("event.outcome", outcome)
+                EventProcessor.record_outcome(event_type, outcome, started)
+    
+    @staticmethod
+    async def _in_session(action: Callable[[EventProcessor], Any]) -> Any:
+        """Run a database action in a worker thread with a fresh session."""
+        def run() -> Any:
+            with get_db_context() as db:
+                return action(EventProcessor(EventQueueService(db), db))
+        
+        return await asyncio.to_thread(run)
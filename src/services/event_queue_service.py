@@ -1,14 +1,19 @@
 """Event queue service for publishing and processing events."""
 
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from src.repositories import EventRepository
-from src.core.constants import EventStatus
-from src.utils import get_logger
+from src.core.config import get_settings
+from src.core.constants import EventStatus, WorkerConfig
+from src.core.models import Event
+from src.services.event_dispatcher import get_event_dispatcher
+from src.services.event_notifier import get_event_notifier
+from src.utils import get_logger, metrics
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 class EventQueueService:
@@ -27,13 +32,15 @@ class EventQueueService:
         self.db = db
         self.event_repo = EventRepository(db)
     
-    def publish_event(self, event_type: str, data: Dict[str, Any]) -> int:
+    def publish_event(self, event_type: str, data: Dict[str, Any], dispatch: bool = False) -> int:
         """
         Publish a new event to the queue.
         
         Args:
             event_type: Type of event
             data: Event data
+            dispatch: Also hand the committed event to a worker in this
+                process, which then skips reading it back
             
         Returns:
             Event ID
@@ -41,11 +48,63 @@ class EventQueueService:
         event = self.event_repo.create(
             event_type=event_type,
             data=json.dumps(data),
-            status=EventStatus.PENDING.value
+            status=EventStatus.PENDING.value,
+            notify_channel=self._notify_channel()
         )
-        logger.info(f"Published event #{event.id} of type '{event_type}'")
+        self.announce_events(event_type, [(event.id, data)], dispatch)
+        logger.info("Published event #%s of type '%s'", event.id, event_type)
         return event.id
     
+    def stage_events(self, event_type: str, data: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add several events to the caller's transaction without committing.
+        
+        Call announce_events once the transaction has committed.
+        
+        Args:
+            event_type: Type of every event
+            data: Data for each event
+            
+        Returns:
+            Event IDs in the same order as `data`
+        """
+        return self.event_repo.insert_many(
+            event_type=event_type,
+            data=[json.dumps(item) for item in data],
+            status=EventStatus.PENDING.value,
+            notify_channel=self._notify_channel()
+        )
+    
+    def announce_events(
+        self,
+        event_type: str,
+        events: List[Tuple[int, Dict[str, Any]]],
+        dispatch: bool = False
+    ) -> None:
+        """
+        Let workers in this process know about committed events.
+        
+        Args:
+            event_type: Type of the events
+            events: (event ID, data) pairs
+            dispatch: Also hand the events to an embedded worker
+        """
+        if events:
+            metrics.EVENTS_PUBLISHED.labels(event_type).inc(len(events))
+            metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).inc(len(events))
+        if dispatch:
+            dispatcher = get_event_dispatcher()
+            for event_id, data in events:
+                dispatcher.offer(event_id, event_type, data)
+        if settings.EVENT_NOTIFICATIONS_ENABLED and events:
+            # Wake a worker running in this process without waiting for a poll
+            get_event_notifier().notify()
+    
+    @staticmethod
+    def _notify_channel() -> Optional[str]:
+        """PostgreSQL channel to NOTIFY on publish, if notifications are on."""
+        return WorkerConfig.NOTIFY_CHANNEL if settings.EVENT_NOTIFICATIONS_ENABLED else None
+    
     def get_pending_events(self) -> List:
         """
         Get all pending events.
@@ -55,33 +114,187 @@ class EventQueueService:
         """
         return self.event_repo.get_pending_events()
     
+    def claim_events(self, worker_id: str, limit: int, lease_seconds: int) -> List:
+        """
+        Claim a batch of pending events for exclusive processing.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            limit: Maximum number of events to claim
+            lease_seconds: Seconds before an unfinished claim is reclaimed
+            
+        Returns:
+            List of claimed events, oldest first
+        """
+        events = self.event_repo.claim_pending_events(worker_id, limit, lease_seconds)
+        if events:
+            logger.debug("Worker %s claimed %s event(s)", worker_id, len(events))
+        return events
+    
+    def claim_dispatched(
+        self,
+        worker_id: str,
+        dispatched: List[Tuple[int, str, Dict[str, Any]]],
+        lease_seconds: int
+    ) -> List[Event]:
+        """
+        Claim events handed over in memory and rebuild them from their payloads.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            dispatched: (event ID, event type, data) tuples from the dispatcher
+            lease_seconds: Seconds before an unfinished claim is reclaimed
+            
+        Returns:
+            Transient events for the IDs that were still pending
+        """
+        claimed = set(self.event_repo.claim_events_by_id(
+            worker_id, [event_id for event_id, _, _ in dispatched], lease_seconds
+        ))
+        events = [
+            Event(
+                id=event_id,
+                event_type=event_type,
+                data=data,
+                status=EventStatus.PROCESSING.value,
+                worker_id=worker_id
+            )
+            for event_id, event_type, data in dispatched
+            if event_id in claimed
+        ]
+        if events:
+            logger.debug("Worker %s claimed %s dispatched event(s)", worker_id, len(events))
+        return events
+    
+    def get_event(self, event_id: int):
+        """
+        Get a single event by ID.
+        
+        Args:
+            event_id: Event ID
+            
+        Returns:
+            Event if found, None otherwise
+        """
+        return self.event_repo.get_by_id(event_id)
+    
+    def latest_story_events(self, event_type: str, story_ids: List[int]) -> Dict[int, int]:
+        """
+        Get the newest event of a type published for each story.
+        
+        Args:
+            event_type: Event type
+            story_ids: Azure DevOps story IDs
+            
+        Returns:
+            Mapping of each story ID that has an event to its newest event ID
+        """
+        return self.event_repo.latest_ids_for_stories(event_type, story_ids)
+    
     def mark_processing(self, event_id: int) -> None:
         """Mark an event as processing."""
         self.event_repo.mark_processing(event_id)
-        logger.debug(f"Event #{event_id} marked as processing")
+        logger.debug("Event #%s marked as processing", event_id)
     
-    def mark_completed(self, event_id: int, result: Optional[Dict[str, Any]] = None) -> None:
+    def mark_completed(
+        self,
+        event_id: int,
+        result: Optional[Dict[str, Any]] = None,
+        commit: bool = True,
+        worker_id: Optional[str] = None
+    ) -> bool:
         """
         Mark an event as completed.
         
         Args:
             event_id: Event ID
             result: Optional result data
+            commit: Commit immediately; pass False to join the caller's transaction
+            worker_id: Claiming worker; the update is skipped if its lease was lost
+            
+        Returns:
+            False if the lease was lost; the event was left untouched and
+            the transaction rolled back
         """
         result_json = json.dumps(result) if result else None
-        self.event_repo.mark_completed(event_id, result_json)
-        logger.info(f"Event #{event_id} completed successfully")
+        if not self.event_repo.mark_completed(event_id, result_json, commit, worker_id):
+            logger.warning("⚠️ Event #%s lease lost to another worker, result discarded", event_id)
+            return False
+        logger.info("Event #%s completed successfully", event_id)
+        return True
     
-    def mark_failed(self, event_id: int, error: str) -> None:
+    def mark_failed(
+        self,
+        event_id: int,
+        error: str,
+        worker_id: Optional[str] = None,
+        retry: bool = True
+    ) -> bool:
         """
-        Mark an event as failed.
+        Record a failed attempt of an event.
+        
+        While fewer than EVENT_MAX_RETRIES retries were made, the event goes
+        back to pending and is claimed again after EVENT_RETRY_DELAY_SECONDS;
+        the subtask ledger lets the retry resume where this attempt stopped.
         
         Args:
             event_id: Event ID
             error: Error message
+            worker_id: Claiming worker; the update is skipped if its lease was lost
+            retry: False for errors a retry cannot fix; the event fails right away
+            
+        Returns:
+            False if the lease was lost and the event was left untouched
+        """
+        outcome = self.event_repo.mark_failed(
+            event_id, error, worker_id,
+            max_retries=settings.EVENT_MAX_RETRIES if retry else 0,
+            retry_delay=settings.EVENT_RETRY_DELAY_SECONDS
+        )
+        if outcome is None:
+            logger.warning("⚠️ Event #%s lease lost to another worker, failure not recorded: %s", event_id, error)
+            return False
+        
+        status, retry_count = outcome
+        if status == EventStatus.PENDING.value:
+            logger.warning(
+                "⚠️ Event #%s failed, retry %s/%s in %ss: %s",
+                event_id, retry_count, settings.EVENT_MAX_RETRIES, settings.EVENT_RETRY_DELAY_SECONDS, error
+            )
+        else:
+            logger.error("Event #%s failed: %s", event_id, error)
+        return True
+    
+    def retry_failed(self, event_ids: Optional[List[int]] = None) -> List[int]:
+        """
+        Return failed events to pending with a fresh retry budget.
+        
+        Args:
+            event_ids: Events to retry; all failed events if None
+            
+        Returns:
+            IDs of the events returned to pending
+        """
+        retried = self.event_repo.retry_failed(event_ids)
+        if retried:
+            logger.info("Returned %s failed event(s) to pending", len(retried))
+            if settings.EVENT_NOTIFICATIONS_ENABLED:
+                get_event_notifier().notify()
+        return retried
+    
+    def renew_leases(self, worker_id: str, event_ids: List[int], lease_seconds: int) -> List[int]:
+        """
+        Extend the leases of events a worker is still processing.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+            event_ids: Events still being processed
+            lease_seconds: New lease length, counted from now
+            
+        Returns:
+            IDs whose lease was renewed
         """
-        self.event_repo.mark_failed(event_id, error)
-        logger.error(f"Event #{event_id} failed: {error}")
+        return self.event_repo.renew_leases(worker_id, event_ids, lease_seconds)
 
 
 class EventQueueServiceSingleton:
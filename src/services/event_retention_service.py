@@ -0,0 +1,250 @@
+"""Event retention: archives old completed events out of the queue table."""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.constants import ArchiveMode, RetentionConfig
+from src.core.database import get_db_context
+from src.core.models import Event
+from src.repositories import EventRepository, EventArchiveRepository
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+_ARCHIVED_COLUMNS = (
+    "id", "event_type", "data", "status", "result", "error",
+    "created_at", "processed_at", "worker_id"
+)
+
+
+class EventRetentionService:
+    """
+    Moves completed events older than the retention window out of `events`.
+    
+    Each batch is copied to the `events_archive` table (same transaction as
+    the delete) or appended to a gzip-compressed NDJSON file (written before
+    the delete commits, so a crash can only repeat rows in the file, never
+    lose them). Keeping the queue table small keeps claims and its indexes
+    fast no matter how long the service has run.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        mode: Optional[str] = None,
+        archive_dir: Optional[str] = None
+    ):
+        """
+        Initialize event retention service.
+        
+        Args:
+            db: Database session
+            mode: "table" or "ndjson" (defaults to settings)
+            archive_dir: Directory for NDJSON archives (defaults to settings)
+        """
+        self.db = db
+        self.mode = ArchiveMode(mode or settings.EVENT_ARCHIVE_MODE)
+        self.archive_dir = archive_dir or settings.EVENT_ARCHIVE_DIR
+        self.event_repo = EventRepository(db)
+        self.archive_repo = EventArchiveRepository(db)
+    
+    def run(
+        self,
+        retention_days: int,
+        batch_size: int,
+        max_batches: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Archive eligible events in bounded batches until none are left.
+        
+        Args:
+            retention_days: Archive completed events older than this
+            batch_size: Events moved per transaction
+            max_batches: Optional cap on batches for this run
+        
+        Returns:
+            Dictionary with archived count, batches and elapsed time
+        """
+        started = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        archived = 0
+        batches = 0
+        
+        while max_batches is None or batches < max_batches:
+            moved = self.archive_batch(cutoff, batch_size)
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            if moved < batch_size:
+                break
+            time.sleep(RetentionConfig.BATCH_PAUSE)
+        
+        stats = {
+            "archived": archived,
+            "batches": batches,
+            "mode": self.mode.value,
+            "cutoff": cutoff.isoformat(),
+            "elapsed_seconds": round(time.monotonic() - started, 2)
+        }
+        if archived:
+            logger.info(
+                "✓ Archived %s event(s) older than %s day(s) to %s in %s batch(es)",
+                archived, retention_days, self.mode.value, batches
+            )
+        return stats
+    
+    def archive_batch(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one batch of eligible events to the archive.
+        
+        Args:
+            cutoff: Archive events completed before this time
+            batch_size: Maximum events to move
+        
+        Returns:
+            Number of events moved
+        """
+        events = self.event_repo.get_archivable(cutoff, batch_size)
+        if not events:
+            return 0
+        
+        try:
+            if self.mode == ArchiveMode.TABLE:
+                self.archive_repo.insert_many([self._archive_row(event) for event in events])
+            else:
+                self._append_ndjson(events)
+            self.event_repo.delete_by_ids([event.id for event in events])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return len(events)
+    
+    def compact(self) -> None:
+        """
+        Reclaim space and refresh planner statistics for the events table.
+        
+        Runs VACUUM and ANALYZE outside a transaction. On SQLite VACUUM
+        rewrites the whole database file.
+        """
+        engine = self.db.get_bind()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if engine.dialect.name == "postgresql":
+                connection.execute(text(f"VACUUM (ANALYZE) {Event.__tablename__}"))
+            else:
+                connection.execute(text("VACUUM"))
+                connection.execute(text(f"ANALYZE {Event.__tablename__}"))
+        logger.info("✓ Compacted '%s' table", Event.__tablename__)
+    
+    @staticmethod
+    def _archive_row(event: Event) -> Dict[str, Any]:
+        """Column values for an archived copy of an event."""
+        row = {column: getattr(event, column) for column in _ARCHIVED_COLUMNS}
+        row["archived_at"] = datetime.utcnow()
+        return row
+    
+    def _append_ndjson(self, events: List[Event]) -> str:
+        """
+        Append events to today's compressed NDJSON archive.
+        
+        Each batch is written as its own gzip member, which gzip readers
+        concatenate transparently.
+        
+        Returns:
+            Path of the archive file
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(
+            self.archive_dir,
+            datetime.utcnow().strftime(RetentionConfig.ARCHIVE_FILE_PATTERN)
+        )
+        
+        lines = []
+        for event in events:
+            record = self._archive_row(event)
+            lines.append(json.dumps(record, default=lambda value: value.isoformat()))
+        
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+                archive.write(("\n".join(lines) + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+        return path
+
+
+class EventRetentionJob:
+    """
+    Runs event retention periodically in a background thread.
+    """
+    
+    def __init__(
+        self,
+        interval: Optional[int] = None,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        vacuum: bool = False
+    ):
+        """
+        Initialize retention job.
+        
+        Args:
+            interval: Seconds between runs (default: EVENT_RETENTION_INTERVAL)
+            retention_days: Archive completed events older than this
+                (default: EVENT_RETENTION_DAYS)
+            batch_size: Events moved per transaction (default: EVENT_RETENTION_BATCH_SIZE)
+            vacuum: Run VACUUM/ANALYZE after a run that archived events
+        """
+        self.interval = settings.EVENT_RETENTION_INTERVAL if interval is None else interval
+        self.retention_days = settings.EVENT_RETENTION_DAYS if retention_days is None else retention_days
+        self.batch_size = settings.EVENT_RETENTION_BATCH_SIZE if batch_size is None else batch_size
+        self.vacuum = vacuum
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start the background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-retention", daemon=True)
+        self._thread.start()
+        logger.info(
+            "✓ Event retention every %ss (keep %s day(s), batch %s)",
+            self.interval, self.retention_days, self.batch_size
+        )
+    
+    def stop(self) -> None:
+        """Stop the background thread after the current batch."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=RetentionConfig.BATCH_PAUSE * 10)
+        self._thread = None
+    
+    def run_once(self) -> Dict[str, Any]:
+        """Run retention once with a fresh session."""
+        with get_db_context() as db:
+            service = EventRetentionService(db)
+            stats = service.run(self.retention_days, self.batch_size)
+            if self.vacuum and stats["archived"]:
+                service.compact()
+            return stats
+    
+    def _run(self) -> None:
+        """Run until stopped, starting with an immediate pass."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("✗ Event retention failed: %s", e, exc_info=True)
+            self._stop.wait(self.interval)
@@ -0,0 +1,118 @@
+"""Idempotency service for recognising repeated story deliveries."""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.repositories import IdempotencyRepository
+from src.utils import get_logger, LRUCache
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class IdempotencyService:
+    """
+    Tracks which deliveries have already been ingested.
+    
+    Every story gets a key for its Azure DevOps ID, and webhook deliveries a
+    second key for their service-hook notification ID. Keys live in the
+    idempotency_keys table, written in the same transaction as the story
+    and its event, with a bounded LRU of recently seen keys in front so
+    redeliveries are answered without touching the database.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize idempotency service.
+        
+        Args:
+            db: Database session
+        """
+        self.repo = IdempotencyRepository(db)
+        self.cache = get_idempotency_cache()
+    
+    @staticmethod
+    def story_key(story_id: int) -> str:
+        """Key identifying a story regardless of how it arrived."""
+        return f"story:{story_id}"
+    
+    @classmethod
+    def keys_for(cls, story_id: int, notification_id: Optional[str] = None) -> List[str]:
+        """
+        Build the keys for one delivery.
+        
+        Args:
+            story_id: Azure DevOps story ID
+            notification_id: Service-hook notification ID, if any
+            
+        Returns:
+            Story key, followed by the notification key when given
+        """
+        keys = [cls.story_key(story_id)]
+        if notification_id:
+            keys.append(f"notification:{notification_id}:{story_id}")
+        return keys
+    
+    def recall(self, keys: Iterable[str]) -> Tuple[bool, Optional[int]]:
+        """
+        Check the in-memory cache only.
+        
+        Returns:
+            (True, original event ID) if any key was seen, else (False, None)
+        """
+        for key in keys:
+            event_id = self.cache.get(key, _MISSING)
+            if event_id is not _MISSING:
+                return True, event_id
+        return False, None
+    
+    def lookup(self, keys: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Check the key table and cache whatever is found.
+        
+        Returns:
+            Mapping of each known key to its original event ID
+        """
+        found = self.repo.get_event_ids(keys)
+        for key, event_id in found.items():
+            self.cache.put(key, event_id)
+        return found
+    
+    def stage_many(self, entries: List[Tuple[int, List[str], int]]) -> None:
+        """
+        Add keys for several new stories to the current transaction (no commit).
+        
+        Args:
+            entries: (story ID, keys, event ID) for each story
+        """
+        rows: List[Dict[str, Any]] = [
+            {"key": key, "azure_story_id": story_id, "event_id": event_id}
+            for story_id, keys, event_id in entries
+            for key in keys
+        ]
+        if rows:
+            self.repo.insert_keys(rows)
+    
+    def remember(self, keys: Iterable[str], event_id: Optional[int]) -> None:
+        """Cache keys once their transaction has committed."""
+        for key in keys:
+            self.cache.put(key, event_id)
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_idempotency_cache() -> LRUCache:
+    """Get the process-wide cache of ingested delivery keys."""
+    global _cache
+    
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(get_settings().IDEMPOTENCY_CACHE_SIZE)
+    
+    return _cache
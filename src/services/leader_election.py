@@ -0,0 +1,208 @@
+"""Database-backed leader election between processes."""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.core.config import get_settings
+from src.core.constants import LeaderConfig
+from src.core.database import engine, get_db_context
+from src.repositories import LeaderLeaseRepository
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class LeaderElection:
+    """
+    Elects one process to hold a role, with failover when it dies.
+    
+    On PostgreSQL the leader holds a session-level advisory lock on a
+    dedicated connection; the server releases it the moment that connection
+    drops, so another process takes over on its next attempt. Other
+    databases use a heartbeat row in `leader_leases` that the leader renews
+    every `renew_interval`; when it stops renewing, the lease expires after
+    `lease_seconds` and is taken over.
+    
+    `on_elected` and `on_demoted` run on the election thread (or in
+    `stop()`), so they may block while a role starts or drains. If
+    `on_elected` raises, leadership is given up and campaigned for again.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        lease_seconds: Optional[int] = None,
+        renew_interval: Optional[int] = None
+    ):
+        """
+        Initialize leader election.
+        
+        Args:
+            name: Role being elected
+            on_elected: Called when this process becomes leader
+            on_demoted: Called when this process stops being leader
+            lease_seconds: Heartbeat lease length, non-PostgreSQL
+                (default: WORKER_LEADER_LEASE_SECONDS)
+            renew_interval: Seconds between renewals and election attempts
+                (default: WORKER_LEADER_RENEW_INTERVAL)
+        """
+        settings = get_settings()
+        if lease_seconds is None:
+            lease_seconds = settings.WORKER_LEADER_LEASE_SECONDS
+        if renew_interval is None:
+            renew_interval = settings.WORKER_LEADER_RENEW_INTERVAL
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lease_seconds = lease_seconds
+        self.renew_interval = min(renew_interval, max(1, lease_seconds // 2))
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.use_advisory_lock = engine.dialect.name == "postgresql"
+        self.is_leader = False
+        self._lock_connection: Optional[Connection] = None
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start campaigning in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+        if self.use_advisory_lock:
+            logger.info("✓ Leader election for '%s' started (advisory lock)", self.name)
+        else:
+            logger.info(
+                "✓ Leader election for '%s' started (%ss heartbeat lease)",
+                self.name, self.lease_seconds
+            )
+    
+    def stop(self) -> None:
+        """Stop campaigning, demote if leading and release leadership."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.renew_interval * 2)
+        self._thread = None
+        self._demote()
+        self._release()
+    
+    def _run(self) -> None:
+        """Try to acquire or renew leadership until stopped."""
+        while not self._stop.is_set():
+            try:
+                held = self._try_acquire()
+            except Exception as e:
+                logger.warning("⚠️ Leader election for '%s' failed: %s", self.name, e)
+                # A heartbeat lease stays ours until it expires, even if renewal errors
+                held = self.is_leader and not self.use_advisory_lock and time.monotonic() < self._valid_until
+            
+            if held and not self.is_leader and not self._stop.is_set():
+                self.is_leader = True
+                logger.info("✓ Elected leader for '%s' (%s)", self.name, self.holder)
+                if not self._run_callback(self.on_elected):
+                    # Step down so the role is taken up again, here or elsewhere
+                    self.is_leader = False
+                    self._release()
+            elif not held and self.is_leader:
+                logger.warning("⚠️ Lost leadership for '%s'", self.name)
+                self._demote()
+            
+            self._stop.wait(self.renew_interval)
+    
+    def _try_acquire(self) -> bool:
+        """Acquire or renew leadership, returning whether this process holds it."""
+        if self.use_advisory_lock:
+            return self._try_advisory_lock()
+        
+        started = time.monotonic()
+        with get_db_context() as db:
+            held = LeaderLeaseRepository(db).try_acquire(self.name, self.holder, self.lease_seconds)
+        if held:
+            self._valid_until = started + self.lease_seconds
+        return held
+    
+    def _try_advisory_lock(self) -> bool:
+        """Take the advisory lock, or check that its connection is still alive."""
+        if self._lock_connection is not None:
+            try:
+                self._lock_connection.execute(text("SELECT 1"))
+                return True
+            except Exception:
+                self._close_lock_connection()
+                raise
+        
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": LeaderConfig.ADVISORY_LOCK_KEY}
+            ).scalar()
+        except Exception:
+            connection.invalidate()
+            connection.close()
+            raise
+        
+        if acquired:
+            self._lock_connection = connection
+        else:
+            connection.close()
+        return bool(acquired)
+    
+    def _demote(self) -> None:
+        """Give up the role locally if this process holds it."""
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        self._run_callback(self.on_demoted)
+    
+    def _release(self) -> None:
+        """Release the lock or lease so another process can take over at once."""
+        try:
+            if self.use_advisory_lock:
+                if self._lock_connection is not None:
+                    self._lock_connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": LeaderConfig.ADVISORY_LOCK_KEY}
+                    )
+            else:
+                with get_db_context() as db:
+                    LeaderLeaseRepository(db).release(self.name, self.holder)
+        except Exception as e:
+            logger.warning("⚠️ Could not release leadership for '%s': %s", self.name, e)
+        finally:
+            self._close_lock_connection()
+    
+    def _close_lock_connection(self) -> None:
+        """Drop the advisory lock connection, which also drops the lock."""
+        if self._lock_connection is None:
+            return
+        try:
+            self._lock_connection.invalidate()
+            self._lock_connection.close()
+        except Exception:
+            pass
+        self._lock_connection = None
+    
+    def _run_callback(self, callback: Callable[[], None]) -> bool:
+        """
+        Run a role callback, logging instead of killing the election thread.
+        
+        Returns:
+            False if the callback raised
+        """
+        try:
+            callback()
+            return True
+        except Exception as e:
+            logger.error("✗ Leader callback for '%s' failed: %s", self.name, e, exc_info=True)
+            return False
@@ -0,0 +1,98 @@
+"""Lease renewal for events a worker is still processing."""
+
+import threading
+from typing import Iterable, Optional, Set
+
+from src.core.constants import WorkerConfig
+from src.core.database import get_db_context
+from src.services.event_queue_service import EventQueueService
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class LeaseHeartbeat:
+    """
+    Keeps the leases of in-flight events from expiring.
+    
+    Events are tracked from claim until they finish. A background thread
+    extends all their leases in one statement every fraction of the lease
+    length, so an event that takes longer than the lease is not reclaimed
+    and processed a second time. Events whose lease was already lost are
+    dropped from tracking; their worker's final update is then skipped.
+    """
+    
+    def __init__(self, worker_id: str, lease_seconds: int):
+        """
+        Initialize heartbeat.
+        
+        Args:
+            worker_id: Worker that claimed the tracked events
+            lease_seconds: Lease length set on each renewal
+        """
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = max(
+            WorkerConfig.MIN_LEASE_RENEW_INTERVAL,
+            lease_seconds * WorkerConfig.LEASE_RENEW_FRACTION
+        )
+        self._event_ids: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def track(self, event_ids: Iterable[int]) -> None:
+        """Start renewing the leases of claimed events."""
+        with self._lock:
+            self._event_ids.update(event_ids)
+    
+    def untrack(self, event_id: int) -> None:
+        """Stop renewing the lease of a finished event."""
+        with self._lock:
+            self._event_ids.discard(event_id)
+    
+    def start(self) -> None:
+        """Start the background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=WorkerConfig.SHUTDOWN_TIMEOUT)
+        self._thread = None
+    
+    def renew(self) -> int:
+        """
+        Renew every tracked lease once.
+        
+        Returns:
+            Number of leases renewed
+        """
+        with self._lock:
+            event_ids = sorted(self._event_ids)
+        if not event_ids:
+            return 0
+        
+        with get_db_context() as db:
+            renewed = set(EventQueueService(db).renew_leases(self.worker_id, event_ids, self.lease_seconds))
+        
+        # Events that finished meanwhile are no longer tracked and not lost
+        with self._lock:
+            lost = [event_id for event_id in event_ids if event_id not in renewed and event_id in self._event_ids]
+            self._event_ids.difference_update(lost)
+        if lost:
+            logger.warning("⚠️ Lease lost for event(s) %s, another worker may process them", lost)
+        return len(renewed)
+    
+    def _run(self) -> None:
+        """Renew until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.renew()
+            except Exception as e:
+                logger.error("✗ Lease renewal failed: %s", e, exc_info=True)
@@ -0,0 +1,91 @@
+"""Periodic reconciliation of the event queue gauges."""
+
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from src.core.config import get_settings
+from src.core.constants import EventStatus
+from src.core.database import get_db_context
+from src.repositories import EventRepository
+from src.utils import get_logger, metrics
+
+logger = get_logger(__name__)
+
+
+class QueueMetricsReconciler:
+    """
+    Re-counts the event queue so its gauges stay correct across processes.
+    
+    Between recounts the depth gauges move with the events this process
+    publishes, claims and finishes, once each change has committed, so a
+    scrape costs nothing. Events handled by other processes only show up at
+    the next recount, which runs one GROUP BY at most every `interval`
+    seconds and also corrects any drift.
+    """
+    
+    def __init__(self, interval: Optional[float] = None):
+        """
+        Initialize reconciler.
+        
+        Args:
+            interval: Minimum seconds between recounts
+                (default: METRICS_QUEUE_RECONCILE_INTERVAL)
+        """
+        self.interval = get_settings().METRICS_QUEUE_RECONCILE_INTERVAL if interval is None else interval
+        self._lock = threading.Lock()
+        self._reconciled_at: Optional[float] = None
+    
+    def maybe_refresh(self) -> bool:
+        """
+        Recount the queue if the last recount is older than the interval.
+        
+        A scrape arriving while another one is recounting serves the
+        current values instead of waiting.
+        
+        Returns:
+            True if the gauges were refreshed
+        """
+        now = time.monotonic()
+        if self._reconciled_at is not None and now - self._reconciled_at < self.interval:
+            return False
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._reconciled_at = now
+            self.refresh()
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Could not reconcile queue metrics: %s", e)
+            return False
+        finally:
+            self._lock.release()
+    
+    def refresh(self) -> None:
+        """Set the depth and oldest-pending gauges from the database."""
+        with get_db_context() as db:
+            repo = EventRepository(db)
+            counts = repo.count_by_status()
+            oldest = repo.oldest_pending_created_at()
+        
+        for status in (EventStatus.PENDING.value, EventStatus.PROCESSING.value):
+            metrics.QUEUE_DEPTH.labels(status).set(counts.get(status, 0))
+        age = (datetime.utcnow() - oldest).total_seconds() if oldest else 0
+        metrics.QUEUE_OLDEST_PENDING_AGE.set(max(0.0, age))
+
+
+_reconciler: Optional[QueueMetricsReconciler] = None
+_reconciler_lock = threading.Lock()
+
+
+def get_queue_metrics_reconciler() -> QueueMetricsReconciler:
+    """Get the process-wide queue metrics reconciler."""
+    global _reconciler
+    
+    if _reconciler is None:
+        with _reconciler_lock:
+            if _reconciler is None:
+                _reconciler = QueueMetricsReconciler()
+    
+    return _reconciler
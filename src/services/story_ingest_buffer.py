@@ -0,0 +1,199 @@
+"""Group-commit buffer for story ingestion."""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.config import get_settings
+from src.core.database import get_db_context
+from src.core.models import UserStoryRecord
+from src.services.user_story_service import UserStoryService
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class StoryIngestBuffer:
+    """
+    Collects stories from concurrent requests and commits them together.
+    
+    Each caller gets a future that resolves once the transaction holding its
+    story has committed, so acknowledgements stay durable while many
+    requests share one commit. A batch is flushed when it reaches
+    `max_items` or when its oldest story has waited `max_delay_ms`.
+    
+    Stories are validated before they join a batch, and a batch whose
+    commit fails is retried one story per transaction, so one bad story
+    only fails its own request.
+    """
+    
+    def __init__(self, max_items: int, max_delay_ms: int):
+        """
+        Initialize ingest buffer.
+        
+        Args:
+            max_items: Stories per transaction before an immediate flush
+            max_delay_ms: Longest a story waits for others to join its batch
+        """
+        self.max_items = max(1, max_items)
+        self.max_delay = max(0, max_delay_ms) / 1000
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+        self._oldest = 0.0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+    
+    def submit(self, story: Dict[str, Any]) -> Future:
+        """
+        Queue a story for the next group commit.
+        
+        Args:
+            story: Dictionary with story_id, title, area_path and iteration_path
+        
+        Returns:
+            Future resolving to the story's bulk result once committed
+        
+        Raises:
+            ValueError: If the story cannot be stored
+            RuntimeError: If the buffer is closed
+        """
+        self._validate(story)
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Story ingest buffer is closed")
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run,
+                    name="story-group-commit",
+                    daemon=True
+                )
+                self._flusher.start()
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append((story, future))
+            self._condition.notify()
+        return future
+    
+    def close(self) -> None:
+        """Flush everything still queued and stop the flusher thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            flusher = self._flusher
+        if flusher:
+            flusher.join()
+    
+    def _run(self) -> None:
+        """Flush batches until closed and drained."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._flush(batch)
+    
+    def _next_batch(self) -> Optional[List[Tuple[Dict[str, Any], Future]]]:
+        """Wait until a batch is full, due or the buffer closes."""
+        with self._condition:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            
+            while len(self._pending) < self.max_items and not self._closed:
+                remaining = self._oldest + self.max_delay - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            
+            batch = self._pending[:self.max_items]
+            del self._pending[:self.max_items]
+            if self._pending:
+                self._oldest = time.monotonic()
+            return batch
+    
+    def _flush(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """Commit one batch and resolve its futures, one story at a time if the batch fails."""
+        started = time.monotonic()
+        try:
+            results = self._commit([story for story, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("✗ Commit of story #%s failed: %s", batch[0][0].get("story_id"), e)
+                batch[0][1].set_exception(e)
+                return
+            logger.warning("⚠️ Group commit of %s stories failed (%s), committing them one by one", len(batch), e)
+            for story, future in batch:
+                try:
+                    future.set_result(self._commit([story])[0])
+                except Exception as item_error:
+                    logger.error("✗ Commit of story #%s failed: %s", story.get("story_id"), item_error)
+                    future.set_exception(item_error)
+            return
+        
+        for (_, future), item in zip(batch, results):
+            future.set_result(item)
+        logger.debug("Group commit: %s stories in %.1fms", len(batch), (time.monotonic() - started) * 1000)
+    
+    @staticmethod
+    def _commit(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Store stories in one transaction with a fresh session."""
+        with get_db_context() as db:
+            return UserStoryService(db).create_user_stories_bulk(stories)["results"]
+    
+    @staticmethod
+    def _validate(story: Dict[str, Any]) -> None:
+        """
+        Reject a story the database would refuse, before it can fail a shared commit.
+        
+        Raises:
+            ValueError: If a field is missing, of the wrong type or too long
+        """
+        story_id = story.get("story_id")
+        if not isinstance(story_id, int) or isinstance(story_id, bool):
+            raise ValueError(f"story_id must be an integer, got {story_id!r}")
+        
+        columns = UserStoryRecord.__table__.columns
+        for key, column, required in (
+            ("title", columns.title, True),
+            ("area_path", columns.area_path, False),
+            ("iteration_path", columns.iteration_path, False)
+        ):
+            value = story.get(key)
+            if value is None and not required:
+                continue
+            if not isinstance(value, str):
+                raise ValueError(f"{key} of story #{story_id} must be a string")
+            if len(value) > column.type.length:
+                raise ValueError(f"{key} of story #{story_id} is longer than {column.type.length} characters")
+
+
+_buffer: Optional[StoryIngestBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_story_ingest_buffer() -> StoryIngestBuffer:
+    """Get the process-wide story ingest buffer."""
+    global _buffer
+    
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                settings = get_settings()
+                _buffer = StoryIngestBuffer(
+                    max_items=settings.WEBHOOK_GROUP_COMMIT_MAX_ITEMS,
+                    max_delay_ms=settings.WEBHOOK_GROUP_COMMIT_MAX_DELAY_MS
+                )
+    
+    return _buffer
+
+
+def close_story_ingest_buffer() -> None:
+    """Flush and stop the process-wide buffer if it was started."""
+    global _buffer
+    
+    with _buffer_lock:
+        if _buffer is not None:
+            _buffer.close()
+            _buffer = None
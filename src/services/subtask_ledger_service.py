@@ -0,0 +1,88 @@
+"""Subtask ledger service for resumable subtask creation."""
+
+from typing import Dict, Any, Optional, Tuple, Callable
+from sqlalchemy.orm import Session
+
+from src.core.database import get_db_context
+from src.repositories import SubtaskLedgerRepository
+from src.utils import get_logger, tracing
+
+logger = get_logger(__name__)
+
+
+class SubtaskLedgerService:
+    """
+    Records per-story subtask progress so a retried event resumes where the
+    previous attempt stopped instead of creating the same tasks again.
+    """
+    
+    def __init__(self, db: Optional[Session] = None):
+        """
+        Initialize subtask ledger service.
+        
+        Args:
+            db: Database session. If None, every call opens its own
+                short-lived session, so the service can be shared by
+                worker threads (async mode).
+        """
+        self.db = db
+    
+    def load(self, story_id: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Load recorded progress for a story.
+        
+        Args:
+            story_id: Azure DevOps story ID
+            
+        Returns:
+            Mapping of template position to title, task ID and link status
+        """
+        return self._run("load", story_id, lambda repo: repo.get_progress(story_id))
+    
+    def record_created(
+        self,
+        story_id: int,
+        position: int,
+        title: str,
+        task_id: int,
+        linked: bool = False
+    ) -> None:
+        """Record that a template task now exists in Azure DevOps."""
+        self._run("record_created", story_id, lambda repo: repo.record_task(story_id, position, title, task_id, linked))
+    
+    def record_linked(self, story_id: int, position: int) -> None:
+        """Record that a template task is linked to its parent story."""
+        self._run("record_linked", story_id, lambda repo: repo.mark_linked(story_id, position))
+    
+    @staticmethod
+    def completed_step(
+        progress: Dict[int, Dict[str, Any]],
+        position: int,
+        title: str
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Look up what a previous attempt already did for a template entry.
+        
+        Entries recorded under a different title (template changed since)
+        are ignored.
+        
+        Returns:
+            Tuple of (existing task ID or None, whether it is linked)
+        """
+        entry = progress.get(position)
+        if not entry or entry["title"] != title or not entry["task_id"]:
+            return None, False
+        return entry["task_id"], entry["linked"]
+    
+    def _run(
+        self,
+        operation: str,
+        story_id: int,
+        action: Callable[[SubtaskLedgerRepository], Any]
+    ) -> Any:
+        """Run a repository action on the bound or a fresh session, in a trace span."""
+        with tracing.start_span(f"db.ledger.{operation}", {"story.id": story_id}):
+            if self.db is not None:
+                return action(SubtaskLedgerRepository(self.db))
+            with get_db_context() as db:
+                return action(SubtaskLedgerRepository(db))
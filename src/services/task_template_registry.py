@@ -0,0 +1,345 @@
+"""Per-area task templates, compiled into ready-to-send request bodies."""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.config import get_settings
+from src.core.constants import AzureDevOpsConstants, TaskTemplates
+from src.utils import (
+    LRUCache,
+    build_work_item_url,
+    create_batch_request,
+    create_work_item_patch,
+    create_parent_link_patch,
+    get_logger
+)
+
+logger = get_logger(__name__)
+
+# Placeholders serialized once and split out of the JSON, leaving the
+# constant text around each variable field
+_AREA_MARKER = "\x00area\x00"
+_ITERATION_MARKER = "\x00iteration\x00"
+_BODY_MARKER = "\x00body\x00"
+
+
+def _split(serialized: str, marker: str) -> Tuple[str, str]:
+    """Split serialized JSON around a placeholder string."""
+    head, tail = serialized.split(json.dumps(marker), 1)
+    return head, tail
+
+
+class CompiledTaskTemplate:
+    """
+    A task list with its request URL and body fragments prepared up front.
+    
+    Bodies are assembled by concatenating the precompiled fragments with the
+    JSON-encoded area and iteration paths, so creating a task only encodes
+    the fields that change from story to story.
+    """
+    
+    def __init__(
+        self,
+        titles: Sequence[str],
+        org: str,
+        project: str,
+        base_url: Optional[str] = None
+    ):
+        """
+        Compile a task list.
+        
+        Args:
+            titles: Task titles in creation order
+            org: Organization name
+            project: Project name
+            base_url: Azure DevOps service root (default: AZURE_DEVOPS_BASE_URL)
+        """
+        self.titles: List[str] = list(titles)
+        self.org = org
+        self.project = project
+        self.base_url = base_url
+        self.task_url = build_work_item_url(
+            org,
+            project,
+            AzureDevOpsConstants.WORK_ITEM_TYPE_TASK,
+            api_version=AzureDevOpsConstants.API_VERSION,
+            base_url=base_url
+        )
+        
+        entry_head, entry_tail = _split(
+            json.dumps(create_batch_request(
+                project,
+                AzureDevOpsConstants.WORK_ITEM_TYPE_TASK,
+                _BODY_MARKER,
+                api_version=AzureDevOpsConstants.API_VERSION
+            )),
+            _BODY_MARKER
+        )
+        self._entry_head = entry_head.encode()
+        self._entry_tail = entry_tail.encode()
+        
+        self._heads: Dict[str, bytes] = {}
+        for title in self.titles:
+            patch = json.dumps(create_work_item_patch(title, _AREA_MARKER, _ITERATION_MARKER))
+            head, rest = _split(patch, _AREA_MARKER)
+            middle, tail = _split(rest, _ITERATION_MARKER)
+            self._heads[title] = head.encode()
+            self._middle = middle.encode()
+            self._tail = tail.encode()
+    
+    def task_body(self, title: str, area_path: str, iteration_path: str) -> bytes:
+        """
+        Serialized JSON patch creating one task.
+        
+        Args:
+            title: Task title (must belong to this template)
+            area_path: Area path
+            iteration_path: Iteration path
+        
+        Returns:
+            Request body bytes
+        """
+        return b"".join((
+            self._heads[title],
+            json.dumps(area_path).encode(),
+            self._middle,
+            json.dumps(iteration_path).encode(),
+            self._tail
+        ))
+    
+    def batch_body(
+        self,
+        titles: Sequence[str],
+        story_id: int,
+        area_path: str,
+        iteration_path: str
+    ) -> bytes:
+        """
+        Serialized $batch body creating tasks already linked to their story.
+        
+        Args:
+            titles: Task titles to create (each must belong to this template)
+            story_id: Parent story ID
+            area_path: Area path
+            iteration_path: Iteration path
+        
+        Returns:
+            Request body bytes
+        """
+        area = json.dumps(area_path).encode()
+        iteration = json.dumps(iteration_path).encode()
+        link = json.dumps(
+            create_parent_link_patch(self.org, self.project, story_id, self.base_url)[0]
+        ).encode()
+        fields_tail = self._tail[:-1] + b", " + link + b"]"
+        
+        entries = [
+            b"".join((
+                self._entry_head,
+                self._heads[title], area, self._middle, iteration, fields_tail,
+                self._entry_tail
+            ))
+            for title in titles
+        ]
+        return b"[" + b", ".join(entries) + b"]"
+
+
+class TaskTemplateRegistry:
+    """
+    Resolves the task template for a story's area path.
+    
+    Templates come from a JSON file mapping area paths (or project names,
+    which are root area paths) to task lists:
+        
+        {"default": [...], "areas": {"Project": [...], "Project\\\\Team": [...]}}
+    
+    The most specific matching area wins, then "default", then
+    TaskTemplates.STANDARD_TASKS. Each list is compiled once; the file is
+    re-read when its modification time changes.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        org: Optional[str] = None,
+        project: Optional[str] = None,
+        reload_interval: Optional[float] = None,
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize template registry.
+        
+        Args:
+            path: Template file, or None to use the standard tasks only
+            org: Organization name used in compiled URLs
+            project: Project name used in compiled URLs
+            reload_interval: Seconds between checks for a changed file
+                (default: TASK_TEMPLATES_RELOAD_INTERVAL)
+            base_url: Azure DevOps service root used in compiled URLs
+                (default: AZURE_DEVOPS_BASE_URL)
+        """
+        self.path = path
+        self.org = org
+        self.project = project
+        self.base_url = base_url
+        self.reload_interval = (
+            get_settings().TASK_TEMPLATES_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        )
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._resolved = LRUCache(TaskTemplates.RESOLVED_CACHE_SIZE)
+        self._compiled = LRUCache(TaskTemplates.RESOLVED_CACHE_SIZE)
+        self._default = self.compile(TaskTemplates.STANDARD_TASKS)
+        self._areas: Dict[str, CompiledTaskTemplate] = {}
+        
+        if self.path:
+            self.reload()
+    
+    def for_area(self, area_path: Optional[str]) -> CompiledTaskTemplate:
+        """
+        Get the compiled template for an area path.
+        
+        Args:
+            area_path: Story area path, e.g. "Project\\Team\\Component"
+        
+        Returns:
+            Compiled template of the closest configured area
+        """
+        self._maybe_reload()
+        key = (area_path or "").lower()
+        template = self._resolved.get(key)
+        if template is None:
+            template = self._match(key)
+            self._resolved.put(key, template)
+        return template
+    
+    def compile(self, titles: Sequence[str]) -> CompiledTaskTemplate:
+        """
+        Compile an ad hoc task list, reusing an earlier compilation if any.
+        
+        Args:
+            titles: Task titles in creation order
+        
+        Returns:
+            Compiled template
+        """
+        key = tuple(titles)
+        template = self._compiled.get(key)
+        if template is None:
+            template = CompiledTaskTemplate(titles, self.org, self.project, self.base_url)
+            self._compiled.put(key, template)
+        return template
+    
+    def reload(self) -> bool:
+        """
+        Re-read and compile the template file.
+        
+        A file that cannot be read or parsed leaves the current templates in
+        place until it changes again.
+        
+        Returns:
+            True if new templates were loaded
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                self._mtime = os.path.getmtime(self.path)
+                with open(self.path, encoding="utf-8") as f:
+                    config = json.load(f)
+                default, areas = self._compile_config(config)
+            except (OSError, ValueError) as e:
+                logger.warning("⚠️ Could not load task templates from %s: %s", self.path, e)
+                return False
+            
+            self._default = default
+            self._areas = areas
+            self._resolved.clear()
+        
+        logger.info("✓ Loaded task templates for %s area(s) from %s", len(areas), self.path)
+        return True
+    
+    def _maybe_reload(self) -> None:
+        """Reload the file if it changed, checking at most every reload_interval."""
+        if not self.path or time.monotonic() - self._checked_at < self.reload_interval:
+            return
+        
+        self._checked_at = time.monotonic()
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+    
+    def _compile_config(
+        self,
+        config: Dict[str, Any]
+    ) -> Tuple[CompiledTaskTemplate, Dict[str, CompiledTaskTemplate]]:
+        """
+        Validate and compile a parsed template file.
+        
+        Raises:
+            ValueError: If a task list is missing or malformed
+        """
+        if not isinstance(config, dict):
+            raise ValueError("template file must contain a JSON object")
+        
+        default = self.compile(
+            self._titles(config["default"], "default") if "default" in config
+            else TaskTemplates.STANDARD_TASKS
+        )
+        
+        areas = {
+            area.lower().rstrip("\\"): self.compile(self._titles(titles, area))
+            for area, titles in (config.get("areas") or {}).items()
+        }
+        return default, areas
+    
+    @staticmethod
+    def _titles(titles: Any, name: str) -> List[str]:
+        """Check that a template entry is a non-empty list of distinct titles."""
+        if not isinstance(titles, list) or not titles or not all(
+            isinstance(title, str) and title for title in titles
+        ):
+            raise ValueError(f"'{name}' must be a non-empty list of task titles")
+        repeated = sorted({title for title in titles if titles.count(title) > 1})
+        if repeated:
+            raise ValueError(f"'{name}' repeats task titles: {', '.join(repeated)}")
+        return titles
+    
+    def _match(self, area_key: str) -> CompiledTaskTemplate:
+        """Find the most specific configured area containing area_key."""
+        areas = self._areas
+        segments = area_key.split("\\")
+        for depth in range(len(segments), 0, -1):
+            template = areas.get("\\".join(segments[:depth]))
+            if template is not None:
+                return template
+        return self._default
+
+
+_registry: Optional[TaskTemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_task_template_registry() -> TaskTemplateRegistry:
+    """Get the process-wide task template registry."""
+    global _registry
+    
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                settings = get_settings()
+                _registry = TaskTemplateRegistry(
+                    path=settings.TASK_TEMPLATES_FILE,
+                    org=settings.AZURE_DEVOPS_ORG,
+                    project=settings.AZURE_DEVOPS_PROJECT,
+                    reload_interval=settings.TASK_TEMPLATES_RELOAD_INTERVAL,
+                    base_url=settings.AZURE_DEVOPS_BASE_URL
+                )
+    
+    return _registry
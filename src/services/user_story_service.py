@@ -1,12 +1,13 @@
 """User story service for business logic."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
 from src.repositories import UserStoryRepository
 from src.services.event_queue_service import EventQueueService
-from src.core.constants import EventType, StoryStatus
-from src.utils import get_logger
+from src.services.idempotency_service import IdempotencyService
+from src.core.constants import EventType, StoryStatus, TracingConfig
+from src.utils import get_logger, tracing
 
 logger = get_logger(__name__)
 
@@ -27,61 +28,239 @@ class UserStoryService:
         self.db = db
         self.story_repo = UserStoryRepository(db)
         self.event_queue = EventQueueService(db)
+        self.idempotency = IdempotencyService(db)
     
     def create_user_story(
         self,
         story_id: int,
         title: str,
         area_path: str = None,
-        iteration_path: str = None
+        iteration_path: str = None,
+        notification_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a user story and publish creation event.
         
+        Repeated deliveries of the same story or notification are answered
+        with the original event ID instead of creating another event.
+        
         Args:
             story_id: Azure DevOps story ID
             title: Story title
             area_path: Area path
             iteration_path: Iteration path
+            notification_id: Service-hook notification ID, for webhook deliveries
             
         Returns:
             Response dictionary with status and event info
         """
-        logger.info(f"Creating user story #{story_id}: {title}")
-        
-        # Store in database
-        story = self.story_repo.create_story(
-            azure_story_id=story_id,
-            title=title,
-            area_path=area_path,
-            iteration_path=iteration_path,
-            status=StoryStatus.PENDING.value
-        )
-        logger.info(f"Stored story #{story_id} in database")
+        logger.info("Creating user story #%s: %s", story_id, title)
+        
+        item = self._ingest([{
+            "story_id": story_id,
+            "title": title,
+            "area_path": area_path,
+            "iteration_path": iteration_path,
+            "notification_id": notification_id
+        }])[0]
         
-        # Publish event
-        event_id = self.event_queue.publish_event(
-            EventType.USER_STORY_CREATED.value,
-            {
+        if item["status"] == "duplicate":
+            logger.info("Story #%s already received (event #%s), skipped", story_id, item['event_id'])
+            return {
+                "status": "duplicate",
+                "message": f"Story #{story_id} already received.",
                 "story_id": story_id,
-                "title": title,
-                "area_path": area_path,
-                "iteration_path": iteration_path
+                "event_id": item["event_id"]
             }
-        )
-        logger.info(f"Published event #{event_id} for story #{story_id}")
+        
+        logger.info("Published event #%s for story #%s", item['event_id'], story_id)
         
         return {
             "status": "accepted",
             "message": f"Story #{story_id} received. Subtasks will be created asynchronously.",
             "story_id": story_id,
-            "event_id": event_id
+            "event_id": item["event_id"]
         }
     
+    def create_user_stories_bulk(self, stories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create many user stories and their events in one transaction.
+        
+        Stories already stored, or repeated within the request, are skipped
+        and reported as duplicates with their original event ID.
+        
+        Args:
+            stories: Dictionaries with story_id, title, area_path,
+                iteration_path and optionally notification_id
+            
+        Returns:
+            Response dictionary with counts and a result per input story
+        """
+        logger.info("Creating %s user stories in bulk", len(stories))
+        
+        results = self._ingest(stories)
+        
+        accepted = sum(1 for item in results if item["status"] == "accepted")
+        duplicates = len(stories) - accepted
+        logger.info("Bulk create: %s accepted, %s duplicate(s) skipped", accepted, duplicates)
+        
+        return {
+            "status": "accepted",
+            "message": f"{accepted} of {len(stories)} stories received. Subtasks will be created asynchronously.",
+            "accepted": accepted,
+            "duplicates": duplicates,
+            "results": results
+        }
+    
+    def _ingest(self, stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Store new stories, their events and idempotency keys in one transaction.
+        
+        Duplicates are recognised, in order, from the in-memory key cache,
+        from repeats inside the same call, and from the story upsert
+        (INSERT ... ON CONFLICT DO NOTHING) skipping an existing row.
+        
+        Args:
+            stories: Story dictionaries
+            
+        Returns:
+            Result per input story, in input order
+        """
+        keys = [
+            IdempotencyService.keys_for(story["story_id"], story.get("notification_id"))
+            for story in stories
+        ]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(stories)
+        first: Dict[int, int] = {}
+        
+        for index, story in enumerate(stories):
+            found, event_id = self.idempotency.recall(keys[index])
+            if found:
+                results[index] = self._item_result(story["story_id"], event_id, duplicate=True)
+            elif story["story_id"] not in first:
+                first[story["story_id"]] = index
+        
+        # New events continue the caller's trace (or the one each story carries)
+        traceparent = tracing.current_traceparent()
+        with tracing.start_span("db.ingest_stories", {"stories": len(first)}):
+            try:
+                inserted = self.story_repo.insert_new_stories([
+                    {
+                        "azure_story_id": story_id,
+                        "title": stories[index]["title"],
+                        "area_path": stories[index].get("area_path"),
+                        "iteration_path": stories[index].get("iteration_path"),
+                        "status": StoryStatus.PENDING.value
+                    }
+                    for story_id, index in first.items()
+                ]) if first else set()
+                new = [index for story_id, index in first.items() if story_id in inserted]
+                event_data = [
+                    self._event_data(
+                        stories[index]["story_id"], stories[index]["title"],
+                        stories[index].get("area_path"), stories[index].get("iteration_path"),
+                        stories[index].get(TracingConfig.TRACEPARENT_KEY) or traceparent
+                    )
+                    for index in new
+                ]
+                event_ids = self.event_queue.stage_events(EventType.USER_STORY_CREATED.value, event_data)
+                self.idempotency.stage_many([
+                    (stories[index]["story_id"], keys[index], event_id)
+                    for index, event_id in zip(new, event_ids)
+                ])
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        
+        for index, event_id in zip(new, event_ids):
+            self.idempotency.remember(keys[index], event_id)
+            results[index] = self._item_result(stories[index]["story_id"], event_id)
+        self.event_queue.announce_events(
+            EventType.USER_STORY_CREATED.value, list(zip(event_ids, event_data)), dispatch=True
+        )
+        
+        # Stories that already existed: report the event they produced originally
+        existing = [story_id for story_id in first if story_id not in inserted]
+        if existing:
+            original = self.idempotency.lookup([IdempotencyService.story_key(story_id) for story_id in existing])
+            # Stories stored before idempotency keys existed have no key row
+            unkeyed = [story_id for story_id in existing if IdempotencyService.story_key(story_id) not in original]
+            latest = self.event_queue.latest_story_events(
+                EventType.USER_STORY_CREATED.value, unkeyed
+            ) if unkeyed else {}
+            for story_id in existing:
+                index = first[story_id]
+                event_id = original.get(IdempotencyService.story_key(story_id), latest.get(story_id))
+                self.idempotency.remember(keys[index], event_id)
+                results[index] = self._item_result(story_id, event_id, duplicate=True)
+        
+        # Repeats within this call point at the first occurrence's event
+        for index, story in enumerate(stories):
+            if results[index] is None:
+                event_id = results[first[story["story_id"]]]["event_id"]
+                results[index] = self._item_result(story["story_id"], event_id, duplicate=True)
+        
+        return results
+    
+    @staticmethod
+    def _item_result(story_id: int, event_id: Optional[int], duplicate: bool = False) -> Dict[str, Any]:
+        """Build the result entry for one ingested story."""
+        if duplicate:
+            return {
+                "story_id": story_id,
+                "status": "duplicate",
+                "event_id": event_id,
+                "message": f"Story #{story_id} already received, skipped."
+            }
+        return {
+            "story_id": story_id,
+            "status": "accepted",
+            "event_id": event_id,
+            "message": f"Story #{story_id} received."
+        }
+    
+    @staticmethod
+    def _event_data(
+        story_id: int,
+        title: str,
+        area_path: str = None,
+        iteration_path: str = None,
+        traceparent: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the payload of a story created event, with the trace it continues."""
+        data = {
+            "story_id": story_id,
+            "title": title,
+            "area_path": area_path,
+            "iteration_path": iteration_path
+        }
+        if traceparent:
+            data[TracingConfig.TRACEPARENT_KEY] = traceparent
+        return data
+    
     def get_user_story(self, azure_story_id: int):
         """Get user story by Azure ID."""
         return self.story_repo.get_by_azure_id(azure_story_id)
     
+    def get_user_story_record(self, azure_story_id: int) -> Optional[Dict[str, Any]]:
+        """Get user story by Azure ID as a dictionary, served from cache when possible."""
+        return self.story_repo.get_record(azure_story_id)
+    
     def update_story_status(self, azure_story_id: int, status: str):
         """Update user story status."""
         return self.story_repo.update_status(azure_story_id, status)
+    
+    def set_story_status(self, azure_story_id: int, status: str, commit: bool = True) -> bool:
+        """
+        Update user story status without loading it.
+        
+        Args:
+            azure_story_id: Azure DevOps story ID
+            status: New status
+            commit: Commit immediately; pass False to join the caller's transaction
+            
+        Returns:
+            True if a story was updated
+        """
+        return self.story_repo.set_status(azure_story_id, status, commit)
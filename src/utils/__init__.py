@@ -1,18 +1,50 @@
 """Common utilities."""
 
-from src.utils.logger import setup_logger, get_logger
+from src.utils.logger import (
+    setup_logger,
+    get_logger,
+    configure_logging,
+    shutdown_logging,
+    sample_payload
+)
 from src.utils.azure_devops import (
     create_auth_header,
     build_work_item_url,
+    build_batch_url,
+    create_batch_request,
     create_work_item_patch,
     create_parent_link_patch
 )
+from src.utils.http_client import (
+    get_http_session,
+    reset_http_session,
+    warm_up_connections,
+    get_connection_stats
+)
+from src.utils.rate_limiter import AdaptiveRateLimiter, build_rate_limiter, get_rate_limiter
+from src.utils.lru_cache import LRUCache
+from src.utils import metrics, tracing
 
 __all__ = [
     "setup_logger",
     "get_logger",
+    "configure_logging",
+    "shutdown_logging",
+    "sample_payload",
     "create_auth_header",
     "build_work_item_url",
+    "build_batch_url",
+    "create_batch_request",
     "create_work_item_patch",
     "create_parent_link_patch",
+    "get_http_session",
+    "reset_http_session",
+    "warm_up_connections",
+    "get_connection_stats",
+    "AdaptiveRateLimiter",
+    "build_rate_limiter",
+    "get_rate_limiter",
+    "LRUCache",
+    "metrics",
+    "tracing",
 ]
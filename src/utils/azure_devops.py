@@ -1,7 +1,9 @@
 """Azure DevOps API utilities."""
 
 import base64
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from src.core.config import get_settings
 
 
 def create_auth_header(pat: str) -> Dict[str, str]:
@@ -21,12 +23,20 @@ def create_auth_header(pat: str) -> Dict[str, str]:
     }
 
 
+def _service_root(base_url: Optional[str]) -> str:
+    """Service root to build URLs on, defaulting to AZURE_DEVOPS_BASE_URL."""
+    if base_url is None:
+        base_url = get_settings().AZURE_DEVOPS_BASE_URL
+    return base_url.rstrip("/")
+
+
 def build_work_item_url(
     org: str,
     project: str,
     work_item_type: str,
     work_item_id: Optional[int] = None,
-    api_version: str = "7.0"
+    api_version: str = "7.0",
+    base_url: Optional[str] = None
 ) -> str:
     """
     Build Azure DevOps work item API URL.
@@ -37,16 +47,63 @@ def build_work_item_url(
         work_item_type: Type of work item (Task, Story, etc.)
         work_item_id: Optional work item ID for updates
         api_version: API version
+        base_url: Service root (Azure DevOps Services, a server or a stub;
+            default: AZURE_DEVOPS_BASE_URL)
         
     Returns:
         Complete API URL
     """
-    base_url = f"https://dev.azure.com/{org}/{project}/_apis/wit/workitems"
+    work_items_url = f"{_service_root(base_url)}/{org}/{project}/_apis/wit/workitems"
     
     if work_item_id:
-        return f"{base_url}/{work_item_id}?api-version={api_version}"
+        return f"{work_items_url}/{work_item_id}?api-version={api_version}"
     else:
-        return f"{base_url}/${work_item_type}?api-version={api_version}"
+        return f"{work_items_url}/${work_item_type}?api-version={api_version}"
+
+
+def build_batch_url(
+    org: str,
+    api_version: str = "7.0",
+    base_url: Optional[str] = None
+) -> str:
+    """
+    Build Azure DevOps work item batch API URL.
+    
+    Args:
+        org: Organization name
+        api_version: API version
+        base_url: Service root (default: AZURE_DEVOPS_BASE_URL)
+        
+    Returns:
+        Complete batch API URL
+    """
+    return f"{_service_root(base_url)}/{org}/_apis/wit/$batch?api-version={api_version}"
+
+
+def create_batch_request(
+    project: str,
+    work_item_type: str,
+    patch: list,
+    api_version: str = "7.0"
+) -> Dict[str, Any]:
+    """
+    Create one work item creation entry for a batch request.
+    
+    Args:
+        project: Project name
+        work_item_type: Type of work item (Task, Story, etc.)
+        patch: Patch operations for the new work item
+        api_version: API version
+        
+    Returns:
+        Batch request entry
+    """
+    return {
+        "method": "PATCH",
+        "uri": f"/{project}/_apis/wit/workitems/${work_item_type}?api-version={api_version}",
+        "headers": {"Content-Type": "application/json-patch+json"},
+        "body": patch
+    }
 
 
 def create_work_item_patch(
@@ -72,7 +129,12 @@ def create_work_item_patch(
     ]
 
 
-def create_parent_link_patch(org: str, project: str, parent_id: int) -> list:
+def create_parent_link_patch(
+    org: str,
+    project: str,
+    parent_id: int,
+    base_url: Optional[str] = None
+) -> list:
     """
     Create patch data for linking work item to parent.
     
@@ -80,6 +142,7 @@ def create_parent_link_patch(org: str, project: str, parent_id: int) -> list:
         org: Organization name
         project: Project name
         parent_id: Parent work item ID
+        base_url: Service root the parent lives on (default: AZURE_DEVOPS_BASE_URL)
         
     Returns:
         List of patch operations for creating parent link
@@ -89,6 +152,6 @@ def create_parent_link_patch(org: str, project: str, parent_id: int) -> list:
         "path": "/relations/-",
         "value": {
             "rel": "System.LinkTypes.Hierarchy-Reverse",
-            "url": f"https://dev.azure.com/{org}/{project}/_apis/wit/workitems/{parent_id}"
+            "url": f"{_service_root(base_url)}/{org}/{project}/_apis/wit/workitems/{parent_id}"
         }
     }]
@@ -0,0 +1,115 @@
+"""Shared HTTP client for outbound API calls."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.core.config import get_settings
+from src.core.constants import HttpClientConfig
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    Get the process-wide pooled HTTP session.
+    
+    The session keeps connections alive and reuses them across calls, so
+    repeated requests to the same host skip the TCP and TLS handshake.
+    requests.Session is safe to share between threads for plain request
+    calls; the underlying urllib3 pool hands each thread its own connection.
+    
+    Args:
+        pool_size: Maximum connections kept per host, first call only
+            (default: AZURE_HTTP_POOL_SIZE)
+    
+    Returns:
+        Shared session instance
+    """
+    global _session
+    
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HttpClientConfig.POOL_HOSTS,
+                    pool_maxsize=pool_size or get_settings().AZURE_HTTP_POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    
+    return _session
+
+
+def reset_http_session() -> None:
+    """Close the shared session so the next call builds a fresh pool."""
+    global _session
+    
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def warm_up_connections(url: str, count: int, timeout: float) -> int:
+    """
+    Open pooled connections ahead of the first real request.
+    
+    Requests are sent concurrently so each one opens its own connection,
+    which then stays in the pool for reuse.
+    
+    Args:
+        url: Any URL on the target host
+        count: Number of connections to open
+        timeout: Per-request timeout in seconds
+    
+    Returns:
+        Number of connections successfully opened
+    """
+    if count <= 0:
+        return 0
+    
+    session = get_http_session()
+    
+    def _head(_) -> bool:
+        try:
+            session.head(url, timeout=timeout, allow_redirects=False)
+            return True
+        except requests.RequestException:
+            return False
+    
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="http-warmup") as executor:
+        return sum(executor.map(_head, range(count)))
+
+
+def get_connection_stats() -> Dict[str, int]:
+    """
+    Get connection reuse statistics for the shared session.
+    
+    Returns:
+        Dictionary with request, connection and reuse counts
+    """
+    requests_sent = 0
+    connections_opened = 0
+    
+    session = _session
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_sent += pool.num_requests
+                    connections_opened += pool.num_connections
+    
+    return {
+        "requests": requests_sent,
+        "connections_opened": connections_opened,
+        "connections_reused": max(0, requests_sent - connections_opened)
+    }
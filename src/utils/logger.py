@@ -1,52 +1,207 @@
 """Logging utilities and configuration."""
 
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
-from src.core.constants import WorkerConfig
+from src.core.config import get_settings
+from src.core.constants import LogFormat, WorkerConfig
+
+# Attributes every LogRecord has; anything else was passed with extra= and goes into JSON output
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _EnqueueHandler(QueueHandler):
+    """
+    Hands records to the background listener.
+    
+    Only the message merge and traceback rendering happen on the logging
+    thread; layout and the write to stdout happen on the listener. Unlike
+    the stdlib handler, the traceback is kept apart from the message so the
+    JSON formatter can put it in its own field.
+    """
+    
+    _exception_formatter = logging.Formatter()
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_formatter(log_format: str, fmt: Optional[str], date_format: Optional[str]) -> logging.Formatter:
+    """Formatter for the configured output."""
+    if log_format == LogFormat.JSON.value:
+        return JsonFormatter()
+    return logging.Formatter(fmt or WorkerConfig.LOG_FORMAT, datefmt=date_format or WorkerConfig.LOG_DATE_FORMAT)
+
+
+def configure_logging(
+    level: Optional[int] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    fmt: Optional[str] = None,
+    date_format: Optional[str] = None
+) -> logging.Handler:
+    """
+    Install the process-wide log handler, once.
+    
+    The handler is attached to the root logger, so every module logger of
+    the application shares it. With a queue, records are put on an
+    unbounded in-memory queue and written to stdout by a listener thread,
+    so logging never waits on stdout. The listener is flushed at exit and
+    restarted in forked children.
+    
+    Args:
+        level: Level of the application loggers (default: LOG_LEVEL)
+        log_format: "text" or "json" (default: LOG_FORMAT)
+        use_queue: Write from a background thread (default: LOG_ASYNC)
+        fmt: Custom text log format
+        date_format: Custom text date format
+    
+    Returns:
+        The installed handler
+    """
+    global _handler, _listener
+    
+    with _lock:
+        if _handler is not None:
+            return _handler
+        
+        settings = get_settings()
+        level = level if level is not None else logging.getLevelName(settings.LOG_LEVEL.upper())
+        log_format = log_format or settings.LOG_FORMAT
+        use_queue = settings.LOG_ASYNC if use_queue is None else use_queue
+        
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(_build_formatter(log_format, fmt, date_format))
+        
+        if use_queue:
+            log_queue = queue.SimpleQueue()
+            _listener = QueueListener(log_queue, output)
+            _listener.start()
+            _handler = _EnqueueHandler(log_queue)
+            atexit.register(shutdown_logging)
+        else:
+            _handler = output
+        
+        logging.getLogger().addHandler(_handler)
+        # Application modules log under the "src" package; libraries keep their own levels
+        logging.getLogger("src").setLevel(level)
+        return _handler
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None and listener._thread is not None:
+        listener.stop()
+
+
+def _restart_listener_after_fork() -> None:
+    """Give a forked child its own queue and listener; the parent's thread does not exist there."""
+    global _listener
+    
+    if _listener is None or not isinstance(_handler, QueueHandler):
+        return
+    log_queue = queue.SimpleQueue()
+    _handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers)
+    _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
 
 
 def setup_logger(
     name: str,
-    level: int = logging.INFO,
+    level: Optional[int] = None,
     log_format: Optional[str] = None,
     date_format: Optional[str] = None
 ) -> logging.Logger:
     """
     Set up and configure a logger.
     
+    Installs the process-wide handler on first use (see configure_logging)
+    and returns the named logger, which writes through it.
+    
     Args:
         name: Logger name
-        level: Logging level
-        log_format: Custom log format
-        date_format: Custom date format
-        
+        level: Logging level (default: LOG_LEVEL)
+        log_format: Custom text log format
+        date_format: Custom text date format
+    
     Returns:
         Configured logger instance
     """
-    log_format = log_format or WorkerConfig.LOG_FORMAT
-    date_format = date_format or WorkerConfig.LOG_DATE_FORMAT
+    configure_logging(fmt=log_format, date_format=date_format)
     
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    logger.setLevel(level if level is not None else logging.getLevelName(get_settings().LOG_LEVEL.upper()))
     
-    # Remove existing handlers to avoid duplicates
+    # Remove handlers of earlier setups; records reach the shared handler through the root logger
     logger.handlers.clear()
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    
-    # Formatter
-    formatter = logging.Formatter(log_format, datefmt=date_format)
-    console_handler.setFormatter(formatter)
-    
-    logger.addHandler(console_handler)
-    
     return logger
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger by name."""
     return logging.getLogger(name)
+
+
+def sample_payload(logger: logging.Logger, sample_rate: float) -> bool:
+    """
+    Whether to log a full request or response payload.
+    
+    Payloads are logged only at DEBUG and only for a sample_rate share of
+    calls (LOG_PAYLOAD_SAMPLE_RATE), so the check is all a call costs when
+    payload logging is off.
+    """
+    return sample_rate > 0 and logger.isEnabledFor(logging.DEBUG) and random.random() < sample_rate
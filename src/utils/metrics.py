@@ -0,0 +1,386 @@
+"""In-process metrics with Prometheus text exposition."""
+
+import abc
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Generator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a label set such as {method="POST",le="0.5"}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, keeping integers free of a trailing .0."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric(abc.ABC):
+    """
+    Base for a metric family with optional labels.
+    
+    Children are created per label combination on first use and kept for
+    the life of the process, so label values must have low cardinality.
+    """
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric family.
+        
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names, in the order values are passed to labels()
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        self._lock = threading.Lock()
+    
+    def labels(self, *values: str):
+        """Get the child for one combination of label values."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    @abc.abstractmethod
+    def _new_child(self):
+        """Create the value holder for one label combination."""
+    
+    def _samples(self) -> List[str]:
+        """Sample lines for every child."""
+        with self._lock:
+            children = sorted(self._children.items())
+        lines = []
+        for key, child in children:
+            lines.extend(child._child_samples(self.name, self.labelnames, key))
+        return lines
+    
+    def render(self) -> str:
+        """HELP, TYPE and sample lines of the family."""
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return "\n".join(header + self._samples())
+
+
+class _Value:
+    """Single float protected by a lock."""
+    
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+    
+    def _child_samples(self, name: str, labelnames, key) -> List[str]:
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class _CounterChild(_Value):
+    def inc(self, amount: float = 1) -> None:
+        """Increase the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_Value):
+    def inc(self, amount: float = 1) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self.value += amount
+    
+    def dec(self, amount: float = 1) -> None:
+        """Decrease the gauge, never below zero."""
+        with self._lock:
+            self.value = max(0.0, self.value - amount)
+    
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        with self._lock:
+            self.value = value
+
+
+class _HistogramChild:
+    """Bucket counts, sum and count of observations."""
+    
+    def __init__(self, buckets: Sequence[float]):
+        self._upper_bounds = list(buckets)
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+    
+    @contextmanager
+    def time(self) -> Generator[None, None, None]:
+        """Observe the duration of the with-block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+    
+    def _child_samples(self, name: str, labelnames, key) -> List[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._upper_bounds + [float("inf")], counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {cumulative}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    type_name = "counter"
+    
+    def _new_child(self):
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1) -> None:
+        """Increase an unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    
+    type_name = "gauge"
+    
+    def _new_child(self):
+        return _GaugeChild()
+    
+    def inc(self, amount: float = 1) -> None:
+        """Increase an unlabelled gauge."""
+        self.labels().inc(amount)
+    
+    def dec(self, amount: float = 1) -> None:
+        """Decrease an unlabelled gauge."""
+        self.labels().dec(amount)
+    
+    def set(self, value: float) -> None:
+        """Set an unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize histogram family.
+        
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names
+            buckets: Sorted upper bounds; +Inf is added automatically
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        """Record an observation on an unlabelled histogram."""
+        self.labels().observe(value)
+    
+    def time(self):
+        """Observe the duration of a with-block on an unlabelled histogram."""
+        return self.labels().time()
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family, returning the one already registered under its name."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create or get a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create or get a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Create or get a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric family by name."""
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Render every family in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def status_class(status_code: Optional[int]) -> str:
+    """Bucket an HTTP status for labels: 2xx, 3xx, 4xx, 429, 5xx or error."""
+    if status_code is None:
+        return "error"
+    if status_code == 429:
+        return "429"
+    return f"{status_code // 100}xx"
+
+
+def serve(
+    port: int,
+    on_scrape: Optional[Callable[[], None]] = None,
+    host: str = "0.0.0.0"
+) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics from a background thread.
+    
+    For processes without the API, such as standalone or supervised
+    workers, whose metrics would otherwise never be scraped.
+    
+    Args:
+        port: Port to listen on
+        on_scrape: Called before each render, e.g. to refresh gauges
+        host: Interface to bind
+    
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            if on_scrape:
+                on_scrape()
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            """Scrapes are not worth a log line each."""
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+# Event queue
+EVENTS_PUBLISHED = REGISTRY.counter(
+    "events_published_total", "Events committed to the queue by this process", ["event_type"]
+)
+EVENTS_CLAIMED = REGISTRY.counter(
+    "events_claimed_total", "Events claimed by workers in this process"
+)
+EVENTS_RECLAIMED = REGISTRY.counter(
+    "events_lease_reclaimed_total", "Processing events returned to pending after their lease expired"
+)
+EVENTS_RETRIED = REGISTRY.counter(
+    "events_retried_total", "Failed events returned to pending for another attempt"
+)
+EVENTS_LEASE_LOST = REGISTRY.counter(
+    "events_lease_lost_total", "Event results discarded because the worker's lease had been reclaimed"
+)
+EVENTS_PROCESSED = REGISTRY.counter(
+    "events_processed_total", "Events finished by workers in this process", ["event_type", "outcome"]
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "event_queue_depth", "Events waiting in or being processed from the queue", ["status"]
+)
+QUEUE_OLDEST_PENDING_AGE = REGISTRY.gauge(
+    "event_queue_oldest_pending_age_seconds", "Age of the oldest pending event at the last reconciliation"
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "event_queue_wait_seconds", "Time from publish to claim",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+EVENT_PROCESSING = REGISTRY.histogram(
+    "event_processing_seconds", "Time an event spends being processed", ["event_type", "outcome"]
+)
+
+# Worker
+WORKER_CYCLE = REGISTRY.histogram(
+    "worker_cycle_seconds", "Duration of worker loop cycles that claimed events"
+)
+WORKER_IN_FLIGHT = REGISTRY.gauge(
+    "worker_events_in_flight", "Events submitted to the worker thread pool and not yet finished"
+)
+
+# Azure DevOps API
+AZURE_REQUESTS = REGISTRY.counter(
+    "azure_requests_total", "Azure DevOps API responses by status class", ["method", "status"]
+)
+AZURE_REQUEST_DURATION = REGISTRY.histogram(
+    "azure_request_seconds", "Azure DevOps API call latency", ["method"]
+)
+
+# Database
+DB_SESSION_DURATION = REGISTRY.histogram(
+    "db_session_seconds", "Lifetime of database sessions", ["database"]
+)
+DB_OPERATION_DURATION = REGISTRY.histogram(
+    "db_operation_seconds", "Duration of event repository operations", ["operation"]
+)
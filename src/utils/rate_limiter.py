@@ -0,0 +1,244 @@
+"""Adaptive rate limiting for outbound API calls."""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from src.core.config import get_settings
+from src.core.constants import RateLimitConfig
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus AIMD concurrency limit shared by every caller.
+    
+    Callers acquire a slot before each request and release it with the
+    response status, latency and headers. Throttling (429), Retry-After and
+    X-RateLimit-* headers pause new requests and halve the allowed rate and
+    concurrency; fast 2xx responses grow them back additively. Other
+    responses leave them unchanged.
+    Safe to use from threads and from asyncio code at the same time.
+    """
+    
+    def __init__(
+        self,
+        max_rate: float,
+        min_concurrency: int,
+        max_concurrency: int,
+        latency_target: float
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_rate: Maximum requests per second
+            min_concurrency: Lower bound for concurrent requests
+            max_concurrency: Upper bound for concurrent requests
+            latency_target: Latency in seconds above which concurrency shrinks
+        
+        Raises:
+            ValueError: If max_rate is not positive
+        """
+        if max_rate <= 0:
+            raise ValueError(f"max_rate must be positive, got {max_rate}")
+        self.max_rate = max_rate
+        self.min_rate = max_rate * RateLimitConfig.MIN_RATE_FRACTION
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.latency_target = latency_target
+        
+        self.rate = max_rate
+        self.concurrency = float(self.max_concurrency)
+        self.in_flight = 0
+        self.tokens = float(max(1.0, max_rate))
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.total = 0
+        
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+    
+    def _try_acquire(self) -> float:
+        """Take a slot if one is free, else return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            
+            if self.in_flight >= int(self.concurrency):
+                return RateLimitConfig.SLOT_POLL_INTERVAL
+            
+            elapsed = now - self._last_refill
+            self._last_refill = now
+            self.tokens = min(max(1.0, self.rate), self.tokens + elapsed * self.rate)
+            if self.tokens < 1.0:
+                return (1.0 - self.tokens) / self.rate
+            
+            self.tokens -= 1.0
+            self.in_flight += 1
+            return 0.0
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a request may be sent."""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+    
+    def release(
+        self,
+        status_code: Optional[int],
+        latency: float,
+        headers: Optional[Mapping[str, str]] = None
+    ) -> float:
+        """
+        Return a slot and adapt to the response.
+        
+        Args:
+            status_code: HTTP status, or None if the request raised
+            latency: Request duration in seconds
+            headers: Response headers
+        
+        Returns:
+            Seconds callers should wait before retrying (0 if not throttled)
+        """
+        headers = headers or {}
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        pause = _parse_rate_limit_pause(headers)
+        
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight = max(0, self.in_flight - 1)
+            self.total += 1
+            
+            throttled = status_code == 429 or (status_code == 503 and retry_after is not None)
+            if throttled:
+                self.throttled += 1
+                retry_after = retry_after if retry_after is not None else RateLimitConfig.DEFAULT_RETRY_AFTER
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                self._decrease(now, RateLimitConfig.THROTTLE_DECREASE)
+            else:
+                retry_after = 0.0
+                if pause:
+                    self.blocked_until = max(self.blocked_until, now + pause)
+                
+                delayed = _header_float(headers, "X-RateLimit-Delay") > 0
+                if delayed or latency > self.latency_target:
+                    self._decrease(now, RateLimitConfig.LATENCY_DECREASE)
+                elif status_code is not None and 200 <= status_code < 300:
+                    self.concurrency = min(
+                        self.max_concurrency,
+                        self.concurrency + 1.0 / self.concurrency
+                    )
+                    self.rate = min(
+                        self.max_rate,
+                        self.rate + self.max_rate * RateLimitConfig.RATE_INCREASE_FRACTION
+                    )
+            
+            return retry_after
+    
+    def _decrease(self, now: float, factor: float) -> None:
+        """Multiplicative decrease, applied at most once per cooldown."""
+        if now - self._last_decrease < RateLimitConfig.DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.concurrency = max(self.min_concurrency, self.concurrency * factor)
+        self.rate = max(self.min_rate, self.rate * factor)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get current limiter state.
+        
+        Returns:
+            Dictionary with current rate, concurrency and throttle counts
+        """
+        with self._lock:
+            return {
+                "rate_per_second": round(self.rate, 2),
+                "concurrency_limit": int(self.concurrency),
+                "in_flight": self.in_flight,
+                "throttled": self.throttled,
+                "requests": self.total,
+                "paused_for": round(max(0.0, self.blocked_until - time.monotonic()), 2)
+            }
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_rate_limit_pause(headers: Mapping[str, str]) -> float:
+    """Seconds to pause when X-RateLimit-Remaining says the budget is spent."""
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return 0.0
+    try:
+        if float(remaining) > 0:
+            return 0.0
+        return max(0.0, float(reset) - time.time())
+    except ValueError:
+        return 0.0
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float:
+    """Read a numeric header, treating missing or malformed values as 0."""
+    try:
+        return float(headers.get(name) or 0)
+    except ValueError:
+        return 0.0
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def build_rate_limiter(max_rate: Optional[float] = None) -> AdaptiveRateLimiter:
+    """
+    Create an Azure DevOps rate limiter configured from settings.
+    
+    Args:
+        max_rate: Requests per second (default: AZURE_RATE_LIMIT_PER_SECOND)
+    """
+    settings = get_settings()
+    return AdaptiveRateLimiter(
+        max_rate=max_rate if max_rate is not None else settings.AZURE_RATE_LIMIT_PER_SECOND,
+        min_concurrency=settings.AZURE_MIN_CONCURRENCY,
+        max_concurrency=settings.AZURE_MAX_CONCURRENCY,
+        latency_target=settings.AZURE_LATENCY_TARGET_MS / 1000
+    )
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the process-wide Azure DevOps rate limiter."""
+    global _limiter
+    
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = build_rate_limiter()
+    
+    return _limiter
@@ -0,0 +1,466 @@
+"""Lightweight tracing with W3C trace context and OTLP/JSON export."""
+
+import abc
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Mapping, MutableMapping, NamedTuple, Optional
+
+import requests
+
+from src.core.config import get_settings
+from src.core.constants import TraceExporter, TracingConfig
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SpanKind:
+    """OTLP span kinds."""
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    CONSUMER = 5
+
+
+class SpanContext(NamedTuple):
+    """Identity of a span, as carried between processes."""
+    trace_id: str
+    span_id: str
+    sampled: bool
+    
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+    
+    @classmethod
+    def parse(cls, traceparent: Any) -> Optional["SpanContext"]:
+        """Parse a traceparent value, returning None if it is malformed."""
+        if not isinstance(traceparent, str):
+            return None
+        parts = traceparent.split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            flags = int(parts[3], 16)
+            if not int(parts[1], 16) or not int(parts[2], 16):
+                return None
+        except ValueError:
+            return None
+        return cls(parts[1], parts[2], bool(flags & 1))
+
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """Span that records nothing; returned whenever a trace is not sampled."""
+    
+    context: Optional[SpanContext] = None
+    
+    def __enter__(self) -> "_NoopSpan":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        return None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore an attribute."""
+    
+    def record_error(self, message: str) -> None:
+        """Ignore an error."""
+    
+    def end(self, end_time_ns: Optional[int] = None) -> None:
+        """Ignore the end of the span."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledSpan(_NoopSpan):
+    """
+    Root of a trace that was not sampled.
+    
+    It records nothing but still becomes the current context, so the
+    not-sampled decision travels with the events it publishes.
+    """
+    
+    def __init__(self, context: SpanContext):
+        self.context = context
+        self._token = None
+    
+    def __enter__(self) -> "_UnsampledSpan":
+        self._token = _current.set(self.context)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        _current.reset(self._token)
+
+
+class Span:
+    """A timed operation within a trace."""
+    
+    __slots__ = (
+        "name", "context", "parent_id", "kind", "start_time_ns", "end_time_ns",
+        "attributes", "error", "_tracer", "_token"
+    )
+    
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str],
+        kind: int,
+        start_time_ns: int,
+        attributes: Dict[str, Any]
+    ):
+        self._tracer = tracer
+        self._token = None
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_time_ns = start_time_ns
+        self.end_time_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+    
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self.context)
+        return self
+    
+    def __exit__(self, exc_type, exc, _traceback) -> None:
+        if exc is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        self.end()
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+    
+    def record_error(self, message: str) -> None:
+        """Mark the span as failed with an error message."""
+        self.error = message
+    
+    def end(self, end_time_ns: Optional[int] = None) -> None:
+        """Finish the span and hand it to the exporter (once)."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = end_time_ns or time.time_ns()
+        self._tracer.exporter.export(self)
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span in the OTLP/JSON encoding."""
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Encode attributes as OTLP key/value pairs."""
+    encoded = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+class SpanExporter(abc.ABC):
+    """
+    Batches finished spans on a background thread.
+    
+    export() only appends to a bounded queue, so traced code never waits on
+    file or network I/O; spans are dropped (and counted) when it is full.
+    Subclasses write one batch at a time in write().
+    """
+    
+    def __init__(
+        self,
+        service_name: str,
+        batch_size: int = TracingConfig.EXPORT_BATCH_SIZE,
+        interval: float = TracingConfig.EXPORT_INTERVAL,
+        max_queue_size: int = TracingConfig.MAX_QUEUE_SIZE
+    ):
+        """
+        Initialize exporter.
+        
+        Args:
+            service_name: service.name resource attribute
+            batch_size: Spans written per batch
+            interval: Longest a finished span waits before it is written
+            max_queue_size: Finished spans buffered before new ones are dropped
+        """
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(max_queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+    
+    def export(self, span: Span) -> None:
+        """Queue a finished span for writing."""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+    
+    def shutdown(self, timeout: float = TracingConfig.SHUTDOWN_TIMEOUT) -> None:
+        """Write the spans still queued and stop the background thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+    
+    def _run(self) -> None:
+        """Collect spans into batches and write them."""
+        stopping = False
+        while not stopping:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            
+            if batch:
+                try:
+                    self.write(self._payload(batch))
+                except Exception as e:
+                    logger.warning("⚠️ Could not export %s span(s): %s", len(batch), e)
+    
+    def _payload(self, batch: List[Span]) -> Dict[str, Any]:
+        """OTLP/JSON ExportTraceServiceRequest for a batch of spans."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": TracingConfig.SCOPE_NAME},
+                    "spans": [span.to_otlp() for span in batch]
+                }]
+            }]
+        }
+    
+    @abc.abstractmethod
+    def write(self, payload: Dict[str, Any]) -> None:
+        """Write one OTLP/JSON batch."""
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends batches to a local file, one OTLP/JSON request per line.
+    
+    The file can be read as-is by an OpenTelemetry Collector's
+    otlpjsonfile receiver.
+    """
+    
+    def __init__(self, path: str, service_name: str, **kwargs):
+        """
+        Initialize file exporter.
+        
+        Args:
+            path: File to append to (created with its directory if missing)
+            service_name: service.name resource attribute
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(service_name, **kwargs)
+    
+    def write(self, payload: Dict[str, Any]) -> None:
+        """Append one batch as a JSON line."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """Posts batches to an OTLP/HTTP collector using the JSON encoding."""
+    
+    def __init__(self, endpoint: str, service_name: str, **kwargs):
+        """
+        Initialize OTLP exporter.
+        
+        Args:
+            endpoint: Collector traces URL, e.g. http://localhost:4318/v1/traces
+            service_name: service.name resource attribute
+        """
+        self.endpoint = endpoint
+        self.session = requests.Session()
+        super().__init__(service_name, **kwargs)
+    
+    def write(self, payload: Dict[str, Any]) -> None:
+        """Post one batch to the collector."""
+        response = self.session.post(
+            self.endpoint,
+            data=json.dumps(payload, separators=(",", ":")),
+            headers={"Content-Type": "application/json"},
+            timeout=TracingConfig.OTLP_TIMEOUT
+        )
+        if response.status_code >= 300:
+            raise RuntimeError(f"collector answered {response.status_code}: {response.text[:200]}")
+
+
+class Tracer:
+    """Starts spans, deciding per trace whether it is sampled."""
+    
+    def __init__(self, exporter: SpanExporter, sample_ratio: float = 1.0):
+        """
+        Initialize tracer.
+        
+        Args:
+            exporter: Destination of finished spans
+            sample_ratio: Fraction of new traces that are recorded (0-1)
+        """
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+    
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        kind: int = SpanKind.INTERNAL,
+        start_time_ns: Optional[int] = None
+    ):
+        """
+        Start a span as a child of `parent`, or of the current span.
+        
+        Without either a new trace is started and sampled. Spans in a trace
+        that is not sampled are no-ops. Use the result as a context manager
+        to make it the current span and end it on exit.
+        """
+        parent = parent or _current.get()
+        if parent is None:
+            context = SpanContext(
+                os.urandom(16).hex(), os.urandom(8).hex(), random.random() < self.sample_ratio
+            )
+            if not context.sampled:
+                return _UnsampledSpan(context)
+            parent_id = None
+        elif not parent.sampled:
+            return _UnsampledSpan(parent) if parent is not _current.get() else NOOP_SPAN
+        else:
+            context = SpanContext(parent.trace_id, os.urandom(8).hex(), True)
+            parent_id = parent.span_id
+        
+        return Span(
+            self, name, context, parent_id, kind,
+            start_time_ns or time.time_ns(), dict(attributes) if attributes else {}
+        )
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+_enabled: Optional[bool] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the process-wide tracer, or None when tracing is disabled."""
+    global _tracer, _enabled
+    
+    if _enabled is None:
+        with _tracer_lock:
+            if _enabled is None:
+                settings = get_settings()
+                if settings.TRACING_ENABLED:
+                    if settings.TRACING_EXPORTER == TraceExporter.OTLP.value:
+                        exporter = OtlpHttpSpanExporter(
+                            settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME
+                        )
+                    else:
+                        exporter = FileSpanExporter(
+                            settings.TRACING_FILE, settings.TRACING_SERVICE_NAME
+                        )
+                    _tracer = Tracer(exporter, settings.TRACING_SAMPLE_RATIO)
+                _enabled = _tracer is not None
+    
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    """Flush queued spans and stop the exporter, if tracing was started."""
+    global _tracer, _enabled
+    
+    with _tracer_lock:
+        tracer, _tracer, _enabled = _tracer, None, None
+    if tracer is not None:
+        tracer.exporter.shutdown()
+        if tracer.exporter.dropped:
+            logger.warning("⚠️ Dropped %s span(s): export queue was full", tracer.exporter.dropped)
+
+
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    parent: Optional[SpanContext] = None,
+    kind: int = SpanKind.INTERNAL,
+    start_time_ns: Optional[int] = None
+):
+    """
+    Start a span with the process-wide tracer.
+    
+    Returns a shared no-op span when tracing is disabled, so instrumented
+    code costs one call and a context-manager enter/exit.
+    
+    Args:
+        name: Span name
+        attributes: Initial attributes
+        parent: Remote parent (defaults to the current span)
+        kind: One of SpanKind
+        start_time_ns: Start time in ns since the epoch (defaults to now)
+    """
+    tracer = _tracer if _enabled else (None if _enabled is False else get_tracer())
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.start_span(name, attributes, parent, kind, start_time_ns)
+
+
+def current_traceparent() -> Optional[str]:
+    """traceparent of the current span, or None outside of a trace."""
+    context = _current.get()
+    return context.traceparent if context else None
+
+
+def inject(carrier: MutableMapping[str, Any]) -> None:
+    """Add the current traceparent to an event payload or header dict."""
+    context = _current.get()
+    if context is not None:
+        carrier[TracingConfig.TRACEPARENT_KEY] = context.traceparent
+
+
+def extract(carrier: Any) -> Optional[SpanContext]:
+    """Read the trace context from an event payload or header dict."""
+    if not isinstance(carrier, Mapping):
+        return None
+    return SpanContext.parse(carrier.get(TracingConfig.TRACEPARENT_KEY))
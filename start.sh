@@ -4,5 +4,7 @@
 # Run database migrations if needed (uncomment when you have migrations)
 # alembic upgrade head
 
-# Start the application with gunicorn for production
-gunicorn -w 1 -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000} src.main:app
+# Start the application with gunicorn for production.
+# Any number of workers is safe: leader election (WORKER_LEADER_ELECTION)
+# runs the embedded queue worker in only one of them.
+gunicorn -w ${WEB_CONCURRENCY:-2} -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000} src.main:app
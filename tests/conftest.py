@@ -0,0 +1,57 @@
+"""Shared fixtures: every test runs against a temporary SQLite database."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings and engines are built at import time, so point them at the test
+# database before anything from src is imported
+_db_dir = tempfile.mkdtemp(prefix="event-queue-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'test.db'}"
+os.environ["AUTO_START_WORKER"] = "false"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from src.core.database import SessionLocal, engine, init_db
+from src.core.models import Base
+from src.repositories.user_story_repository import get_story_cache
+from src.services import get_idempotency_cache
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once per test run."""
+    init_db()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(database):
+    """Empty every table and the in-memory caches before each test."""
+    with database.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    get_idempotency_cache().clear()
+    get_story_cache().clear()
+
+
+@pytest.fixture
+def db():
+    """Database session, closed after the test."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def story():
+    """Build story dictionaries as accepted by the ingest services."""
+    def build(story_id, title="Story"):
+        return {"story_id": story_id, "title": title, "area_path": None, "iteration_path": None}
+    return build
@@ -0,0 +1,61 @@
+"""Tests for Azure DevOps $batch response handling."""
+
+import json
+
+from src.services import AzureDevOpsService
+
+
+class FakeResponse:
+    """Minimal stand-in for an HTTP response."""
+    
+    def __init__(self, status_code, payload=None, content_type="application/json", text=""):
+        self.status_code = status_code
+        self.headers = {"content-type": content_type}
+        self.text = text
+        self._payload = payload
+    
+    def json(self):
+        return self._payload
+
+
+def _service():
+    # Response mapping does not touch credentials or the HTTP session
+    return AzureDevOpsService.__new__(AzureDevOpsService)
+
+
+def _entry(code, body):
+    return {"code": code, "body": json.dumps(body)}
+
+
+def test_results_are_keyed_by_index_with_repeated_titles():
+    tasks = ["Review", "Review", "Test"]
+    response = FakeResponse(200, {"value": [
+        _entry(200, {"id": 101}),
+        _entry(400, {"message": "Invalid field"}),
+        _entry(200, {"id": 103}),
+    ]})
+    
+    created, failed = _service()._handle_batch_response(response, "https://example/$batch", tasks)
+    
+    assert created == {0: 101, 2: 103}
+    assert failed == {1: "400 - Invalid field"}
+
+
+def test_entries_missing_from_response_fail():
+    tasks = ["Review", "Test"]
+    response = FakeResponse(200, {"value": [_entry(200, {"id": 101})]})
+    
+    created, failed = _service()._handle_batch_response(response, "https://example/$batch", tasks)
+    
+    assert created == {0: 101}
+    assert failed == {1: "Missing from batch response"}
+
+
+def test_failed_request_fails_every_entry():
+    tasks = ["Review", "Review"]
+    response = FakeResponse(500, text="Server error")
+    
+    created, failed = _service()._handle_batch_response(response, "https://example/$batch", tasks)
+    
+    assert created == {}
+    assert set(failed) == {0, 1}
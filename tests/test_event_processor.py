@@ -0,0 +1,54 @@
+"""Tests for event processing outcomes."""
+
+import json
+
+import pytest
+
+from src.core.constants import EventStatus, EventType
+from src.repositories import EventRepository
+from src.services import AzureDevOpsError, EventQueueService
+from src.services.event_processor import EventProcessor
+
+
+class FailingAzureService:
+    """Azure DevOps client whose subtask creation always fails."""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+    
+    def create_subtasks_for_story(self, **kwargs):
+        raise self.error
+
+
+def _process(db, event_type, data, error):
+    """Publish, claim and process one event, then return it as stored."""
+    repo = EventRepository(db)
+    repo.create(event_type, data, EventStatus.PENDING.value)
+    [event] = repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    
+    EventProcessor(EventQueueService(db), db, FailingAzureService(error)).process_event(event)
+    
+    db.expire_all()
+    return repo.get_by_id(event.id)
+
+
+def test_azure_error_is_retried(db):
+    data = json.dumps({"story_id": 1, "title": "Story"})
+    
+    event = _process(db, EventType.USER_STORY_CREATED.value, data, AzureDevOpsError("Task creation failed"))
+    
+    assert (event.status, event.retry_count) == (EventStatus.PENDING.value, 1)
+    assert event.available_at is not None
+
+
+@pytest.mark.parametrize("event_type, data", [
+    ("story_deleted", json.dumps({"story_id": 1})),
+    (EventType.USER_STORY_CREATED.value, "{not json"),
+    (EventType.USER_STORY_CREATED.value, json.dumps(["not", "an", "object"])),
+    (EventType.USER_STORY_CREATED.value, json.dumps({"title": "No story ID"})),
+])
+def test_permanent_errors_fail_without_retry(db, event_type, data):
+    event = _process(db, event_type, data, AzureDevOpsError("not reached"))
+    
+    assert (event.status, event.retry_count) == (EventStatus.FAILED.value, 0)
+    assert event.error
@@ -0,0 +1,148 @@
+"""Tests for event claiming and leases."""
+
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from src.core.constants import EventStatus, EventType
+from src.core.database import SessionLocal
+from src.core.models import Event
+from src.repositories import EventRepository
+
+
+def _publish(db, count):
+    """Insert `count` pending events and return their IDs."""
+    repo = EventRepository(db)
+    return [
+        repo.create(EventType.USER_STORY_CREATED.value, "{}", EventStatus.PENDING.value).id
+        for _ in range(count)
+    ]
+
+
+def _lose_lease(db, event_id):
+    """Let another worker reclaim an event claimed by worker-a."""
+    db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    db.commit()
+    EventRepository(db).claim_pending_events("worker-b", 1, lease_seconds=60)
+
+
+def test_concurrent_claims_never_share_an_event(db):
+    event_ids = _publish(db, 40)
+    claims = {}
+    start = threading.Barrier(4)
+    
+    def claim(worker_id):
+        session = SessionLocal()
+        try:
+            start.wait()
+            claimed = []
+            while True:
+                events = EventRepository(session).claim_pending_events(worker_id, 3, lease_seconds=60)
+                if not events:
+                    break
+                claimed.extend(event.id for event in events)
+            claims[worker_id] = claimed
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=claim, args=(f"worker-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    claimed = [event_id for ids in claims.values() for event_id in ids]
+    assert sorted(claimed) == sorted(event_ids)
+    for worker_id, ids in claims.items():
+        owners = {event.worker_id for event in db.query(Event).filter(Event.id.in_(ids))}
+        assert owners <= {worker_id}
+
+
+def test_claim_skips_events_with_live_lease(db):
+    _publish(db, 2)
+    repo = EventRepository(db)
+    
+    first = repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    second = repo.claim_pending_events("worker-b", 5, lease_seconds=60)
+    
+    assert len(first) == 1 and len(second) == 1
+    assert first[0].id != second[0].id
+    assert repo.claim_pending_events("worker-c", 5, lease_seconds=60) == []
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(db):
+    [event_id] = _publish(db, 1)
+    repo = EventRepository(db)
+    [event] = repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    assert event.id == event_id
+    
+    db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    )
+    db.commit()
+    
+    [reclaimed] = repo.claim_pending_events("worker-b", 1, lease_seconds=60)
+    assert reclaimed.id == event_id
+    assert reclaimed.worker_id == "worker-b"
+
+
+def test_completion_after_lost_lease_is_skipped(db):
+    [event_id] = _publish(db, 1)
+    repo = EventRepository(db)
+    repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    _lose_lease(db, event_id)
+    
+    assert repo.mark_completed(event_id, "{}", worker_id="worker-a") is False
+    assert repo.mark_completed(event_id, "{}", worker_id="worker-b") is True
+    
+    db.expire_all()
+    event = repo.get_by_id(event_id)
+    assert event.status == EventStatus.COMPLETED.value
+
+
+def test_renew_leases_only_extends_own_events(db):
+    event_ids = _publish(db, 2)
+    repo = EventRepository(db)
+    repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    repo.claim_pending_events("worker-b", 1, lease_seconds=60)
+    
+    renewed = repo.renew_leases("worker-a", event_ids, lease_seconds=600)
+    
+    assert renewed == [event_ids[0]]
+
+
+def test_lost_lease_ends_the_transaction(db):
+    event_ids = _publish(db, 2)
+    repo = EventRepository(db)
+    repo.claim_pending_events("worker-a", 2, lease_seconds=60)
+    _lose_lease(db, event_ids[0])
+    
+    assert repo.mark_failed(event_ids[0], "boom", worker_id="worker-a") is None
+    assert not db.in_transaction()
+    
+    # Writes staged for a unit of work are discarded with the completion
+    repo.mark_completed(event_ids[1], "{}", commit=False, worker_id="worker-a")
+    assert repo.mark_completed(event_ids[0], "{}", commit=False, worker_id="worker-a") is False
+    assert not db.in_transaction()
+    db.expire_all()
+    assert repo.get_by_id(event_ids[1]).status == EventStatus.PROCESSING.value
+
+
+def test_retry_failed_clears_error(db):
+    [event_id] = _publish(db, 1)
+    repo = EventRepository(db)
+    repo.claim_pending_events("worker-a", 1, lease_seconds=60)
+    assert repo.mark_failed(event_id, "boom", worker_id="worker-a") == (EventStatus.FAILED.value, 0)
+    
+    assert repo.retry_failed() == [event_id]
+    
+    db.expire_all()
+    event = repo.get_by_id(event_id)
+    assert (event.status, event.error, event.retry_count) == (EventStatus.PENDING.value, None, 0)
@@ -0,0 +1,72 @@
+"""Tests for archiving old completed events."""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.constants import ArchiveMode, EventStatus, EventType
+from src.core.models import ArchivedEvent, Event
+from src.services import EventRetentionService
+
+
+def _event(db, status, days_ago):
+    """Insert an event last touched `days_ago` days ago and return its ID."""
+    finished = datetime.utcnow() - timedelta(days=days_ago)
+    event = Event(
+        event_type=EventType.USER_STORY_CREATED.value,
+        data="{}",
+        status=status,
+        created_at=finished,
+        processed_at=finished if status == EventStatus.COMPLETED.value else None
+    )
+    db.add(event)
+    db.commit()
+    return event.id
+
+
+@pytest.fixture
+def events(db):
+    """One old completed event, plus events retention must leave alone."""
+    return {
+        "old": _event(db, EventStatus.COMPLETED.value, 30),
+        "recent": _event(db, EventStatus.COMPLETED.value, 1),
+        "failed": _event(db, EventStatus.FAILED.value, 30),
+        "pending": _event(db, EventStatus.PENDING.value, 30),
+    }
+
+
+def test_table_mode_moves_only_old_completed_events(db, events):
+    stats = EventRetentionService(db, mode=ArchiveMode.TABLE.value).run(retention_days=7, batch_size=10)
+    
+    assert stats["archived"] == 1
+    assert [archived.id for archived in db.query(ArchivedEvent)] == [events["old"]]
+    remaining = {event.id for event in db.query(Event)}
+    assert remaining == {events["recent"], events["failed"], events["pending"]}
+
+
+def test_ndjson_mode_writes_archive_before_deleting(db, events, tmp_path):
+    service = EventRetentionService(db, mode=ArchiveMode.NDJSON.value, archive_dir=str(tmp_path))
+    
+    stats = service.run(retention_days=7, batch_size=10)
+    
+    (path,) = tmp_path.iterdir()
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        records = [json.loads(line) for line in archive]
+    assert stats["archived"] == 1
+    assert [record["id"] for record in records] == [events["old"]]
+    assert db.get(Event, events["old"]) is None
+    assert db.query(ArchivedEvent).count() == 0
+
+
+def test_run_archives_in_bounded_batches(db):
+    for _ in range(5):
+        _event(db, EventStatus.COMPLETED.value, 30)
+    
+    stats = EventRetentionService(db, mode=ArchiveMode.TABLE.value).run(
+        retention_days=7, batch_size=2, max_batches=2
+    )
+    
+    assert (stats["archived"], stats["batches"]) == (4, 2)
+    assert db.query(Event).count() == 1
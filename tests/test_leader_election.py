@@ -0,0 +1,63 @@
+"""Tests for heartbeat-lease leader election on SQLite."""
+
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from src.core.models import LeaderLease
+from src.services import LeaderElection
+
+
+def _election(on_elected=lambda: None, on_demoted=lambda: None):
+    """Candidate for a test role with a short lease."""
+    return LeaderElection("test-role", on_elected, on_demoted, lease_seconds=10, renew_interval=1)
+
+
+def _expire_lease(db):
+    """Let the current lease run out, as if its holder stopped renewing."""
+    db.execute(update(LeaderLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+
+def test_only_one_candidate_holds_the_lease():
+    first, second = _election(), _election()
+    
+    assert first._try_acquire()
+    assert not second._try_acquire()
+    assert first._try_acquire()
+
+
+def test_released_lease_is_taken_over_at_once():
+    first, second = _election(), _election()
+    first._try_acquire()
+    
+    first._release()
+    
+    assert second._try_acquire()
+
+
+def test_expired_lease_is_taken_over(db):
+    first, second = _election(), _election()
+    first._try_acquire()
+    
+    _expire_lease(db)
+    
+    assert second._try_acquire()
+    assert not first._try_acquire()
+
+
+def test_leader_runs_role_until_stopped():
+    elected = threading.Event()
+    demoted = threading.Event()
+    election = _election(elected.set, demoted.set)
+    
+    election.start()
+    try:
+        assert elected.wait(timeout=5)
+        assert election.is_leader
+    finally:
+        election.stop()
+    
+    assert demoted.is_set()
+    assert _election()._try_acquire()
@@ -0,0 +1,75 @@
+"""Tests for the event queue gauges and the worker metrics endpoint."""
+
+import urllib.request
+
+import pytest
+
+from src.core.constants import EventStatus, EventType
+from src.services import EventQueueService, QueueMetricsReconciler
+from src.utils import metrics
+
+
+def _depth():
+    """Current (pending, processing) gauge values."""
+    return tuple(
+        metrics.QUEUE_DEPTH.labels(status).value
+        for status in (EventStatus.PENDING.value, EventStatus.PROCESSING.value)
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_gauges():
+    """Start every test from empty queue gauges."""
+    for status in (EventStatus.PENDING.value, EventStatus.PROCESSING.value):
+        metrics.QUEUE_DEPTH.labels(status).set(0)
+
+
+def test_gauges_follow_publish_claim_and_completion(db):
+    event_queue = EventQueueService(db)
+    event_queue.publish_event(EventType.USER_STORY_CREATED.value, {"story_id": 1})
+    event_queue.publish_event(EventType.USER_STORY_CREATED.value, {"story_id": 2})
+    assert _depth() == (2, 0)
+    
+    first, second = event_queue.claim_events("worker-a", 2, lease_seconds=60)
+    assert _depth() == (0, 2)
+    
+    event_queue.mark_completed(first.id, worker_id="worker-a")
+    event_queue.mark_failed(second.id, "azure down", worker_id="worker-a")
+    assert _depth() == (1, 0)
+
+
+def test_rolled_back_completion_leaves_gauges_alone(db):
+    event_queue = EventQueueService(db)
+    event_queue.publish_event(EventType.USER_STORY_CREATED.value, {"story_id": 1})
+    (event,) = event_queue.claim_events("worker-a", 1, lease_seconds=60)
+    
+    assert event_queue.mark_completed(event.id, commit=False, worker_id="worker-a")
+    db.rollback()
+    assert _depth() == (0, 1)
+    
+    assert event_queue.mark_completed(event.id, commit=False, worker_id="worker-a")
+    db.commit()
+    assert _depth() == (0, 0)
+
+
+def test_reconciler_corrects_drift(db):
+    EventQueueService(db).publish_event(EventType.USER_STORY_CREATED.value, {"story_id": 1})
+    metrics.QUEUE_DEPTH.labels(EventStatus.PENDING.value).set(5)
+    
+    reconciler = QueueMetricsReconciler(interval=60)
+    assert reconciler.maybe_refresh()
+    assert not reconciler.maybe_refresh()
+    assert _depth() == (1, 0)
+
+
+def test_metrics_server_renders_registry():
+    server = metrics.serve(0, host="127.0.0.1")
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert "event_queue_depth" in body
@@ -0,0 +1,71 @@
+"""Tests for the adaptive Azure DevOps rate limiter."""
+
+import pytest
+
+from src.core.constants import RateLimitConfig
+from src.utils.rate_limiter import AdaptiveRateLimiter, build_rate_limiter
+
+
+def _limiter(max_rate=100.0, max_concurrency=8):
+    return AdaptiveRateLimiter(max_rate, min_concurrency=1, max_concurrency=max_concurrency, latency_target=1.0)
+
+
+@pytest.mark.parametrize("max_rate", [0, -1])
+def test_non_positive_rate_is_rejected(max_rate):
+    with pytest.raises(ValueError):
+        _limiter(max_rate=max_rate)
+
+
+def test_throttle_pauses_and_halves_rate_and_concurrency():
+    limiter = _limiter()
+    limiter.acquire()
+    
+    wait = limiter.release(429, 0.1, {"Retry-After": "2"})
+    
+    stats = limiter.stats()
+    assert wait == 2.0
+    assert stats["throttled"] == 1
+    assert stats["rate_per_second"] == 100.0 * RateLimitConfig.THROTTLE_DECREASE
+    assert stats["concurrency_limit"] == 4
+    assert stats["paused_for"] > 1.5
+    assert limiter._try_acquire() > 0
+
+
+def test_only_fast_successes_grow_the_rate():
+    limiter = _limiter()
+    limiter.acquire()
+    limiter.release(429, 0.1)
+    limiter.blocked_until = 0.0
+    throttled_rate = limiter.rate
+    
+    for status in (404, 500, None):
+        limiter.acquire()
+        limiter.release(status, 0.1)
+    assert limiter.rate == throttled_rate
+    
+    limiter.acquire()
+    limiter.release(201, 0.1)
+    assert limiter.rate == throttled_rate + 100.0 * RateLimitConfig.RATE_INCREASE_FRACTION
+
+
+def test_exhausted_rate_limit_budget_pauses_requests():
+    limiter = _limiter()
+    limiter.acquire()
+    
+    limiter.release(200, 0.1, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9999999999"})
+    
+    assert limiter._try_acquire() > 0
+
+
+def test_concurrency_limit_caps_in_flight_requests():
+    limiter = _limiter(max_concurrency=2)
+    limiter.acquire()
+    limiter.acquire()
+    
+    assert limiter._try_acquire() == RateLimitConfig.SLOT_POLL_INTERVAL
+    limiter.release(200, 0.1)
+    assert limiter._try_acquire() == 0.0
+
+
+def test_build_rate_limiter_uses_given_rate():
+    assert build_rate_limiter(12.5).max_rate == 12.5
@@ -0,0 +1,48 @@
+"""Tests for the group-commit ingest buffer."""
+
+import pytest
+
+from src.core.models import UserStoryRecord
+from src.services import StoryIngestBuffer, UserStoryService
+
+
+def test_failed_story_does_not_fail_its_batch(db, monkeypatch, story):
+    ingest = UserStoryService._ingest
+    batches = []
+    
+    def failing_ingest(self, stories):
+        batches.append([item["story_id"] for item in stories])
+        if any(item["story_id"] == 2 for item in stories):
+            raise RuntimeError("constraint violated")
+        return ingest(self, stories)
+    
+    monkeypatch.setattr(UserStoryService, "_ingest", failing_ingest)
+    buffer = StoryIngestBuffer(max_items=3, max_delay_ms=1000)
+    try:
+        futures = [buffer.submit(story(story_id)) for story_id in (1, 2, 3)]
+        
+        assert futures[0].result(timeout=5)["status"] == "accepted"
+        with pytest.raises(RuntimeError):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5)["status"] == "accepted"
+    finally:
+        buffer.close()
+    
+    assert batches[0] == [1, 2, 3]
+    stored = {record.azure_story_id for record in db.query(UserStoryRecord)}
+    assert stored == {1, 3}
+
+
+@pytest.mark.parametrize("payload", [
+    {"story_id": "7", "title": "Story"},
+    {"story_id": True, "title": "Story"},
+    {"story_id": 7, "title": None},
+    {"story_id": 7, "title": "x" * 10000},
+])
+def test_invalid_story_is_rejected_before_batching(payload):
+    buffer = StoryIngestBuffer(max_items=3, max_delay_ms=1000)
+    try:
+        with pytest.raises(ValueError):
+            buffer.submit(payload)
+    finally:
+        buffer.close()
@@ -0,0 +1,25 @@
+"""Tests for task template loading."""
+
+import json
+
+from src.core.constants import TaskTemplates
+from src.services.task_template_registry import TaskTemplateRegistry
+
+
+def _registry(tmp_path, config):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return TaskTemplateRegistry(str(path), org="org", project="Project")
+
+
+def test_area_template_is_used_for_nested_areas(tmp_path):
+    registry = _registry(tmp_path, {"areas": {"Project\\Team": ["Build", "Ship"]}})
+    
+    assert registry.for_area("Project\\Team\\Component").titles == ["Build", "Ship"]
+    assert registry.for_area("Project\\Other").titles == TaskTemplates.STANDARD_TASKS
+
+
+def test_repeated_titles_are_rejected(tmp_path):
+    registry = _registry(tmp_path, {"areas": {"Project": ["Review", "Review"]}})
+    
+    assert registry.for_area("Project").titles == TaskTemplates.STANDARD_TASKS
@@ -0,0 +1,85 @@
+"""Tests for trace context propagation through event payloads."""
+
+import pytest
+
+from src.core.constants import TracingConfig
+from src.utils import tracing
+from src.utils.tracing import SpanContext, SpanExporter, Tracer
+
+
+class MemorySpanExporter(SpanExporter):
+    """Keeps exported spans in memory."""
+    
+    def __init__(self):
+        self.spans = []
+        super().__init__("test-service", interval=0.01)
+    
+    def write(self, payload):
+        self.spans += payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+@pytest.fixture
+def exporter():
+    """In-memory exporter, shut down after the test."""
+    span_exporter = MemorySpanExporter()
+    yield span_exporter
+    span_exporter.shutdown()
+
+
+def test_worker_continues_the_trace_of_the_published_event(exporter):
+    tracer = Tracer(exporter)
+    event_data = {"story_id": 1}
+    
+    with tracer.start_span("POST /userstory/create") as request:
+        tracing.inject(event_data)
+    parent = tracing.extract(event_data)
+    with tracer.start_span("process_event", parent=parent) as processing:
+        pass
+    exporter.shutdown()
+    
+    assert parent == request.context
+    assert processing.context.trace_id == request.context.trace_id
+    assert processing.parent_id == request.context.span_id
+    assert [span["name"] for span in exporter.spans] == ["POST /userstory/create", "process_event"]
+
+
+def test_not_sampled_decision_travels_with_the_event(exporter):
+    event_data = {}
+    
+    with Tracer(exporter, sample_ratio=0).start_span("POST /userstory/create"):
+        tracing.inject(event_data)
+    parent = tracing.extract(event_data)
+    with Tracer(exporter, sample_ratio=1).start_span("process_event", parent=parent):
+        pass
+    exporter.shutdown()
+    
+    assert parent is not None and not parent.sampled
+    assert event_data[TracingConfig.TRACEPARENT_KEY].endswith("-00")
+    assert exporter.spans == []
+
+
+def test_no_context_is_injected_outside_a_trace():
+    event_data = {}
+    
+    tracing.inject(event_data)
+    
+    assert event_data == {}
+    assert tracing.extract(event_data) is None
+
+
+@pytest.mark.parametrize("traceparent", [
+    None,
+    "not-a-traceparent",
+    "00-" + "0" * 32 + "-" + "1" * 16 + "-01",
+    "00-" + "z" * 32 + "-" + "1" * 16 + "-01",
+])
+def test_malformed_traceparent_is_ignored(traceparent):
+    assert SpanContext.parse(traceparent) is None
+
+
+def test_exporter_without_write_cannot_be_created():
+    class IncompleteExporter(SpanExporter):
+        pass
+    
+    with pytest.raises(TypeError):
+        IncompleteExporter("test-service")
@@ -0,0 +1,33 @@
+"""Tests for the story read-through cache."""
+
+import pytest
+
+from src.core import database
+from src.repositories import UserStoryRepository
+from src.repositories.user_story_repository import get_story_cache
+
+
+@pytest.fixture
+def cache():
+    """The process-wide story cache."""
+    return get_story_cache()
+
+
+def test_primary_read_is_cached(db, cache):
+    repo = UserStoryRepository(db)
+    repo.create_story(1, "Login page")
+    
+    assert repo.get_record(1)["title"] == "Login page"
+    assert cache.get(1) is not None
+
+
+@pytest.mark.parametrize("lag, cached", [(0.0, True), (2.0, False)])
+def test_replica_read_is_cached_only_when_caught_up(db, cache, monkeypatch, lag, cached):
+    repo = UserStoryRepository(db)
+    repo.create_story(1, "Login page")
+    # Treat the test database as the replica, measured `lag` seconds behind
+    monkeypatch.setattr(database, "read_engine", db.get_bind())
+    monkeypatch.setattr(database.replica_monitor, "lag", lag)
+    
+    assert repo.get_record(1)["title"] == "Login page"
+    assert (cache.get(1) is not None) is cached
@@ -0,0 +1,56 @@
+"""Tests for story ingestion and duplicate detection."""
+
+from src.core.models import Event, IdempotencyKey
+from src.services import UserStoryService, get_idempotency_cache
+
+
+def test_repeated_story_returns_original_event(db):
+    service = UserStoryService(db)
+    
+    first = service.create_user_story(1, "Login page")
+    repeat = service.create_user_story(1, "Login page")
+    
+    assert first["status"] == "accepted"
+    assert repeat["status"] == "duplicate"
+    assert repeat["event_id"] == first["event_id"]
+    assert db.query(Event).count() == 1
+
+
+def test_duplicate_detected_from_database_after_cache_loss(db):
+    service = UserStoryService(db)
+    first = service.create_user_story(1, "Login page", notification_id="n-1")
+    
+    get_idempotency_cache().clear()
+    repeat = service.create_user_story(1, "Login page", notification_id="n-2")
+    
+    assert repeat["status"] == "duplicate"
+    assert repeat["event_id"] == first["event_id"]
+
+
+def test_bulk_reports_stored_and_in_request_duplicates(db, story):
+    service = UserStoryService(db)
+    existing = service.create_user_story(2, "Existing")
+    
+    response = service.create_user_stories_bulk([story(2), story(3), story(3)])
+    results = response["results"]
+    
+    assert (response["accepted"], response["duplicates"]) == (1, 2)
+    assert [item["status"] for item in results] == ["duplicate", "accepted", "duplicate"]
+    assert results[0]["event_id"] == existing["event_id"]
+    assert results[2]["event_id"] == results[1]["event_id"]
+    assert db.query(Event).count() == 2
+
+
+def test_story_stored_before_idempotency_keys_returns_its_event(db, story):
+    service = UserStoryService(db)
+    first = service.create_user_story(4, "Legacy")
+    db.query(IdempotencyKey).delete()
+    db.commit()
+    get_idempotency_cache().clear()
+    
+    repeat = service.create_user_story(4, "Legacy")
+    bulk = service.create_user_stories_bulk([story(4)])
+    
+    assert repeat["status"] == "duplicate"
+    assert repeat["event_id"] == first["event_id"]
+    assert bulk["results"][0]["event_id"] == first["event_id"]
@@ -0,0 +1,130 @@
+"""Tests for how the worker daemon claims events and restarts crashed workers."""
+
+import json
+import time
+
+import pytest
+
+from src.core.constants import EventStatus, EventType, WorkerConfig
+from src.repositories import EventRepository
+from src.services import EventQueueService
+import worker_daemon
+from worker_daemon import WorkerDaemon, WorkerSupervisor
+
+
+@pytest.fixture
+def daemon():
+    """Embedded worker taking in-memory hand-offs, two events per claim."""
+    worker = WorkerDaemon(
+        poll_interval=60,
+        batch_size=2,
+        embedded=True,
+        inprocess_dispatch=True
+    )
+    worker._enable_dispatch()
+    yield worker
+    worker.dispatcher.detach()
+
+
+def _publish(db, daemon, dispatch):
+    """Insert a pending story event, handing it to the worker in memory if asked."""
+    data = {"story_id": 1, "title": "Story"}
+    event = EventRepository(db).create(
+        EventType.USER_STORY_CREATED.value, json.dumps(data), EventStatus.PENDING.value
+    )
+    if dispatch:
+        assert daemon.dispatcher.offer(event.id, event.event_type, data)
+    return event.id
+
+
+def test_partial_hand_off_is_topped_up_from_database(db, daemon):
+    database_only = _publish(db, daemon, dispatch=False)
+    dispatched = _publish(db, daemon, dispatch=True)
+    daemon._database_claimed_at = time.monotonic()
+    
+    claimed = daemon._claim(EventQueueService(db), 2)
+    
+    assert [event.id for event in claimed] == [dispatched, database_only]
+
+
+def test_busy_hand_off_does_not_starve_database_events(db, daemon):
+    database_only = _publish(db, daemon, dispatch=False)
+    daemon._database_claimed_at = time.monotonic()
+    claimed = []
+    
+    # Every cycle the hand-off alone could fill the batch
+    for _ in range(3):
+        _publish(db, daemon, dispatch=True)
+        _publish(db, daemon, dispatch=True)
+        claimed += [event.id for event in daemon._claim(EventQueueService(db), 2)]
+        assert database_only not in claimed
+    
+    # Once the poll interval has passed, the database is claimed first
+    _publish(db, daemon, dispatch=True)
+    _publish(db, daemon, dispatch=True)
+    daemon._database_claimed_at -= daemon.poll_interval
+    claimed = [event.id for event in daemon._claim(EventQueueService(db), 2)]
+    
+    assert claimed[0] == database_only
+    assert len(claimed) == 2
+
+
+class FakeProcess:
+    """Stands in for a child process that can be made to exit."""
+    
+    pid = 1000
+    
+    def __init__(self):
+        self.exitcode = None
+    
+    def is_alive(self):
+        return self.exitcode is None
+
+
+@pytest.fixture
+def supervisor(monkeypatch):
+    """Supervisor with one fake child, driven by a controllable clock."""
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(worker_daemon.time, "monotonic", lambda: clock["now"])
+    supervisor = WorkerSupervisor(1)
+    
+    def spawn(index):
+        supervisor._processes[index] = FakeProcess()
+        supervisor._started_at[index] = clock["now"]
+    
+    monkeypatch.setattr(supervisor, "_spawn", spawn)
+    supervisor._restart_delay[0] = WorkerConfig.RESTART_DELAY
+    supervisor._spawn(0)
+    supervisor.clock = clock
+    return supervisor
+
+
+def _crash(supervisor, after):
+    """Let the child run for `after` seconds, then exit with an error."""
+    supervisor.clock["now"] += after
+    supervisor._processes[0].exitcode = 1
+    supervisor._check_children()
+
+
+def test_crashed_worker_is_restarted_after_the_delay(supervisor):
+    _crash(supervisor, after=5)
+    assert not supervisor._processes[0].is_alive()
+    
+    supervisor.clock["now"] += WorkerConfig.RESTART_DELAY
+    supervisor._check_children()
+    
+    assert supervisor._processes[0].is_alive()
+    assert supervisor.restarts == 1
+
+
+def test_repeated_crashes_back_off_until_a_stable_run(supervisor):
+    delays = []
+    for uptime in (5, 5, 5, WorkerConfig.MIN_STABLE_UPTIME):
+        _crash(supervisor, after=uptime)
+        delays.append(supervisor._restart_at[0] - supervisor.clock["now"])
+        supervisor.clock["now"] = supervisor._restart_at[0]
+        supervisor._check_children()
+    
+    delay = WorkerConfig.RESTART_DELAY
+    assert delays == [delay, delay * 2, delay * 4, delay]
+    assert supervisor.restarts == 4
@@ -2,19 +2,48 @@
 Worker daemon for processing events from the queue.
 """
 
+import os
 import sys
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import queue
+import signal
 import time
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Set
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core.database import init_db, get_db_context
+from src.core.database import init_db, get_db_context, engine, dispose_engines_after_fork
 from src.core.config import get_settings
-from src.core.constants import WorkerConfig
-from src.services import EventQueueService
-from src.services.event_processor import EventProcessor
-from src.utils import setup_logger
+from src.core.constants import WorkerConfig, WorkerMode
+from src.services import (
+    EventQueueService,
+    AzureDevOpsService,
+    AsyncAzureDevOpsService,
+    EventRetentionJob,
+    LeaseHeartbeat,
+    get_queue_metrics_reconciler
+)
+from src.services.event_processor import EventProcessor, AsyncEventProcessor
+from src.services.event_notifier import get_event_notifier
+from src.services.event_dispatcher import get_event_dispatcher
+from src.utils import (
+    setup_logger,
+    shutdown_logging,
+    get_connection_stats,
+    build_rate_limiter,
+    get_rate_limiter,
+    metrics,
+    tracing
+)
 
 # Initialize logger
 logger = setup_logger(__name__)
@@ -27,75 +56,771 @@ class WorkerDaemon:
     Implements Single Responsibility Principle - only handles worker lifecycle.
     """
     
-    def __init__(self, poll_interval: int = WorkerConfig.DEFAULT_POLL_INTERVAL):
+    def __init__(
+        self,
+        poll_interval: int = WorkerConfig.DEFAULT_POLL_INTERVAL,
+        concurrency: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        embedded: bool = False,
+        fallback_poll_interval: Optional[int] = None,
+        inprocess_dispatch: bool = False,
+        dispatch_queue_size: Optional[int] = None,
+        run_retention: bool = True,
+        sole_publisher: bool = True,
+        azure_rate_limit: Optional[float] = None,
+        metrics_port: Optional[int] = None
+    ):
         """
         Initialize worker daemon.
         
         Args:
             poll_interval: Time in seconds between polling cycles
+            concurrency: Number of events processed in parallel, 1 = serial
+                (default: WORKER_CONCURRENCY)
+            max_in_flight: Maximum events in progress at once, in the pool or
+                on the event loop; the loop claims again whenever one finishes
+                (default: WORKER_MAX_IN_FLIGHT)
+            batch_size: Maximum events claimed at once (default: WORKER_BATCH_SIZE)
+            lease_seconds: Seconds before a claimed but unfinished event is
+                reclaimed (default: WORKER_LEASE_SECONDS)
+            embedded: True when running inside the API process, so publishes
+                there wake the worker directly
+            fallback_poll_interval: Polling interval used as a safety net
+                once push notifications are available
+                (default: WORKER_FALLBACK_POLL_INTERVAL)
+            inprocess_dispatch: Take events handed over in memory by the
+                API (embedded workers only)
+            dispatch_queue_size: Maximum events waiting in the hand-off queue
+                (default: WORKER_DISPATCH_QUEUE_SIZE)
+            run_retention: Run the event retention job when it is enabled
+                (only one worker process per deployment needs to)
+            sole_publisher: For embedded workers, whether this API process is
+                the only publisher; with several API processes, in-process
+                wakeups miss their events and polling stays at poll_interval
+            azure_rate_limit: Azure DevOps requests per second for this
+                worker's own limiter; None shares the process-wide limiter
+                (AZURE_RATE_LIMIT_PER_SECOND)
+            metrics_port: Port to serve GET /metrics on from this process;
+                None or 0 leaves metrics to the API (embedded workers)
         """
         self.poll_interval = poll_interval
+        concurrency = settings.WORKER_CONCURRENCY if concurrency is None else concurrency
+        max_in_flight = settings.WORKER_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.concurrency = max(1, concurrency)
+        self.max_in_flight = max(self.concurrency, max_in_flight)
+        self.batch_size = max(1, settings.WORKER_BATCH_SIZE if batch_size is None else batch_size)
+        self.lease_seconds = settings.WORKER_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.embedded = embedded
+        self.sole_publisher = sole_publisher
+        if fallback_poll_interval is None:
+            fallback_poll_interval = settings.WORKER_FALLBACK_POLL_INTERVAL
+        self.fallback_poll_interval = max(poll_interval, fallback_poll_interval)
+        self.notifier = get_event_notifier()
+        self.dispatcher = get_event_dispatcher()
+        self.inprocess_dispatch = inprocess_dispatch and embedded
+        self.dispatch_queue_size = (
+            settings.WORKER_DISPATCH_QUEUE_SIZE if dispatch_queue_size is None else dispatch_queue_size
+        )
+        self._database_claimed_at = 0.0
+        self.idle_wait = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat = LeaseHeartbeat(self.worker_id, self.lease_seconds)
         self.running = False
+        self._executor: ThreadPoolExecutor = None
+        self.azure_service: AzureDevOpsService = None
+        self.rate_limiter = (
+            build_rate_limiter(azure_rate_limit) if azure_rate_limit is not None else get_rate_limiter()
+        )
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self.run_retention = run_retention
+        self.retention_job: EventRetentionJob = None
+        self.metrics_port = metrics_port
+        self._metrics_server = None
+        self.processed_events = 0
+        self._processed_lock = threading.Lock()
+        self._window_started = time.monotonic()
+        self._window_processed = 0
     
-    def start(self) -> None:
-        """Start the worker daemon."""
+    def _enable_push(self) -> None:
+        """
+        Switch to push wakeups when every publisher can reach this worker.
+        
+        That holds on PostgreSQL (LISTEN/NOTIFY) or when embedded in the only
+        API process. Otherwise the regular polling interval stays in effect.
+        """
+        if not settings.EVENT_NOTIFICATIONS_ENABLED:
+            return
+        
+        listening = self.notifier.start_listener()
+        if listening or (self.embedded and self.sole_publisher):
+            self.idle_wait = self.fallback_poll_interval
+            logger.info(
+                "✓ Push wakeups enabled (%s), safety-net polling every %ss",
+                "LISTEN/NOTIFY" if listening else "in-process", self.idle_wait
+            )
+    
+    def _enable_dispatch(self) -> None:
+        """Accept events handed over in memory by the API in this process."""
+        if not self.inprocess_dispatch:
+            return
+        
+        self.dispatcher.attach(self.dispatch_queue_size)
+        logger.info(
+            "✓ In-process dispatch enabled (queue size: %s), database polling kept as fallback",
+            self.dispatch_queue_size
+        )
+    
+    def _claim(self, event_queue: EventQueueService, limit: int) -> List:
+        """
+        Claim up to `limit` events.
+        
+        Events handed over in memory are claimed by ID and reuse their
+        payload; the rest of the batch is topped up from the database, which
+        also holds retries, reclaimed leases, completion events and events
+        published by other processes. So that a steady hand-off cannot fill
+        every batch and starve those, the database is claimed first once
+        poll_interval has passed since its last claim.
+        
+        Args:
+            event_queue: Event queue service bound to the current session
+            limit: Maximum events to claim
+        
+        Returns:
+            Claimed events
+        """
+        events = []
+        database_first = time.monotonic() - self._database_claimed_at >= self.poll_interval
+        if database_first:
+            events = self._claim_from_database(event_queue, limit)
+        
+        if self.inprocess_dispatch and len(events) < limit:
+            dispatched = self.dispatcher.take(limit - len(events))
+            if dispatched:
+                events += event_queue.claim_dispatched(self.worker_id, dispatched, self.lease_seconds)
+        
+        if not database_first and len(events) < limit:
+            events += self._claim_from_database(event_queue, limit - len(events))
+        
+        # Leases are renewed until each event finishes
+        self.heartbeat.track(event.id for event in events)
+        return events
+    
+    def _claim_from_database(self, event_queue: EventQueueService, limit: int) -> List:
+        """Claim the oldest pending events from the database."""
+        self._database_claimed_at = time.monotonic()
+        return event_queue.claim_events(self.worker_id, limit, self.lease_seconds)
+    
+    def _start_retention(self) -> None:
+        """Start the periodic event archival job if enabled."""
+        if not (settings.EVENT_RETENTION_ENABLED and self.run_retention):
+            return
+        
+        self.retention_job = EventRetentionJob(
+            interval=settings.EVENT_RETENTION_INTERVAL,
+            retention_days=settings.EVENT_RETENTION_DAYS,
+            batch_size=settings.EVENT_RETENTION_BATCH_SIZE,
+            vacuum=settings.EVENT_RETENTION_VACUUM
+        )
+        self.retention_job.start()
+    
+    def _start_metrics_server(self) -> None:
+        """Serve this process's metrics when it has no API to scrape."""
+        if not (settings.METRICS_ENABLED and self.metrics_port):
+            return
+        
+        self._metrics_server = metrics.serve(
+            self.metrics_port, on_scrape=get_queue_metrics_reconciler().maybe_refresh
+        )
+        logger.info("✓ Metrics served on port %s at /metrics", self.metrics_port)
+    
+    def _stop_metrics_server(self) -> None:
+        """Stop serving metrics."""
+        if self._metrics_server:
+            self._metrics_server.shutdown()
+            self._metrics_server.server_close()
+            self._metrics_server = None
+    
+    def _wait_for_work(self, since: int) -> None:
+        """Sleep until an event is published or the idle interval passes."""
+        self.notifier.wait(since, self.idle_wait)
+    
+    def _log_startup(self, mode: str) -> None:
+        """Log the daemon configuration."""
         logger.info("=" * 70)
         logger.info("EVENT-DRIVEN WORKER DAEMON STARTED")
-        logger.info(f"Polling interval: {self.poll_interval}s")
-        logger.info(f"Environment: {settings.ENVIRONMENT}")
+        logger.info("Worker ID: %s", self.worker_id)
+        logger.info("Mode: %s", mode)
+        logger.info("Polling interval: %ss", self.poll_interval)
+        logger.info("Concurrency: %s (max in flight: %s)", self.concurrency, self.max_in_flight)
+        logger.info("Batch size: %s (lease: %ss)", self.batch_size, self.lease_seconds)
+        logger.info("Environment: %s", settings.ENVIRONMENT)
         logger.info("=" * 70)
+    
+    def start(self) -> None:
+        """Start the worker daemon."""
+        self._log_startup(WorkerMode.THREAD.value)
         
         # Initialize database
         init_db()
         logger.info("✓ Database initialized")
         
+        self._enable_push()
+        self._enable_dispatch()
+        self._start_retention()
+        self._start_metrics_server()
+        
+        # One Azure client per daemon; its HTTP pool is shared process-wide
+        self.azure_service = AzureDevOpsService(self.rate_limiter)
+        self.azure_service.warm_up()
+        
         self.running = True
+        self.heartbeat.start()
+        
+        if self.concurrency > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="event-worker"
+            )
         
         try:
             self._run_loop()
         except KeyboardInterrupt:
             logger.info("\nWorker daemon stopped by user")
         except Exception as e:
-            logger.error(f"Worker daemon error: {e}", exc_info=True)
+            logger.error("Worker daemon error: %s", e, exc_info=True)
             raise
         finally:
             self.running = False
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            self.heartbeat.stop()
+            self._stop_metrics_server()
     
     def _run_loop(self) -> None:
         """Main worker loop."""
         while self.running:
             try:
-                with get_db_context() as db:
-                    # Create services with dependency injection
-                    event_queue = EventQueueService(db)
-                    processor = EventProcessor(event_queue, db)
-                    
-                    # Get pending events
-                    pending_events = event_queue.get_pending_events()
-                    
-                    if pending_events:
-                        logger.info(f"Found {len(pending_events)} pending event(s)")
+                cycle_start = time.monotonic()
+                since = self.notifier.generation
+                
+                if self._executor:
+                    # Concurrent mode: claim only as many events as there are free pool slots
+                    limit = self._reserve_slots()
+                    pending_events = self._claim_and_submit(limit) if limit else []
+                    self._log_window_throughput()
+                else:
+                    limit = self.batch_size
+                    with get_db_context() as db:
+                        # Create services with dependency injection
+                        event_queue = EventQueueService(db)
+                        
+                        # Claim a batch of pending events for this worker
+                        pending_events = self._claim(event_queue, limit)
                         
+                        if pending_events:
+                            logger.info("Claimed %d pending event(s)", len(pending_events))
+                        
+                        processor = EventProcessor(event_queue, db, self.azure_service)
                         for event in pending_events:
-                            processor.process_event(event)
+                            try:
+                                processor.process_event(event)
+                            finally:
+                                self.heartbeat.untrack(event.id)
+                    
+                    if pending_events:
+                        self._count_processed(len(pending_events))
+                        self._log_cycle_throughput(len(pending_events), time.monotonic() - cycle_start)
                 
-                # Sleep between polling cycles
-                time.sleep(self.poll_interval)
+                # Wait for new work unless a full claim suggests more is queued
+                if len(pending_events) < limit and self.running:
+                    self._wait_for_work(since)
             
             except Exception as e:
-                logger.error(f"Error in worker loop: {e}", exc_info=True)
+                logger.error("Error in worker loop: %s", e, exc_info=True)
                 time.sleep(self.poll_interval)
     
+    async def run_async(self) -> None:
+        """
+        Run the worker loop as an asyncio task.
+        
+        Azure DevOps calls are awaited on the running event loop, capped by
+        the async client's semaphore; claiming and other DB work runs in
+        worker threads. Up to max_in_flight events run at once, and the
+        loop claims again as soon as one of them finishes, so a slow event
+        does not hold back the rest of its batch.
+        """
+        self._log_startup(WorkerMode.ASYNC.value)
+        
+        await asyncio.to_thread(init_db)
+        logger.info("✓ Database initialized")
+        
+        self._enable_push()
+        self._enable_dispatch()
+        self._start_retention()
+        self._start_metrics_server()
+        
+        azure_service = AsyncAzureDevOpsService(rate_limiter=self.rate_limiter)
+        processor = AsyncEventProcessor(azure_service)
+        in_flight: Set[asyncio.Task] = set()
+        self.running = True
+        self.heartbeat.start()
+        
+        try:
+            while self.running:
+                try:
+                    if len(in_flight) >= self.max_in_flight:
+                        await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        continue
+                    
+                    since = self.notifier.generation
+                    limit = min(self.batch_size, self.max_in_flight - len(in_flight))
+                    events = await asyncio.to_thread(self._claim_batch, limit)
+                    
+                    if events:
+                        logger.info("Claimed %d pending event(s)", len(events))
+                    for event in events:
+                        metrics.WORKER_IN_FLIGHT.inc()
+                        task = asyncio.create_task(self._process_async(processor, event))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+                    self._log_window_throughput()
+                    
+                    # Wait for new work unless a full claim suggests more is queued
+                    if len(events) < limit and self.running:
+                        await asyncio.to_thread(self._wait_for_work, since)
+                
+                except asyncio.CancelledError:
+                    for task in in_flight:
+                        task.cancel()
+                    raise
+                except Exception as e:
+                    logger.error("Error in async worker loop: %s", e, exc_info=True)
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self.running = False
+            # Let claimed events finish (or unwind, if cancelled) before the client closes
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+            await asyncio.to_thread(self.heartbeat.stop)
+            await asyncio.to_thread(self._stop_metrics_server)
+            await azure_service.aclose()
+    
+    async def _process_async(self, processor: AsyncEventProcessor, event) -> None:
+        """Process one event on the event loop, then free its slot and stop renewing its lease."""
+        try:
+            await processor.process_event(event)
+        except Exception as e:
+            logger.error("[Event %s] Async worker error: %s", event.id, e, exc_info=True)
+        finally:
+            self.heartbeat.untrack(event.id)
+            metrics.WORKER_IN_FLIGHT.dec()
+            self._count_processed(1)
+    
+    def _claim_batch(self, limit: int) -> List:
+        """Claim up to `limit` events using a short-lived session."""
+        with get_db_context() as db:
+            return self._claim(EventQueueService(db), limit)
+    
+    def _reserve_slots(self) -> int:
+        """
+        Block until a pool slot is free, then take up to batch_size free slots.
+        
+        Returns:
+            Slots reserved, or 0 if the daemon stopped while waiting
+        """
+        while not self._in_flight.acquire(timeout=self.poll_interval):
+            if not self.running:
+                return 0
+        
+        reserved = 1
+        while reserved < self.batch_size and self._in_flight.acquire(blocking=False):
+            reserved += 1
+        return reserved
+    
+    def _claim_and_submit(self, limit: int) -> List:
+        """
+        Claim events for reserved pool slots and submit them without waiting.
+        
+        Slots not used by a claimed event are released right away; the
+        others are released as their events finish, which lets the loop
+        claim again while the rest of the batch is still running.
+        
+        Args:
+            limit: Pool slots reserved by _reserve_slots
+        
+        Returns:
+            Claimed events
+        """
+        events = []
+        try:
+            with get_db_context() as db:
+                events = self._claim(EventQueueService(db), limit)
+        finally:
+            for _ in range(limit - len(events)):
+                self._in_flight.release()
+        
+        if events:
+            logger.info("Claimed %d pending event(s)", len(events))
+        
+        for index, event in enumerate(events):
+            try:
+                future = self._executor.submit(self._process_event_isolated, event)
+            except Exception:
+                for _ in events[index:]:
+                    self._in_flight.release()
+                raise
+            metrics.WORKER_IN_FLIGHT.inc()
+            future.add_done_callback(self._release_in_flight)
+        
+        return events
+    
+    def _release_in_flight(self, _future) -> None:
+        """Free a pool slot once an event finishes."""
+        metrics.WORKER_IN_FLIGHT.dec()
+        self._count_processed(1)
+        self._in_flight.release()
+    
+    def _process_event_isolated(self, event) -> None:
+        """
+        Process one claimed event with a dedicated session and processor.
+        
+        Claimed events already carry their payload, so they are not read
+        back from the database.
+        
+        Args:
+            event: Claimed event, detached from its session
+        """
+        try:
+            with get_db_context() as db:
+                event_queue = EventQueueService(db)
+                EventProcessor(event_queue, db, self.azure_service).process_event(event)
+        except Exception as e:
+            logger.error("[Event %s] Worker thread error: %s", event.id, e, exc_info=True)
+        finally:
+            self.heartbeat.untrack(event.id)
+    
+    def _count_processed(self, event_count: int) -> None:
+        """Count finished events, from the loop or from pool threads."""
+        with self._processed_lock:
+            self.processed_events += event_count
+    
+    def _log_cycle_throughput(self, event_count: int, elapsed: float) -> None:
+        """Log per-cycle throughput of a loop that waits for its batch."""
+        metrics.WORKER_CYCLE.observe(elapsed)
+        self._log_throughput("Cycle processed %s event(s)", event_count, elapsed)
+    
+    def _log_window_throughput(self) -> None:
+        """
+        Log throughput of the pool over the last reporting window.
+        
+        Concurrent workers claim without waiting for earlier events, so
+        there are no cycles to report; finished events are reported every
+        THROUGHPUT_LOG_INTERVAL seconds instead.
+        """
+        now = time.monotonic()
+        elapsed = now - self._window_started
+        if elapsed < WorkerConfig.THROUGHPUT_LOG_INTERVAL:
+            return
+        
+        processed = self.processed_events
+        event_count = processed - self._window_processed
+        self._window_started = now
+        self._window_processed = processed
+        if event_count:
+            self._log_throughput("Processed %s event(s)", event_count, elapsed)
+    
+    def _log_throughput(self, label: str, event_count: int, elapsed: float) -> None:
+        """
+        Log an event rate with HTTP pool and rate limiter stats.
+        
+        Args:
+            label: Message format taking the event count, e.g. "Processed %s event(s)"
+            event_count: Number of events finished in `elapsed`
+            elapsed: Seconds the events took
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        rate = event_count / elapsed if elapsed > 0 else float(event_count)
+        message = label + " in %.2fs (%.2f events/s)"
+        args = [event_count, elapsed, rate]
+        
+        http = get_connection_stats()
+        if http["requests"]:
+            message += " | HTTP: %s request(s), %s connection(s) opened, %s reused"
+            args += [http["requests"], http["connections_opened"], http["connections_reused"]]
+        
+        limiter = self.rate_limiter.stats()
+        if limiter["requests"]:
+            message += " | Azure rate: %s/s, concurrency %s, %s throttled"
+            args += [limiter["rate_per_second"], limiter["concurrency_limit"], limiter["throttled"]]
+        logger.info(message, *args)
+    
     def stop(self) -> None:
         """Stop the worker daemon."""
         self.running = False
+        self.dispatcher.detach()
+        if self.retention_job:
+            self.retention_job.stop()
+        self.notifier.stop_listener()
+        # Wake the loop if it is waiting for work
+        self.notifier.notify()
         logger.info("Worker daemon stopping...")
 
 
-def main():
+def build_worker(
+    run_retention: bool = True,
+    azure_rate_limit: Optional[float] = None,
+    metrics_port: Optional[int] = None
+) -> WorkerDaemon:
+    """Create a worker daemon configured from settings."""
+    return WorkerDaemon(
+        poll_interval=WorkerConfig.DEFAULT_POLL_INTERVAL,
+        concurrency=settings.WORKER_CONCURRENCY,
+        max_in_flight=settings.WORKER_MAX_IN_FLIGHT,
+        batch_size=settings.WORKER_BATCH_SIZE,
+        lease_seconds=settings.WORKER_LEASE_SECONDS,
+        fallback_poll_interval=settings.WORKER_FALLBACK_POLL_INTERVAL,
+        run_retention=run_retention,
+        azure_rate_limit=azure_rate_limit,
+        metrics_port=metrics_port
+    )
+
+
+def run_worker(worker: WorkerDaemon) -> None:
+    """Run a worker in the configured mode until it stops."""
+    try:
+        if settings.WORKER_MODE == WorkerMode.ASYNC.value:
+            try:
+                asyncio.run(worker.run_async())
+            except KeyboardInterrupt:
+                logger.info("\nWorker daemon stopped by user")
+        else:
+            worker.start()
+    finally:
+        # Export the spans of the last events before the process exits
+        tracing.shutdown_tracing()
+
+
+def _report_stats(worker: WorkerDaemon, index: int, stats_queue, done: threading.Event) -> None:
+    """Send newly processed-event counts to the supervisor until done, then a final one."""
+    reported = 0
+    while True:
+        finished = done.wait(WorkerConfig.SUPERVISOR_STATS_INTERVAL / 2)
+        processed = worker.processed_events
+        if processed != reported:
+            stats_queue.put((index, processed - reported))
+            reported = processed
+        if finished:
+            return
+
+
+def _worker_process(index: int, azure_rate_limit: float, stats_queue) -> None:
+    """
+    Entry point of a supervised worker process.
+    
+    Database pools and the Azure client are created here, after the fork.
+    
+    Args:
+        index: Slot of this child; slot 0 runs event retention, and metrics
+            are served on WORKER_METRICS_PORT + index
+        azure_rate_limit: This child's share of the Azure DevOps rate limit
+        stats_queue: Queue for processed-event counts
+    """
+    # Ctrl+C reaches the whole process group; drain on the supervisor's SIGTERM instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    dispose_engines_after_fork()
+    
+    worker = build_worker(
+        run_retention=index == 0,
+        azure_rate_limit=azure_rate_limit,
+        metrics_port=settings.WORKER_METRICS_PORT + index if settings.WORKER_METRICS_PORT else None
+    )
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    done = threading.Event()
+    reporter = threading.Thread(
+        target=_report_stats,
+        args=(worker, index, stats_queue, done),
+        name="worker-stats",
+        daemon=True
+    )
+    reporter.start()
+    
+    try:
+        run_worker(worker)
+    finally:
+        done.set()
+        reporter.join()
+        # multiprocessing ends children with os._exit, skipping the atexit flush
+        shutdown_logging()
+
+
+class WorkerSupervisor:
+    """
+    Runs several worker processes and keeps them alive.
+    
+    Each child claims from the shared queue like an independent daemon, so
+    processing scales past one interpreter's GIL. Crashed children are
+    restarted with backoff, SIGTERM/SIGINT are forwarded so children drain
+    their current batch, and per-child counts are combined into one
+    throughput report.
+    """
+    
+    def __init__(self, workers: int):
+        """
+        Initialize supervisor.
+        
+        Args:
+            workers: Number of worker processes to keep running
+        """
+        self.workers = workers
+        # Children share the Azure DevOps budget evenly
+        self.azure_rate_limit = settings.AZURE_RATE_LIMIT_PER_SECOND / workers
+        start_methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context("fork" if "fork" in start_methods else "spawn")
+        self._stats_queue = self._context.Queue()
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._started_at: Dict[int, float] = {}
+        self._restart_delay: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._stopping = threading.Event()
+        self.restarts = 0
+        self.total_processed = 0
+        self._window_processed = 0
+    
+    def run(self) -> None:
+        """Start the children and supervise them until a stop signal."""
+        logger.info("=" * 70)
+        logger.info("WORKER SUPERVISOR STARTED")
+        logger.info("Worker processes: %s (mode: %s)", self.workers, settings.WORKER_MODE)
+        logger.info("Azure rate limit per process: %.1f/s", self.azure_rate_limit)
+        logger.info("=" * 70)
+        
+        # Create tables once, then drop the pool so no connection crosses the fork
+        init_db()
+        engine.dispose()
+        
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        
+        for index in range(self.workers):
+            self._restart_delay[index] = WorkerConfig.RESTART_DELAY
+            self._spawn(index)
+        
+        last_report = time.monotonic()
+        while not self._stopping.is_set():
+            self._stopping.wait(WorkerConfig.SUPERVISOR_CHECK_INTERVAL)
+            self._collect_stats()
+            self._check_children()
+            
+            elapsed = time.monotonic() - last_report
+            if elapsed >= WorkerConfig.SUPERVISOR_STATS_INTERVAL:
+                self._log_stats(elapsed)
+                last_report = time.monotonic()
+        
+        self._shutdown()
+    
+    def _handle_signal(self, signum, _frame) -> None:
+        """Begin a graceful shutdown of every child."""
+        if not self._stopping.is_set():
+            logger.info("Supervisor received %s, draining workers...", signal.Signals(signum).name)
+        self._stopping.set()
+    
+    def _spawn(self, index: int) -> None:
+        """Start the worker process for a slot."""
+        process = self._context.Process(
+            target=_worker_process,
+            args=(index, self.azure_rate_limit, self._stats_queue),
+            name=f"worker-{index}"
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+        logger.info("✓ Started worker %s (pid %s)", index, process.pid)
+    
+    def _check_children(self) -> None:
+        """Restart children that exited, backing off if they keep crashing."""
+        now = time.monotonic()
+        for index, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            
+            if index not in self._restart_at:
+                uptime = now - self._started_at[index]
+                if uptime >= WorkerConfig.MIN_STABLE_UPTIME:
+                    self._restart_delay[index] = WorkerConfig.RESTART_DELAY
+                delay = self._restart_delay[index]
+                logger.error(
+                    "✗ Worker %s (pid %s) exited with code %s after %.0fs, restarting in %.0fs",
+                    index, process.pid, process.exitcode, uptime, delay
+                )
+                self._restart_at[index] = now + delay
+                self._restart_delay[index] = min(delay * 2, WorkerConfig.MAX_RESTART_DELAY)
+            
+            if now >= self._restart_at[index]:
+                del self._restart_at[index]
+                self.restarts += 1
+                self._spawn(index)
+    
+    def _collect_stats(self) -> None:
+        """Drain processed-event counts reported by the children."""
+        while True:
+            try:
+                _, processed = self._stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.total_processed += processed
+            self._window_processed += processed
+    
+    def _log_stats(self, elapsed: float) -> None:
+        """Log combined throughput of all children."""
+        alive = sum(1 for process in self._processes.values() if process.is_alive())
+        rate = self._window_processed / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            "Supervisor: %s/%s worker(s) up, %s event(s) in %.0fs (%.2f events/s), %s total, %s restart(s)",
+            alive, self.workers, self._window_processed, elapsed, rate, self.total_processed, self.restarts
+        )
+        self._window_processed = 0
+    
+    def _shutdown(self) -> None:
+        """Forward SIGTERM, wait for children to drain, then kill stragglers."""
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        
+        deadline = time.monotonic() + WorkerConfig.SHUTDOWN_TIMEOUT
+        for index, process in self._processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("⚠️ Worker %s (pid %s) did not drain in time, killing it", index, process.pid)
+                process.kill()
+                process.join()
+        
+        self._collect_stats()
+        logger.info(
+            "Worker supervisor stopped: %s event(s) processed, %s restart(s)",
+            self.total_processed, self.restarts
+        )
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
-    worker = WorkerDaemon(poll_interval=WorkerConfig.DEFAULT_POLL_INTERVAL)
-    worker.start()
+    parser = argparse.ArgumentParser(description="Process queued events.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WORKER_PROCESSES,
+        help="worker processes to run under a supervisor (default: WORKER_PROCESSES)"
+    )
+    args = parser.parse_args(argv)
+    
+    if args.workers > 1:
+        WorkerSupervisor(args.workers).run()
+    else:
+        run_worker(build_worker(metrics_port=settings.WORKER_METRICS_PORT))
 
 
 if __name__ == "__main__":